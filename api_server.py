@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP API for IndicSahayak
+Plain ASGI application serving chat, chat history, translation and feedback
+Run with: python api_server.py --workers 4 (or any ASGI server, e.g. uvicorn api_server:app)
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from config import Config
+from indic_sahayak import create_configured_assistant
+from feedback_system import SCORE_FIELDS, FeedbackCollector, get_feedback_collector
+from response_cache import cached_translate
+
+
+class AsyncAssistantService:
+    """
+    Async facade over the blocking assistant, clients and feedback store.
+    Blocking calls run on a bounded thread pool; a semaphore caps the number
+    of in-flight requests per worker and rejects work that waits too long.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = Config.API_MAX_CONCURRENCY,
+        queue_timeout: float = Config.API_QUEUE_TIMEOUT,
+        feedback_file: str = Config.API_FEEDBACK_FILE
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.feedback_file = feedback_file
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="indic-api")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.assistant = create_configured_assistant()
+        self._translator = None
+        self._feedback_collector: Optional[FeedbackCollector] = None
+        self._session_store = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.warmup_stats: Dict[str, Any] = {}
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the event loop of the serving worker
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            from huggingface_client import HuggingFaceClient
+            from scheduler import scheduled
+            self._translator = scheduled(HuggingFaceClient(), "huggingface")
+        return self._translator
+
+    @property
+    def feedback_collector(self) -> FeedbackCollector:
+        if self._feedback_collector is None:
+            self._feedback_collector = get_feedback_collector(self.feedback_file)
+        return self._feedback_collector
+
+    async def acquire(self) -> bool:
+        """Wait for a concurrency slot; False means the request should be shed"""
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the worker thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: func(*args, **kwargs))
+
+    @property
+    def session_store(self):
+        if self._session_store is None:
+            from session_store import get_session_store
+            self._session_store = get_session_store()
+        return self._session_store
+
+    async def chat(self, message: str, method: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        response = await self.run(self.assistant.get_response, message, method)
+        result = {
+            "success": True,
+            "response": response,
+            "language": self.assistant.detect_language(message)
+        }
+        if session_id:
+            # Write-behind: the turn is queued for the store, not written inline
+            self.session_store.append(session_id, "user", message)
+            self.session_store.append(session_id, "assistant", response)
+            result["session_id"] = session_id
+        return result
+
+    async def history(self, session_id: str, limit: int) -> Dict[str, Any]:
+        messages = await self.run(self.session_store.recent, session_id, limit)
+        return {"success": True, "session_id": session_id, "messages": messages}
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+        return await self.run(cached_translate, self.translator, text, source_lang, target_lang)
+
+    def start_warmup(self, sources: str = Config.CACHE_WARM_SOURCES):
+        """Precompute frequent replies and translations in the background"""
+        from cache_warmer import mine_queries, parse_sources, warm_cache
+        sources = parse_sources(sources)
+        if not sources:
+            return
+
+        def run():
+            self.warmup_stats = {"running": True}
+            items = mine_queries(sources)
+            clients = self.assistant.clients
+            self.warmup_stats = warm_cache(
+                items,
+                # Rule-based replies are not cached, so chat only warms when a model backend is configured
+                chat=self.assistant.warm_response if clients else None,
+                translate=lambda text, source, target: cached_translate(
+                    self.translator, text, source, target
+                ).get("success", False),
+                method="huggingface" if "huggingface" in clients else next(iter(clients), "huggingface")
+            )
+
+        threading.Thread(target=run, name="cache-warmup", daemon=True).start()
+
+    async def add_feedback(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        feedback = await self.run(self.feedback_collector.create_feedback, **payload)
+        return {"success": True, "feedback_id": feedback.feedback_id}
+
+    def stats(self) -> Dict[str, Any]:
+        from scheduler import get_all_metrics
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rejected": self.rejected,
+            "backends": get_all_metrics(),
+            "feedback_writer": self._feedback_collector.get_writer_stats() if self._feedback_collector else {},
+            "generation_budgets": self.assistant.generation_budget.get_stats(),
+            "response_cache": self.assistant.response_cache.get_stats(),
+            "cache_warmup": self.warmup_stats
+        }
+
+
+FEEDBACK_FIELDS = {
+    "user_id", "rating", "language_used", "interaction_type", "comments",
+    "response_quality", "cultural_sensitivity", "language_accuracy", "helpfulness",
+    "response_speed", "user_satisfaction", "would_recommend",
+    "improvement_suggestions", "technical_issues"
+}
+FEEDBACK_RATING_FIELDS = ("rating",) + tuple(SCORE_FIELDS)
+FEEDBACK_TEXT_FIELDS = (
+    "user_id", "language_used", "interaction_type", "comments", "improvement_suggestions", "technical_issues"
+)
+
+
+def validate_feedback(payload: Dict[str, Any]) -> Optional[str]:
+    """Error message for a mistyped or out-of-range feedback field, or None if the payload is valid"""
+    for field in FEEDBACK_RATING_FIELDS:
+        value = payload.get(field, 1)
+        if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 5:
+            return f"'{field}' must be an integer from 1 to 5"
+    if not isinstance(payload.get("would_recommend", True), bool):
+        return "'would_recommend' must be a boolean"
+    for field in FEEDBACK_TEXT_FIELDS:
+        if not isinstance(payload.get(field, ""), str):
+            return f"'{field}' must be a string"
+    return None
+
+
+class IndicSahayakAPI:
+    """ASGI application exposing IndicSahayak over HTTP/JSON"""
+
+    def __init__(self, service: Optional[AsyncAssistantService] = None):
+        self._service = service
+        self.routes = {
+            ("GET", "/health"): self.handle_health,
+            ("POST", "/chat"): self.handle_chat,
+            ("POST", "/history"): self.handle_history,
+            ("POST", "/translate"): self.handle_translate,
+            ("POST", "/feedback"): self.handle_feedback,
+        }
+
+    @property
+    def service(self) -> AsyncAssistantService:
+        # Built on first request so each worker process gets its own pool
+        if self._service is None:
+            self._service = AsyncAssistantService()
+        return self._service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        handler = self.routes.get((scope["method"], scope["path"]))
+        if handler is None:
+            await self._send_json(send, 404, {"success": False, "error": "Not found"})
+            return
+
+        try:
+            body = await self._read_body(receive)
+        except ValueError as e:
+            await self._send_json(send, 413, {"success": False, "error": str(e)})
+            return
+
+        if handler == self.handle_health:
+            await handler(body, send)
+            return
+
+        if not await self.service.acquire():
+            await self._send_json(
+                send, 503, {"success": False, "error": "Server busy - please retry"},
+                headers=[(b"retry-after", b"1")]
+            )
+            return
+        try:
+            await handler(body, send)
+        except Exception as e:
+            await self._send_json(send, 500, {"success": False, "error": f"Unexpected error: {str(e)}"})
+        finally:
+            self.service.release()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # The response cache is restored from its snapshot when the service is built
+                self.service.start_warmup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._service is not None:
+                    self._service.executor.shutdown(wait=True)
+                    self._service.assistant.response_cache.snapshot()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > Config.API_MAX_BODY_BYTES:
+                raise ValueError("Request body too large")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _send_json(self, send, status: int, payload: Dict[str, Any], headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ] + (headers or [])
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def _parse_json(self, body: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            data = json.loads(body.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None, "Invalid JSON body"
+        if not isinstance(data, dict):
+            return None, "JSON body must be an object"
+        return data, None
+
+    async def handle_health(self, body: bytes, send):
+        await self._send_json(send, 200, {"success": True, "status": "ok", **self.service.stats()})
+
+    def _parse_chat(self, body: bytes) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        data, error = self._parse_json(body)
+        if error:
+            return None, error
+        if not data.get("message"):
+            return None, "'message' is required"
+        for field in ("message", "method", "session_id"):
+            if data.get(field) is not None and not isinstance(data[field], str):
+                return None, f"'{field}' must be a string"
+        return data, None
+
+    async def handle_chat(self, body: bytes, send):
+        data, error = self._parse_chat(body)
+        if error:
+            await self._send_json(send, 400, {"success": False, "error": error})
+            return
+        result = await self.service.chat(data["message"], data.get("method") or "fallback", data.get("session_id"))
+        await self._send_json(send, 200, result)
+
+    async def handle_history(self, body: bytes, send):
+        data, error = self._parse_json(body)
+        if error or not data.get("session_id"):
+            await self._send_json(send, 400, {"success": False, "error": error or "'session_id' is required"})
+            return
+        if not isinstance(data["session_id"], str):
+            await self._send_json(send, 400, {"success": False, "error": "'session_id' must be a string"})
+            return
+        limit = data.get("limit", Config.MAX_CHAT_HISTORY)
+        if not isinstance(limit, int) or limit < 0:
+            await self._send_json(send, 400, {"success": False, "error": "'limit' must be a non-negative integer"})
+            return
+        result = await self.service.history(data["session_id"], limit)
+        await self._send_json(send, 200, result)
+
+    async def handle_translate(self, body: bytes, send):
+        data, error = self._parse_json(body)
+        missing = [k for k in ("text", "source_lang", "target_lang") if not data or not data.get(k)]
+        if error or missing:
+            await self._send_json(send, 400, {"success": False, "error": error or f"Missing fields: {', '.join(missing)}"})
+            return
+        result = await self.service.translate(data["text"], data["source_lang"], data["target_lang"])
+        if result.get("rejected"):
+            status = 503
+        else:
+            status = 200 if result.get("success") else 502
+        await self._send_json(send, status, result)
+
+    async def handle_feedback(self, body: bytes, send):
+        data, error = self._parse_json(body)
+        if error:
+            await self._send_json(send, 400, {"success": False, "error": error})
+            return
+        payload = {k: v for k, v in data.items() if k in FEEDBACK_FIELDS}
+        missing = [k for k in ("rating", "language_used", "interaction_type", "comments") if k not in payload]
+        if missing:
+            await self._send_json(send, 400, {"success": False, "error": f"Missing fields: {', '.join(missing)}"})
+            return
+        error = validate_feedback(payload)
+        if error:
+            await self._send_json(send, 400, {"success": False, "error": error})
+            return
+        payload.setdefault("user_id", "anonymous")
+        result = await self.service.add_feedback(payload)
+        await self._send_json(send, 201, result)
+
+
+app = IndicSahayakAPI()
+
+
+def main():
+    """Serve the API with uvicorn"""
+    parser = argparse.ArgumentParser(description="IndicSahayak HTTP API")
+    parser.add_argument("--host", default=Config.API_HOST)
+    parser.add_argument("--port", type=int, default=Config.API_PORT)
+    parser.add_argument("--workers", type=int, default=Config.API_WORKERS)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run("api_server:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for IndicSahayak hot paths
+Covers language detection, rule-based responses, prompt construction and
+the feedback store/analyzer at increasing dataset sizes
+
+Usage:
+    python benchmarks/hot_paths.py --output results.json
+    python benchmarks/hot_paths.py --sizes 1000,100000 --baseline baseline.json --threshold 0.15
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indic_sahayak import IndicSahayak
+from feedback_system import FeedbackCollector, FeedbackAnalyzer
+from response_cache import ResponseCache
+from synthetic import generate_feedback, generate_queries, write_feedback_file
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+
+
+def measure(func: Callable[[], Any], repeat: int, number: int = 1) -> Dict[str, float]:
+    """Time ``number`` calls per sample, ``repeat`` samples; report seconds per call"""
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "repeat": repeat,
+        "number": number
+    }
+
+
+def bench_assistant(results: Dict[str, Dict[str, float]], repeat: int):
+    assistant = IndicSahayak()
+    short_inputs = generate_queries(100, 4, seed=1)
+    long_inputs = generate_queries(100, 400, seed=2)
+    english_long = generate_queries(100, 400, script="English", seed=3)
+
+    def detect(inputs):
+        return lambda: [assistant.detect_language(text) for text in inputs]
+
+    results["detect_language/short_mixed_x100"] = measure(detect(short_inputs), repeat, 20)
+    results["detect_language/long_mixed_x100"] = measure(detect(long_inputs), repeat, 5)
+    # Worst case for script scanning: no Indic characters anywhere
+    results["detect_language/long_english_x100"] = measure(detect(english_long), repeat, 5)
+
+    structured_inputs = [(text, assistant.detect_language(text)) for text in short_inputs]
+    results["generate_structured_response/x100"] = measure(
+        lambda: [assistant._generate_structured_response(text, lang) for text, lang in structured_inputs],
+        repeat, 20
+    )
+    results["build_prompt/x100"] = measure(
+        lambda: [assistant.build_prompt(text) for text in short_inputs], repeat, 20
+    )
+    # Whole rule-based request: analysis, detection, intent and reply
+    results["get_response/short_x100"] = measure(
+        lambda: [assistant.get_response(text, "fallback") for text in short_inputs], repeat, 20
+    )
+    results["get_response/long_x100"] = measure(
+        lambda: [assistant.get_response(text, "fallback") for text in long_inputs], repeat, 5
+    )
+
+    # Model-backed request with an instant client and no cache hits: the
+    # per-request text work (cache key, intent, language) around the call
+    class InstantClient:
+        def generate_response(self, prompt, **kwargs):
+            return {"success": True, "response": "ok", "completion_tokens": 1}
+
+    client_assistant = IndicSahayak({"bench": InstantClient()})
+    client_assistant.response_cache = ResponseCache(max_entries=0)
+    results["get_response/client_short_x100"] = measure(
+        lambda: [client_assistant.get_response(text, "bench") for text in short_inputs], repeat, 20
+    )
+    results["get_response/client_long_x100"] = measure(
+        lambda: [client_assistant.get_response(text, "bench") for text in long_inputs], repeat, 5
+    )
+
+
+def bench_feedback(results: Dict[str, Dict[str, float]], sizes: List[int], repeat: int, workdir: str):
+    for size in sizes:
+        path = os.path.join(workdir, f"feedback_{size}.json")
+        write_feedback_file(path, size)
+        # Big datasets get fewer samples so the suite finishes in minutes
+        size_repeat = max(1, repeat if size <= 100000 else repeat // 3)
+
+        results[f"feedback_load/{size}"] = measure(lambda: FeedbackCollector(path), size_repeat)
+
+        collector = FeedbackCollector(path)
+        results[f"feedback_save/{size}"] = measure(collector.save_feedback_data, size_repeat)
+
+        extra = list(generate_feedback(size_repeat, seed=99))
+        results[f"feedback_add/{size}"] = measure(lambda: collector.add_feedback(extra.pop()), size_repeat)
+
+        # Cold (the original generate_report, so old baselines still compare): fresh
+        # analyzer, full pass. Warm: unchanged collector, cached aggregate.
+        results[f"generate_report/{size}"] = measure(
+            lambda: FeedbackAnalyzer(collector).generate_report(), size_repeat
+        )
+        analyzer = FeedbackAnalyzer(collector)
+        results[f"generate_report_warm/{size}"] = measure(analyzer.generate_report, size_repeat)
+
+        del analyzer, collector
+        os.remove(path)
+        gc.collect()
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Return benchmarks whose best time got slower than baseline by more than
+    threshold. The minimum is compared because it is the least noisy sample.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        change = stats["min"] / base["min"] - 1 if base["min"] > 0 else 0.0
+        stats["baseline_min"] = base["min"]
+        stats["change"] = change
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IndicSahayak hot-path micro-benchmarks")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated feedback dataset sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", choices=["assistant", "feedback"], help="Run one group only")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Stored results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    if args.only in (None, "assistant"):
+        bench_assistant(results, args.repeat)
+    if args.only in (None, "feedback"):
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        with tempfile.TemporaryDirectory() as workdir:
+            bench_feedback(results, sizes, args.repeat, workdir)
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    for name, stats in results.items():
+        line = f"{name:<45} min {stats['min'] * 1000:>10.3f} ms  median {stats['median'] * 1000:>10.3f} ms"
+        if "change" in stats:
+            flag = "  REGRESSION" if name in regressions else ""
+            line += f"  ({stats['change'] * 100:+.1f}% vs baseline){flag}"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results
+            }, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold * 100:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for IndicSahayak
+Sends queries at a fixed target rate whether or not earlier ones finished,
+and measures latency from each request's scheduled start so queueing delay
+is never hidden (no coordinated omission)
+
+Usage:
+    python benchmarks/load_generator.py --backend huggingface --start-stub --rps 50 --duration 30
+    python benchmarks/load_generator.py --backend ollama --base-url http://localhost:11434 --rps 5
+    python benchmarks/load_generator.py --backend fallback --rps 2000 --duration 10
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indic_sahayak import IndicSahayak
+from synthetic import generate_queries
+
+# Load generator backend -> (IndicSahayak method, stub server backend)
+BACKENDS = {
+    "huggingface": ("huggingface", "huggingface"),
+    "ollama": ("local", "ollama"),
+    "dify": ("dify", "dify"),
+    "fallback": ("fallback", None),
+}
+
+
+class CountingClient:
+    """Wraps a client and counts backend successes and failures"""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+        self.errors: Dict[str, int] = {}
+
+    def generate_response(self, *args, **kwargs) -> Dict[str, Any]:
+        result = self.client.generate_response(*args, **kwargs)
+        with self.lock:
+            if result.get("success"):
+                self.successes += 1
+            else:
+                self.failures += 1
+                key = str(result.get("error", "unknown"))[:60]
+                self.errors[key] = self.errors.get(key, 0) + 1
+        return result
+
+
+def build_client(backend: str, base_url: str) -> Any:
+    from huggingface_client import HuggingFaceClient, LocalModelClient, DifyClient
+    if backend == "huggingface":
+        return HuggingFaceClient(api_key="stub", base_url=base_url)
+    if backend == "ollama":
+        return LocalModelClient(base_url=base_url)
+    return DifyClient(api_key="stub", base_url=base_url)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def run_load(
+    assistant: IndicSahayak,
+    method: str,
+    rps: float,
+    duration: float,
+    queries: List[str],
+    max_outstanding: int = 256,
+    poisson: bool = False,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Drive assistant.get_response at ``rps`` for ``duration`` seconds.
+    Arrivals that find ``max_outstanding`` requests already in flight are
+    dropped and counted rather than delayed.
+    """
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    lock = threading.Lock()
+    outstanding = 0
+    sent = 0
+    dropped = 0
+    failed = 0
+
+    def one_request(query: str, scheduled: float):
+        nonlocal outstanding, failed
+        try:
+            assistant.get_response(query, method=method)
+            ok = True
+        except Exception:
+            ok = False
+        finished = time.perf_counter()
+        with lock:
+            outstanding -= 1
+            if ok:
+                latencies.append(finished - scheduled)
+            else:
+                failed += 1
+
+    started = time.perf_counter()
+    next_arrival = started
+    end = started + duration
+    with ThreadPoolExecutor(max_workers=max_outstanding) as pool:
+        while next_arrival < end:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with lock:
+                if outstanding >= max_outstanding:
+                    dropped += 1
+                    admit = False
+                else:
+                    outstanding += 1
+                    admit = True
+            if admit:
+                pool.submit(one_request, queries[sent % len(queries)], next_arrival)
+                sent += 1
+            next_arrival += rng.expovariate(rps) if poisson else 1.0 / rps
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "target_rps": rps,
+        "achieved_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "duration_seconds": elapsed,
+        "sent": sent,
+        "completed": len(latencies),
+        "failed": failed,
+        "dropped": dropped,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "latency_max_ms": (latencies[-1] if latencies else 0.0) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for IndicSahayak")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="huggingface")
+    parser.add_argument("--base-url", help="Backend base URL (defaults to the started stub)")
+    parser.add_argument("--start-stub", action="store_true", help="Run a local stub server for the backend")
+    parser.add_argument("--stub-latency", default="lognormal:0.2,0.5")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-outstanding", type=int, default=256)
+    parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times instead of fixed")
+    parser.add_argument("--queries", help="JSONL file of queries (query/message/text field); synthetic otherwise")
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    method, stub_backend = BACKENDS[args.backend]
+    stub = None
+    counting: Optional[CountingClient] = None
+    clients = {}
+    if stub_backend:
+        base_url = args.base_url
+        if args.start_stub:
+            from stub_servers import StubProfile, StubServer
+            profile = StubProfile(latency=args.stub_latency, error_rate=args.stub_error_rate)
+            stub = StubServer(stub_backend, profile).start()
+            base_url = base_url or stub.base_url
+        if not base_url:
+            parser.error("--base-url or --start-stub is required for this backend")
+        counting = CountingClient(build_client(args.backend, base_url))
+        clients[method] = counting
+
+    if args.queries:
+        with open(args.queries, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        queries = [r if isinstance(r, str) else r.get("query") or r.get("message") or r.get("text") for r in records]
+        queries = [q for q in queries if q]
+    else:
+        queries = generate_queries(1000, 8)
+
+    summary = run_load(
+        IndicSahayak(clients=clients),
+        method,
+        args.rps,
+        args.duration,
+        queries,
+        max_outstanding=args.max_outstanding,
+        poisson=args.poisson
+    )
+    if counting is not None:
+        summary["backend_successes"] = counting.successes
+        summary["backend_failures"] = counting.failures
+        summary["backend_errors"] = counting.errors
+    if stub is not None:
+        stub.stop()
+
+    print(f"Target {summary['target_rps']:.1f} rps, achieved {summary['achieved_rps']:.1f} rps "
+          f"over {summary['duration_seconds']:.1f}s")
+    print(f"Sent {summary['sent']}, completed {summary['completed']}, "
+          f"failed {summary['failed']}, dropped {summary['dropped']}")
+    print(f"Latency p50 {summary['latency_p50_ms']:.1f} ms, p95 {summary['latency_p95_ms']:.1f} ms, "
+          f"p99 {summary['latency_p99_ms']:.1f} ms, max {summary['latency_max_ms']:.1f} ms")
+    if counting is not None:
+        print(f"Backend calls: {counting.successes} ok, {counting.failures} failed")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for IndicSahayak entry points
+Times imports in fresh interpreters so module caches never hide the cost
+Usage: python benchmarks/startup.py [--runs 10] [--output startup.json] [--budget-ms 250]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point name -> statement executed in a fresh interpreter
+TARGETS = {
+    "library": "import indic_sahayak, feedback_system",
+    "demo": "import demo",
+    "app": "import indic_sahayak, streamlit, pandas",
+    "api": "import api_server",
+}
+
+TIMER = (
+    "import time; _t = time.perf_counter(); {statement}; "
+    "print((time.perf_counter() - _t) * 1000)"
+)
+
+
+def time_import(statement: str, runs: int) -> Optional[List[float]]:
+    """Return per-run import times in milliseconds, or None if the import fails"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return None
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def run_benchmarks(runs: int, targets: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, statement in targets.items():
+        samples = time_import(statement, runs)
+        if samples is None:
+            results[name] = {"error": "import failed (missing dependency?)"}
+            continue
+        results[name] = {
+            "median_ms": statistics.median(samples),
+            "min_ms": min(samples),
+            "max_ms": max(samples),
+            "runs": runs
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of IndicSahayak entry points")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--budget-ms", type=float, help="Fail if library or demo median exceeds this")
+    parser.add_argument("--target", action="append", choices=sorted(TARGETS), help="Only run these targets")
+    args = parser.parse_args()
+
+    targets = {name: TARGETS[name] for name in (args.target or TARGETS)}
+    results = run_benchmarks(args.runs, targets)
+
+    for name, stats in results.items():
+        if "error" in stats:
+            print(f"{name:>8}: {stats['error']}")
+        else:
+            print(f"{name:>8}: median {stats['median_ms']:.1f} ms (min {stats['min_ms']:.1f}, max {stats['max_ms']:.1f})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.budget_ms is not None:
+        over = [
+            name for name in ("library", "demo")
+            if name in results and results[name].get("median_ms", 0) > args.budget_ms
+        ]
+        if over:
+            print(f"Over budget ({args.budget_ms} ms): {', '.join(over)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local stand-in inference servers for IndicSahayak load testing
+Speak the request/response shapes HuggingFaceClient, LocalModelClient and
+DifyClient expect, with configurable latency, errors and model loading
+
+Usage:
+    python benchmarks/stub_servers.py huggingface --port 8081 --latency lognormal:0.3,0.4
+    python benchmarks/stub_servers.py ollama --port 11434 --error-rate 0.02
+    python benchmarks/stub_servers.py dify --port 8083 --loading-requests 3
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+BACKENDS = ("huggingface", "ollama", "dify")
+
+CANNED_REPLIES = {
+    "Hindi": "नमस्ते! मैं आपकी कैसे मदद कर सकता हूं? मुझे हिंदी और तेलुगु में सहायता करना पसंद है।",
+    "Telugu": "నమస్కారం! నేను మీకు ఎలా సహాయం చేయగలను? తెలుగు మరియు హిందీ నేర్చుకోవడంలో సహాయం చేస్తాను.",
+    "English": "Hello! I'm a stub model. I can help you with Hindi and Telugu languages today.",
+}
+
+
+@dataclass
+class StubProfile:
+    """Behaviour of a stub server"""
+    latency: str = "fixed:0.05"  # fixed:S | uniform:LO,HI | exponential:MEAN | lognormal:MEDIAN,SIGMA
+    error_rate: float = 0.0  # Fraction of requests answered with a 500
+    rate_limit_rate: float = 0.0  # Fraction of requests answered with a 429
+    loading_requests: int = 0  # First N requests per model answer 503 "currently loading"
+    stream_chunk_delay: float = 0.01  # Seconds between streamed chunks
+    seed: Optional[int] = None
+    rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+
+    def sample_latency(self) -> float:
+        kind, _, params = self.latency.partition(":")
+        values = [float(v) for v in params.split(",") if v]
+        if kind == "fixed":
+            return values[0] if values else 0.0
+        if kind == "uniform":
+            return self.rng.uniform(values[0], values[1])
+        if kind == "exponential":
+            return self.rng.expovariate(1 / values[0])
+        if kind == "lognormal":
+            return self.rng.lognormvariate(math.log(values[0]), values[1])
+        raise ValueError(f"Unknown latency distribution: {self.latency}")
+
+    def sample_failure(self) -> Optional[int]:
+        roll = self.rng.random()
+        if roll < self.error_rate:
+            return 500
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 429
+        return None
+
+
+def _detect_language(text: str) -> str:
+    if any('\u0900' <= char <= '\u097F' for char in text):
+        return "Hindi"
+    if any('\u0C00' <= char <= '\u0C7F' for char in text):
+        return "Telugu"
+    return "English"
+
+
+def _reply_for(prompt: str, max_words: Optional[int] = None) -> str:
+    # Answer in the script of the user's last turn, not the system prompt
+    last_turn = prompt.rsplit("User:", 1)[-1]
+    words = CANNED_REPLIES[_detect_language(last_turn)].split()
+    if max_words:
+        words = words[:max_words]
+    return " ".join(words)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler; the owning server carries the backend name, profile and counters"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # Helpers
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return {}
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _simulate(self, model: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Apply loading, latency and error behaviour; returns an error response or None"""
+        profile = self.server.profile
+        with self.server.lock:
+            self.server.request_counts[model] = self.server.request_counts.get(model, 0) + 1
+            seen = self.server.request_counts[model]
+            failure = profile.sample_failure()
+            latency = profile.sample_latency()
+        if seen <= profile.loading_requests:
+            return 503, {"error": f"Model {model} is currently loading", "estimated_time": 20.0}
+        time.sleep(latency)
+        if failure == 429:
+            return 429, {"error": "Rate limit reached"}
+        if failure == 500:
+            return 500, {"error": "Internal server error"}
+        return None
+
+    # Routing
+
+    def do_GET(self):
+        backend = self.server.backend
+        if backend == "ollama" and self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": "llama2:7b"}]})
+        elif backend == "dify" and self.path.rstrip("/").endswith("/workflows"):
+            self._send_json(200, {"data": []})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        backend = self.server.backend
+        payload = self._read_json()
+        if backend == "huggingface" and "/models/" in self.path:
+            self._huggingface(self.path.split("/models/", 1)[1], payload)
+        elif backend == "ollama" and self.path == "/api/generate":
+            self._ollama(payload)
+        elif backend == "dify" and self.path.rstrip("/").endswith("/workflows/run"):
+            self._dify(payload)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _huggingface(self, model: str, payload: Dict[str, Any]):
+        error = self._simulate(model)
+        if error:
+            self._send_json(*error)
+            return
+        max_words = payload.get("parameters", {}).get("max_new_tokens")
+        reply = _reply_for(payload.get("inputs", ""), max_words)
+        result = {"generated_text": reply}
+        if payload.get("parameters", {}).get("details"):
+            words = len(reply.split())
+            result["details"] = {
+                "finish_reason": "length" if max_words and words >= max_words else "eos_token",
+                "generated_tokens": words
+            }
+        self._send_json(200, [result])
+
+    def _ollama(self, payload: Dict[str, Any]):
+        model = payload.get("model", "llama2:7b")
+        error = self._simulate(model)
+        if error:
+            self._send_json(*error)
+            return
+        prompt = payload.get("prompt", "")
+        reply = _reply_for(prompt, payload.get("options", {}).get("num_predict"))
+        words = reply.split()
+        final = {
+            "model": model,
+            "done": True,
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": len(words),
+            "eval_duration": int(len(words) * self.server.profile.stream_chunk_delay * 1e9)
+        }
+        if not payload.get("stream", True):
+            self._send_json(200, {**final, "response": reply})
+            return
+        self._start_stream("application/x-ndjson")
+        for word in words:
+            time.sleep(self.server.profile.stream_chunk_delay)
+            chunk = {"model": model, "response": word + " ", "done": False}
+            self._send_chunk((json.dumps(chunk, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._send_chunk((json.dumps({**final, "response": ""}) + "\n").encode("utf-8"))
+        self._end_stream()
+
+    def _dify(self, payload: Dict[str, Any]):
+        error = self._simulate("dify_workflow")
+        if error:
+            self._send_json(*error)
+            return
+        reply = _reply_for(payload.get("inputs", {}).get("query", ""))
+        if payload.get("response_mode") != "streaming":
+            self._send_json(200, {"data": {"status": "succeeded", "outputs": {"answer": reply}}})
+            return
+        self._start_stream("text/event-stream")
+        for word in reply.split():
+            time.sleep(self.server.profile.stream_chunk_delay)
+            event = {"event": "text_chunk", "data": {"text": word + " "}}
+            self._send_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+        event = {"event": "workflow_finished", "data": {"status": "succeeded", "outputs": {"answer": reply}}}
+        self._send_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self._end_stream()
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server for one backend"""
+
+    daemon_threads = True
+
+    def __init__(self, backend: str, profile: StubProfile, host: str = "127.0.0.1", port: int = 0, verbose: bool = False):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        super().__init__((host, port), StubHandler)
+        self.backend = backend
+        self.profile = profile
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to hand to the matching client"""
+        host, port = self.server_address[:2]
+        root = f"http://{host}:{port}"
+        return {"huggingface": f"{root}/models", "ollama": root, "dify": f"{root}/v1"}[self.backend]
+
+    def start(self) -> "StubServer":
+        """Serve on a background thread"""
+        threading.Thread(target=self.serve_forever, name=f"stub-{self.backend}", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub inference server")
+    parser.add_argument("backend", choices=BACKENDS)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", default="fixed:0.05")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--loading-requests", type=int, default=0)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.01)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    profile = StubProfile(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        loading_requests=args.loading_requests,
+        stream_chunk_delay=args.stream_chunk_delay,
+        seed=args.seed
+    )
+    server = StubServer(args.backend, profile, args.host, args.port, args.verbose)
+    print(f"Stub {args.backend} server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
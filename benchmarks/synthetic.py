@@ -0,0 +1,82 @@
+"""
+Synthetic data generators for IndicSahayak benchmarks
+All generators are deterministic for a given seed
+"""
+
+import json
+import os
+import random
+import sys
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_system import UserFeedback
+
+HINDI_WORDS = ["नमस्ते", "भाषा", "सीखना", "अनुवाद", "मदद", "त्योहार", "व्याकरण", "शब्द", "कैसे", "क्या"]
+TELUGU_WORDS = ["నమస్కారం", "భాష", "నేర్చుకోవడం", "అనువాదం", "సహాయం", "పండుగ", "వ్యాకరణం", "పదం", "ఎలా", "ఏమిటి"]
+ENGLISH_WORDS = ["hello", "language", "learn", "translate", "help", "festival", "grammar", "word", "how", "what"]
+
+LANGUAGES = ["Hindi", "Telugu", "English", "Mixed"]
+INTERACTION_TYPES = ["translation", "learning", "general", "cultural"]
+ISSUES = [
+    "", "", "", "slow response", "wrong script", "translation was too literal",
+    "थोड़ा तेज़ response हो सकता है", "మరిన్ని ఉదాహరణలు జోడించండి"
+]
+
+
+def generate_query(rng: random.Random, words: int, script: str = "mixed") -> str:
+    """Build a query of ``words`` words in one script, or mixed across all three"""
+    vocabularies = {
+        "Hindi": [HINDI_WORDS],
+        "Telugu": [TELUGU_WORDS],
+        "English": [ENGLISH_WORDS],
+        "mixed": [HINDI_WORDS, TELUGU_WORDS, ENGLISH_WORDS],
+    }[script]
+    return " ".join(rng.choice(rng.choice(vocabularies)) for _ in range(words))
+
+
+def generate_queries(count: int, words: int, script: str = "mixed", seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [generate_query(rng, words, script) for _ in range(count)]
+
+
+def generate_feedback(count: int, seed: int = 0, days: int = 365) -> Iterator[UserFeedback]:
+    """Yield ``count`` feedback records spread evenly over ``days`` days from 2025-01-01"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    span = days * 86400
+    for i in range(count):
+        language = rng.choice(LANGUAGES)
+        yield UserFeedback(
+            feedback_id=str(uuid.UUID(int=rng.getrandbits(128))),
+            user_id=f"user_{rng.randint(0, max(count // 10, 1)):07d}",
+            timestamp=(start + timedelta(seconds=span * i // max(count, 1))).isoformat(),
+            rating=rng.randint(1, 5),
+            language_used=language,
+            interaction_type=rng.choice(INTERACTION_TYPES),
+            comments=generate_query(rng, 8, language if language != "Mixed" else "mixed"),
+            response_quality=rng.randint(1, 5),
+            cultural_sensitivity=rng.randint(1, 5),
+            language_accuracy=rng.randint(1, 5),
+            helpfulness=rng.randint(1, 5),
+            response_speed=rng.randint(1, 5),
+            user_satisfaction=rng.randint(1, 5),
+            would_recommend=rng.random() < 0.8,
+            improvement_suggestions=rng.choice(ISSUES),
+            technical_issues=rng.choice(ISSUES)
+        )
+
+
+def write_feedback_file(path: str, count: int, seed: int = 0):
+    """Write a feedback_data.json-compatible file with ``count`` records"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for i, feedback in enumerate(generate_feedback(count, seed)):
+            if i:
+                f.write(",")
+            f.write(json.dumps(asdict(feedback), ensure_ascii=False))
+        f.write("]")
@@ -0,0 +1,183 @@
+"""
+Cache warming for IndicSahayak
+Mines the most frequent normalized queries from recorded traffic (JSONL
+request logs and the session store) and precomputes their replies and
+translations within a time budget, so the first users after a deploy do not
+pay full model latency. Run it offline to produce a snapshot that servers
+restore on boot, or let api_server warm in the background at startup.
+
+Usage:
+    python cache_warmer.py traffic.jsonl [sessions] [--method huggingface] [--budget 30] [--top 200]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from config import Config
+from response_cache import normalize_query
+
+SESSIONS_SOURCE = "sessions"
+
+
+def read_traffic(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Requests from a JSONL traffic file: chat records carry query, message or
+    text (and optionally method); translation records carry text,
+    source_lang and target_lang, as in the /translate API.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, str):
+                record = {"query": record}
+            if not isinstance(record, dict):
+                continue
+            if record.get("source_lang") and record.get("target_lang") and record.get("text"):
+                yield {
+                    "kind": "translate", "text": record["text"],
+                    "source_lang": record["source_lang"], "target_lang": record["target_lang"]
+                }
+                continue
+            query = record.get("query") or record.get("message") or record.get("text")
+            if query:
+                yield {"kind": "chat", "text": query, "method": record.get("method")}
+
+
+def mine_queries(sources: Iterable[str], top_n: int = Config.CACHE_WARM_TOP_N) -> List[Dict[str, Any]]:
+    """
+    The top_n most frequent requests across sources, most frequent first.
+    Requests are grouped by normalized text; the first raw text seen for a
+    group is the one that gets warmed.
+    """
+    counts: Counter = Counter()
+    samples: Dict[tuple, Dict[str, Any]] = {}
+
+    def count(item: Dict[str, Any], weight: int = 1):
+        if item["kind"] == "translate":
+            key = ("translate", item["source_lang"], item["target_lang"], normalize_query(item["text"]))
+        else:
+            key = ("chat", item.get("method") or "", normalize_query(item["text"]))
+        counts[key] += weight
+        samples.setdefault(key, item)
+
+    for source in sources:
+        if source == SESSIONS_SOURCE:
+            from session_store import get_session_store
+            for text, weight in get_session_store().top_queries(top_n * 4):
+                count({"kind": "chat", "text": text, "method": None}, weight)
+        elif os.path.exists(source):
+            for item in read_traffic(source):
+                count(item)
+        else:
+            print(f"Skipping missing traffic source: {source}")
+    return [dict(samples[key], count=n) for key, n in counts.most_common(top_n)]
+
+
+def warm_cache(
+    items: List[Dict[str, Any]],
+    chat: Optional[Callable[[str, str], Any]] = None,
+    translate: Optional[Callable[[str, str, str], Any]] = None,
+    method: str = "huggingface",
+    time_budget: float = Config.CACHE_WARM_BUDGET,
+    workers: int = Config.CACHE_WARM_WORKERS
+) -> Dict[str, Any]:
+    """
+    Run chat(text, method) and translate(text, source_lang, target_lang) for
+    each mined item, most frequent first, until time_budget runs out. The
+    callables are expected to fill the response cache themselves and return
+    whether a model answered; other replies (rule-based fallbacks, failed
+    translations) are not cached and count as not_cached.
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
+    stats = {"warmed": 0, "not_cached": 0, "errors": 0, "skipped": 0}
+
+    def tally(future):
+        if future.exception() is not None:
+            stats["errors"] += 1
+        elif future.result():
+            stats["warmed"] += 1
+        else:
+            stats["not_cached"] += 1
+
+    def run(item: Dict[str, Any]):
+        if item["kind"] == "translate":
+            return translate(item["text"], item["source_lang"], item["target_lang"])
+        return chat(item["text"], item.get("method") or method)
+
+    runnable = [
+        item for item in items
+        if (translate if item["kind"] == "translate" else chat) is not None
+    ]
+    stats["skipped"] = len(items) - len(runnable)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cache-warm") as pool:
+        pending = set()
+        for position, item in enumerate(runnable):
+            while len(pending) >= workers:
+                done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    tally(future)
+                if time.monotonic() >= deadline:
+                    break
+            if time.monotonic() >= deadline:
+                stats["skipped"] += len(runnable) - position
+                break
+            pending.add(pool.submit(run, item))
+        # Requests already sent are allowed to finish; their replies are still worth caching
+        for future in pending:
+            tally(future)
+    stats["elapsed_seconds"] = time.monotonic() - started
+    return stats
+
+
+def parse_sources(value: str) -> List[str]:
+    return [source.strip() for source in value.split(",") if source.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute cached replies for frequent queries")
+    parser.add_argument("sources", nargs="+", help=f"Traffic JSONL files, or '{SESSIONS_SOURCE}' for the session store")
+    parser.add_argument("--method", help="Backend for chat queries without one (default: huggingface if configured)")
+    parser.add_argument("--top", type=int, default=Config.CACHE_WARM_TOP_N)
+    parser.add_argument("--budget", type=float, default=Config.CACHE_WARM_BUDGET, help="Seconds to spend")
+    parser.add_argument("--workers", type=int, default=Config.CACHE_WARM_WORKERS)
+    args = parser.parse_args(argv)
+
+    from indic_sahayak import create_configured_assistant
+    from response_cache import cached_translate, get_response_cache
+
+    # Only backends with credentials (see Config.configured_methods); the rest would only produce errors
+    assistant = create_configured_assistant()
+    clients = assistant.clients
+    if not clients:
+        print("No model backend is configured; chat replies would not be cached")
+    translator = clients.get("huggingface")
+    items = mine_queries(args.sources, args.top)
+    stats = warm_cache(
+        items,
+        chat=assistant.warm_response if clients else None,
+        translate=(
+            lambda text, source, target: cached_translate(translator, text, source, target).get("success", False)
+        ) if translator is not None else None,
+        method=args.method or ("huggingface" if "huggingface" in clients else next(iter(clients), "huggingface")),
+        time_budget=args.budget,
+        workers=args.workers
+    )
+    saved = get_response_cache().snapshot()
+    print(f"Warmed {stats['warmed']} of {len(items)} queries in {stats['elapsed_seconds']:.1f}s "
+          f"({stats['not_cached']} not cached, {stats['errors']} errors, {stats['skipped']} skipped); "
+          f"snapshot has {saved} entries")
+
+
+if __name__ == "__main__":
+    main()
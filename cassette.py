@@ -0,0 +1,353 @@
+"""
+Traffic cassettes for IndicSahayak
+Records the backend calls made by the clients in huggingface_client (call
+arguments, HTTP status, response body, latency and arrival time) into a
+compact JSON-lines file, gzipped when the name ends in .gz. In replay mode
+the clients are served from the cassette at the original latency, or scaled
+by time_scale, so cache, batching and routing changes can be measured
+offline on a real query distribution. Request headers, and with them API
+keys, are never recorded. Each recording process writes its own
+<cassette>.<pid> file; loading merges them with the cassette file itself.
+
+Usage:
+    INDIC_CASSETTE_MODE=record streamlit run indic_sahayak.py
+    python cassette.py info traffic.cassette.jsonl.gz
+    python cassette.py replay traffic.cassette.jsonl.gz [--time-scale 0.5] [--workers 8]
+"""
+
+import argparse
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from config import Config
+from sketches import QuantileSketch
+
+CASSETTE_VERSION = 1
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMiss(LookupError):
+    """A replayed request that was never recorded"""
+
+
+class ReplayedResponse:
+    """The parts of a requests.Response the clients read"""
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+def _compressed(path: str) -> bool:
+    stem, _, suffix = path.rpartition(".")
+    if suffix.isdigit():
+        path = stem  # A per-process recording is compressed like its cassette
+    return path.endswith(".gz")
+
+
+def _open(path: str, mode: str, compressed: bool):
+    if compressed:
+        return gzip.open(path, mode + "t", encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def request_key(client: str, url: str, payload: Dict[str, Any]) -> str:
+    """Digest a replayed request is matched on; the payload itself is not stored"""
+    canonical = json.dumps([client, url, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded client traffic.
+
+    Entries are kept in arrival order. Replay matches a request on a digest
+    of its client, URL and JSON payload; identical requests get their
+    recorded responses in order, wrapping around when the recording runs out.
+    Recordings from several processes are merged on a shared wall-clock
+    timeline.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, time_scale: float = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = []
+        self._index: Dict[str, List[Dict[str, Any]]] = {}
+        self._next: Counter = Counter()
+        self._started = time.monotonic()
+        self._started_at = time.time()  # Aligns offsets across the files of several processes
+        self.hits = 0
+        self.misses = 0
+        if mode == REPLAY:
+            self.load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def part_path(self) -> str:
+        """This process's recording; with several workers each saves its own at exit"""
+        return f"{self.path}.{os.getpid()}"
+
+    def files(self) -> List[str]:
+        """The cassette file, if present, followed by the per-process recordings next to it"""
+        directory = os.path.dirname(self.path) or "."
+        prefix = os.path.basename(self.path) + "."
+        parts = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+        return ([self.path] if os.path.exists(self.path) else []) + parts
+
+    def load(self):
+        """Read the cassette and its per-process recordings, and index the entries for replay"""
+        files = self.files()
+        if not files:
+            raise FileNotFoundError(f"No cassette at {self.path}")
+        recordings = []
+        for path in files:
+            started_at = None
+            entries = []
+            with _open(path, 'r', _compressed(path)) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    if "cassette" in record:
+                        if record["cassette"] != CASSETTE_VERSION:
+                            raise ValueError(f"Unsupported cassette version: {record['cassette']}")
+                        started_at = record.get("started_at")
+                        continue
+                    entries.append(record)
+            recordings.append((started_at, entries))
+        # Offsets count from each process's start; shift them onto the earliest one
+        first = min((started_at for started_at, _ in recordings if started_at is not None), default=0.0)
+        entries = []
+        for started_at, recorded in recordings:
+            shift = started_at - first if started_at is not None else 0.0
+            for entry in recorded:
+                entry["offset"] += shift
+                entries.append(entry)
+        entries.sort(key=lambda entry: entry["offset"])
+        with self._lock:
+            self.entries = entries
+            self._index = {}
+            self._next.clear()
+            for entry in entries:
+                self._index.setdefault(entry["key"], []).append(entry)
+
+    def save(self, path: Optional[str] = None) -> int:
+        """Atomically write recorded entries (to part_path by default); returns the count"""
+        path = path or self.part_path
+        with self._lock:
+            entries = list(self.entries)
+        if not entries:
+            return 0
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+            )
+            os.close(fd)
+            # Through gzip, the system prompt repeated in every entry costs a few bytes each
+            with _open(tmp_path, 'w', _compressed(path)) as f:
+                header = {"cassette": CASSETTE_VERSION, "entries": len(entries), "started_at": self._started_at}
+                f.write(json.dumps(header) + "\n")
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing cassette: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return 0
+        return len(entries)
+
+    def post(
+        self,
+        client: str,
+        call: Dict[str, Any],
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float
+    ):
+        """
+        requests.post for a client: recorded or replayed depending on mode.
+        call holds the client-level arguments, so the traffic can be re-issued
+        with replay_traffic.
+        """
+        if self.mode == REPLAY:
+            return self._replay(client, url, payload)
+
+        import requests
+        offset = time.monotonic() - self._started
+        started = time.perf_counter()
+        entry = {"offset": offset, "client": client, "call": call, "key": request_key(client, url, payload)}
+        try:
+            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        except Exception as e:
+            entry.update(elapsed=time.perf_counter() - started, error=type(e).__name__, message=str(e))
+            self._append(entry)
+            raise
+        entry.update(elapsed=time.perf_counter() - started, status=response.status_code, body=response.text)
+        self._append(entry)
+        return response
+
+    def _append(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries.append(entry)
+
+    def _replay(self, client: str, url: str, payload: Dict[str, Any]):
+        key = request_key(client, url, payload)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {client} response for this request")
+            entry = recorded[self._next[key] % len(recorded)]
+            self._next[key] += 1
+            self.hits += 1
+        if self.time_scale:
+            time.sleep(entry["elapsed"] * self.time_scale)
+        if "error" in entry:
+            if entry["error"] == "Timeout":
+                import requests
+                raise requests.exceptions.Timeout(entry["message"])
+            raise ConnectionError(entry["message"])
+        return ReplayedResponse(entry["status"], entry["body"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self.entries)
+            hits, misses = self.hits, self.misses
+        return {
+            "mode": self.mode,
+            "entries": len(entries),
+            "duration_seconds": entries[-1]["offset"] - entries[0]["offset"] if entries else 0.0,
+            "clients": dict(Counter(entry["client"] for entry in entries)),
+            "hits": hits,
+            "misses": misses
+        }
+
+
+def replay_traffic(
+    cassette: Cassette,
+    clients: Dict[str, Any],
+    time_scale: Optional[float] = None,
+    workers: int = Config.CASSETTE_REPLAY_WORKERS
+) -> Dict[str, Any]:
+    """
+    Re-issue the recorded calls through clients (keyed like the cassette:
+    "huggingface", "local", "dify") at their recorded arrival times, scaled
+    by time_scale (0 sends them back to back). The clients would normally be
+    in replay mode on the same cassette, possibly behind a scheduler or other
+    wrappers under test. Returns client-side latency percentiles.
+    """
+    time_scale = cassette.time_scale if time_scale is None else time_scale
+    latencies = QuantileSketch(Config.QUANTILE_RELATIVE_ACCURACY)
+    stats = {"requests": 0, "errors": 0, "skipped": 0}
+    lock = threading.Lock()
+
+    def send(client, call: Dict[str, Any]):
+        started = time.perf_counter()
+        try:
+            result = client.generate_response(**call)
+            ok = isinstance(result, dict) and result.get("success", False)
+        except Exception:
+            ok = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.add(elapsed_ms)
+            stats["requests"] += 1
+            if not ok:
+                stats["errors"] += 1
+
+    entries = list(cassette.entries)
+    first_offset = entries[0]["offset"] if entries else 0.0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cassette-replay") as pool:
+        for entry in entries:
+            client = clients.get(entry["client"])
+            if client is None:
+                stats["skipped"] += 1
+                continue
+            delay = started + (entry["offset"] - first_offset) * time_scale - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, client, entry["call"])
+    stats["elapsed_seconds"] = time.monotonic() - started
+    stats["latency_ms"] = {
+        f"p{int(q * 100)}": latencies.quantile(q) if latencies.count else 0.0
+        for q in (0.5, 0.95, 0.99)
+    }
+    return stats
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Process-wide cassette from Config.CASSETTE_MODE, or None when traffic
+    goes to the live backends. A recording is saved at exit.
+    """
+    global _cassette
+    if not Config.CASSETTE_MODE:
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(Config.CASSETTE_PATH, Config.CASSETTE_MODE, Config.CASSETTE_TIME_SCALE)
+            if _cassette.mode == RECORD:
+                atexit.register(_cassette.save)
+        return _cassette
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or replay a recorded traffic cassette")
+    parser.add_argument("command", choices=["info", "replay"])
+    parser.add_argument("path", help="Cassette file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--time-scale", type=float, default=Config.CASSETTE_TIME_SCALE,
+                        help="Multiplier on recorded latencies and arrival gaps (0 = no waiting)")
+    parser.add_argument("--workers", type=int, default=Config.CASSETTE_REPLAY_WORKERS)
+    args = parser.parse_args(argv)
+
+    cassette = Cassette(args.path, REPLAY, args.time_scale)
+    if args.command == "info":
+        print(json.dumps(cassette.get_stats(), indent=2))
+        return
+
+    from huggingface_client import HuggingFaceClient, LocalModelClient, DifyClient
+    clients = {
+        "huggingface": HuggingFaceClient(cassette=cassette),
+        "local": LocalModelClient(cassette=cassette),
+        "dify": DifyClient(cassette=cassette)
+    }
+    stats = replay_traffic(cassette, clients, args.time_scale, args.workers)
+    latency = stats["latency_ms"]
+    print(f"Replayed {stats['requests']} requests in {stats['elapsed_seconds']:.1f}s "
+          f"({stats['errors']} errors, {stats['skipped']} skipped, {cassette.misses} unmatched); "
+          f"p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, p99 {latency['p99']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
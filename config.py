@@ -4,7 +4,7 @@ Supports multiple deployment methods and model configurations
 """
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class Config:
     """Configuration class for IndicSahayak"""
@@ -39,20 +39,110 @@ class Config:
     # API Keys (should be set as environment variables)
     HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
     DIFY_API_KEY = os.getenv("DIFY_API_KEY", "")
+    LOCAL_MODEL_ENABLED = os.getenv("INDIC_LOCAL_MODEL", "0") == "1"  # An Ollama server is running
+    
+    # Outbound admission control per backend (requests/second, burst size,
+    # queued requests, dispatch threads)
+    RATE_LIMITS = {
+        "huggingface": {"rate": 5.0, "burst": 10, "max_queue": 100, "concurrency": 4},
+        "local": {"rate": 20.0, "burst": 20, "max_queue": 200, "concurrency": 2},
+        "dify": {"rate": 5.0, "burst": 10, "max_queue": 100, "concurrency": 4},
+        "default": {"rate": 5.0, "burst": 5, "max_queue": 50, "concurrency": 2}
+    }
+    SCHEDULER_DEFAULT_DEADLINE = 10.0  # Seconds a request may wait in the queue
+    SCHEDULER_RATE_LIMIT_BACKOFF = 5.0  # Seconds to pause a backend after a 429
     
     # Response settings
     MAX_TOKENS = 200
     TEMPERATURE = 0.7
     TOP_P = 0.9
+    # Starting max_new_tokens per intent, until enough completions have been observed
+    GENERATION_BUDGETS = {
+        "greeting": 48,
+        "translation": 96,
+        "learning": 320,
+        "cultural": 320,
+        "general": MAX_TOKENS
+    }
+    GENERATION_MIN_TOKENS = 16
+    GENERATION_MAX_TOKENS = 512
+    GENERATION_MIN_SAMPLES = 20  # Observed completions before a learned budget replaces the default
+    GENERATION_BUDGET_QUANTILE = 0.95  # Completion length a budget must cover...
+    GENERATION_BUDGET_HEADROOM = 1.25  # ...times this margin
+    TRANSLATION_TOKEN_RATIO = 2.0  # Output tokens allowed per source token, so paragraphs are not cut off
+    # The prompt ends in "Assistant:", so a model that starts the next "User:" turn is done
+    GENERATION_STOP_SEQUENCES = {
+        "default": ["\nUser:"],
+        "greeting": ["\nUser:", "\n\n"]
+    }
+    
+    # Response cache settings
+    RESPONSE_CACHE_SIZE = 4096  # Model replies and translations kept in memory
+    RESPONSE_CACHE_TTL = 24 * 3600  # Seconds before a cached reply is regenerated
+    RESPONSE_CACHE_SNAPSHOT = os.getenv("INDIC_RESPONSE_CACHE_SNAPSHOT", "response_cache.json")  # "" disables
+    CACHE_WARM_SOURCES = os.getenv("INDIC_CACHE_WARM_SOURCES", "")  # Comma-separated traffic JSONL files and/or "sessions"
+    CACHE_WARM_TOP_N = 200  # Most frequent queries to precompute
+    CACHE_WARM_BUDGET = 30.0  # Seconds warm-up may spend at startup
+    CACHE_WARM_WORKERS = 4
+    
+    # Traffic cassette settings
+    CASSETTE_MODE = os.getenv("INDIC_CASSETTE_MODE", "")  # "record", "replay", or "" for live backends
+    CASSETTE_PATH = os.getenv("INDIC_CASSETTE", "traffic.cassette.jsonl.gz")
+    CASSETTE_TIME_SCALE = float(os.getenv("INDIC_CASSETTE_TIME_SCALE", "1.0"))  # Replayed latency multiplier; 0 = instant
+    CASSETTE_REPLAY_WORKERS = 8  # Concurrent calls when re-issuing recorded traffic
+    
+    # Token accounting settings
+    TOKENIZER_PATH = os.getenv("INDIC_TOKENIZER_PATH", "")  # Local tokenizer.json for BPE counting
+    CHARS_PER_TOKEN = {  # Fallback estimator ratios, calibrated per script
+        "Latin": 4.0,
+        "Devanagari": 2.5,
+        "Telugu": 2.2,
+        "Digit": 3.0,
+        "Other": 1.0
+    }
+    
+    # Transliteration settings
+    TRANSLITERATION_SCHEME = os.getenv("INDIC_TRANSLITERATION_SCHEME", "iso")  # "iso" (ISO 15919) or "itrans"
+    APPEND_TRANSLITERATION = os.getenv("INDIC_APPEND_TRANSLITERATION", "1") == "1"  # Romanize model replies locally
     
     # Feedback settings
+    FEEDBACK_FILE = os.getenv("INDIC_FEEDBACK_FILE", "feedback_data.json")  # Process-wide feedback store
     MIN_FEEDBACK_LENGTH = 10
     MAX_FEEDBACK_LENGTH = 500
+    HLL_PRECISION = 12  # 4096 registers, ~1.6% distinct-count error
+    QUANTILE_RELATIVE_ACCURACY = 0.01
+    ISSUE_TRACKER_CAPACITY = 256  # Heavy-hitter terms tracked overall
+    ISSUE_TRACKER_LANGUAGE_CAPACITY = 128  # Heavy-hitter terms tracked per language
+    FEEDBACK_BATCH_SIZE = 256  # Records per group commit
+    FEEDBACK_BATCH_DELAY = 0.05  # Seconds a record may wait for its batch to fill
+    FEEDBACK_QUEUE_SIZE = 10000  # Pending records before add_feedback blocks
+    FEEDBACK_SEGMENT_MAX_RECORDS = 50000  # Records per segment before it is sealed
+    FEEDBACK_SEGMENT_MAX_AGE = 24 * 3600  # Seconds before the active segment is sealed
+    FEEDBACK_RETENTION_DAYS = int(os.getenv("INDIC_FEEDBACK_RETENTION_DAYS", "0"))  # 0 keeps everything
+    FEEDBACK_COMPACTION_INTERVAL = 3600  # Seconds between background compactions
+    ANALYTICS_WORKERS = int(os.getenv("INDIC_ANALYTICS_WORKERS", "0"))  # Report processes; 0 uses every core
+    ANALYTICS_SPLIT_BYTES = 64 * 1024 * 1024  # JSON-lines shards are split into map tasks of this size
     
     # UI settings
     MAX_CHAT_HISTORY = 50
+    CHAT_HISTORY_PAGE_SIZE = 20  # Messages rendered per rerun; older ones behind "Load older"
+    CHAT_SESSION_MAX_BYTES = 64 * 1024  # In-memory message text per session; older turns spill to disk
+    CHAT_SPILL_DIR = os.getenv("INDIC_CHAT_SPILL_DIR", "")  # Defaults to a temp directory
+    SESSION_STORE_URL = os.getenv("INDIC_SESSION_STORE", "sqlite:///sessions.db")  # or memory://
+    SESSION_CACHE_SIZE = 1024  # Sessions kept in the read-through cache
+    SESSION_FLUSH_INTERVAL = 0.5  # Seconds between write-behind flushes
+    SESSION_FLUSH_BATCH = 128  # Pending messages that trigger an early flush
     AUTO_DETECT_LANGUAGE = True
     
+    # HTTP API settings
+    API_HOST = os.getenv("INDIC_API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("INDIC_API_PORT", "8000"))
+    API_WORKERS = int(os.getenv("INDIC_API_WORKERS", "1"))  # Worker processes
+    API_MAX_CONCURRENCY = int(os.getenv("INDIC_API_MAX_CONCURRENCY", "16"))  # In-flight requests per worker
+    API_QUEUE_TIMEOUT = float(os.getenv("INDIC_API_QUEUE_TIMEOUT", "2.0"))  # Seconds to wait for a slot before 503
+    API_MAX_BODY_BYTES = 64 * 1024
+    API_FEEDBACK_FILE = os.getenv("INDIC_API_FEEDBACK_FILE", FEEDBACK_FILE)
+    
     @classmethod
     def get_model_config(cls, method: str) -> Dict[str, Any]:
         """Get configuration for a specific method"""
@@ -66,6 +156,16 @@ class Config:
         elif method == "dify":
             return bool(cls.DIFY_API_KEY)
         return True  # Local methods don't need API keys
+    
+    @classmethod
+    def configured_methods(cls) -> List[str]:
+        """Backends the app should send chat to: API keys set, local model enabled, or a replayed cassette"""
+        if cls.CASSETTE_MODE == "replay":
+            return ["huggingface", "local", "dify"]
+        methods = [method for method in ("huggingface", "dify") if cls.is_api_key_available(method)]
+        if cls.LOCAL_MODEL_ENABLED:
+            methods.append("local")
+        return methods
 
 # Language-specific configurations
 LANGUAGE_CONFIG = {
@@ -0,0 +1,182 @@
+"""
+Bounded conversation memory for IndicSahayak sessions
+Keeps the latest turns in a fixed-size ring buffer with a byte cap and
+spills older turns to a per-session JSON-lines file (or leaves them in a
+shared session store) that is read back only when the user scrolls up
+"""
+
+import json
+import os
+import tempfile
+import uuid
+import weakref
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+from config import Config
+
+# Roles are stored as small ints to keep each in-memory message compact
+ROLES = ("user", "assistant", "system")
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+
+def _default_spill_dir() -> str:
+    return Config.CHAT_SPILL_DIR or os.path.join(tempfile.gettempdir(), "indic_sahayak_sessions")
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ConversationMemory:
+    """
+    Per-session chat history with a hard memory cap.
+
+    At most ``max_messages`` messages and ``max_bytes`` of text stay in
+    memory, as (role code, content) tuples. Older messages are appended to
+    a spill file when ``spill`` is enabled (and dropped otherwise); their
+    byte offsets are kept so any page can be read back without a scan.
+    The spill file is deleted when the memory is garbage collected.
+
+    With a ``store`` (see session_store) every message is also persisted
+    there, the ring buffer is warmed from it, and older turns are paged back
+    from the store instead of a spill file.
+    """
+
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        max_messages: int = Config.MAX_CHAT_HISTORY,
+        max_bytes: int = Config.CHAT_SESSION_MAX_BYTES,
+        spill: bool = True,
+        spill_dir: Optional[str] = None,
+        store=None
+    ):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._recent: deque = deque()
+        self._recent_bytes = 0
+        self.spill_path: Optional[str] = None
+        self._spill_offsets = array("q")  # Byte offset of every spilled message
+        self._spill_size = 0
+        self.dropped = 0  # Messages evicted without a spill file
+        self.store = store
+        self.offloaded = 0  # Messages only held by the store
+        if store is not None:
+            warm = store.recent(self.session_id, max_messages)
+            self.offloaded = store.count(self.session_id) - len(warm)
+            for message in warm:
+                self._push(message["role"], message["content"])
+        elif spill:
+            directory = spill_dir or _default_spill_dir()
+            os.makedirs(directory, exist_ok=True)
+            self.spill_path = os.path.join(directory, f"{self.session_id}.jsonl")
+            _remove_file(self.spill_path)
+            weakref.finalize(self, _remove_file, self.spill_path)
+
+    def __len__(self) -> int:
+        return self.dropped + self.offloaded + len(self._spill_offsets) + len(self._recent)
+
+    @property
+    def in_memory(self) -> int:
+        return len(self._recent)
+
+    def append(self, role: str, content: str):
+        """Add a message, evicting the oldest ones past the caps"""
+        if self.store is not None:
+            self.store.append(self.session_id, role, content)
+        self._push(role, content)
+
+    def _push(self, role: str, content: str):
+        self._recent.append((ROLE_CODES.get(role, 0), content))
+        self._recent_bytes += len(content.encode("utf-8"))
+        evicted = []
+        # The newest message always stays, even if it alone exceeds max_bytes
+        while len(self._recent) > 1 and (
+            len(self._recent) > self.max_messages or self._recent_bytes > self.max_bytes
+        ):
+            message = self._recent.popleft()
+            self._recent_bytes -= len(message[1].encode("utf-8"))
+            evicted.append(message)
+        if evicted:
+            self._spill(evicted)
+
+    def extend(self, messages: List[Dict[str, str]]):
+        for message in messages:
+            self.append(message["role"], message["content"])
+
+    def _spill(self, messages: List[tuple]):
+        if self.store is not None:
+            self.offloaded += len(messages)
+            return
+        if self.spill_path is None:
+            self.dropped += len(messages)
+            return
+        lines = []
+        for code, content in messages:
+            line = (json.dumps([code, content], ensure_ascii=False) + "\n").encode("utf-8")
+            self._spill_offsets.append(self._spill_size)
+            self._spill_size += len(line)
+            lines.append(line)
+        with open(self.spill_path, "ab") as f:
+            f.write(b"".join(lines))
+
+    @staticmethod
+    def _as_dict(message: tuple) -> Dict[str, str]:
+        return {"role": ROLES[message[0]], "content": message[1]}
+
+    def _read_spilled(self, start: int, stop: int) -> List[Dict[str, str]]:
+        """Spilled messages [start, stop), reading one contiguous byte range"""
+        if start >= stop:
+            return []
+        begin = self._spill_offsets[start]
+        end = self._spill_offsets[stop] if stop < len(self._spill_offsets) else self._spill_size
+        with open(self.spill_path, "rb") as f:
+            f.seek(begin)
+            data = f.read(end - begin)
+        return [self._as_dict(json.loads(line)) for line in data.splitlines()]
+
+    def window(self, count: int) -> List[Dict[str, str]]:
+        """The latest ``count`` messages, oldest first, loading spilled ones on demand"""
+        messages = [self._as_dict(m) for m in list(self._recent)[-count:]] if count > 0 else []
+        missing = count - len(messages)
+        if missing > 0 and self.offloaded:
+            start = max(self.offloaded - missing, 0)
+            messages = self.store.page(self.session_id, start, self.offloaded - start) + messages
+        elif missing > 0 and self._spill_offsets:
+            spilled = len(self._spill_offsets)
+            messages = self._read_spilled(max(spilled - missing, 0), spilled) + messages
+        return messages
+
+    def available(self) -> int:
+        """Messages that can still be shown (not dropped)"""
+        return len(self) - self.dropped
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self.window(self.available()))
+
+    def clear(self):
+        self._recent.clear()
+        self._recent_bytes = 0
+        self._spill_offsets = array("q")
+        self._spill_size = 0
+        self.dropped = 0
+        self.offloaded = 0
+        if self.store is not None:
+            self.store.delete(self.session_id)
+        if self.spill_path is not None:
+            _remove_file(self.spill_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "messages": len(self),
+            "in_memory": len(self._recent),
+            "in_memory_bytes": self._recent_bytes,
+            "spilled": len(self._spill_offsets),
+            "offloaded": self.offloaded,
+            "dropped": self.dropped
+        }
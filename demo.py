@@ -2,15 +2,32 @@
 """
 Demo script for IndicSahayak AI Assistant
 Tests basic functionality and displays sample interactions
+
+Usage:
+    python demo.py                      Scripted demo
+    python demo.py interactive          Interactive chat loop
+    python demo.py batch IN.jsonl OUT.jsonl [--method fallback] [--workers 4]
 """
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from indic_sahayak import IndicSahayak
+from indic_sahayak import IndicSahayak, create_configured_assistant
+from config import Config
 from feedback_system import FeedbackCollector, FeedbackAnalyzer, create_sample_feedback
+import argparse
 import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+# Backends that spend their time waiting on the network; everything else is
+# rule/detection work that is CPU-bound and benefits from processes
+IO_BOUND_METHODS = {"huggingface", "local", "dify"}
+
+_batch_assistant: Optional[IndicSahayak] = None
 
 def run_demo():
     """Run a comprehensive demo of IndicSahayak"""
@@ -136,8 +153,203 @@ def interactive_demo():
         except Exception as e:
             print(f"❌ Error: {e}")
 
+def _get_batch_assistant() -> IndicSahayak:
+    """One assistant per worker thread pool or worker process, with the configured backends"""
+    global _batch_assistant
+    if _batch_assistant is None:
+        _batch_assistant = create_configured_assistant()
+    return _batch_assistant
+
+def _process_batch_item(item: Dict[str, Any], method: str) -> Dict[str, Any]:
+    """Answer a single batch query; runs inside a pool worker"""
+    if "error" in item:
+        return item
+    
+    assistant = _get_batch_assistant()
+    query = item["query"]
+    started = time.perf_counter()
+    try:
+        response = assistant.get_response(query, method=item.get("method", method))
+        result = {
+            "id": item["id"],
+            "query": query,
+            "language": assistant.detect_language(query),
+            "response": response
+        }
+    except Exception as e:
+        result = {"id": item["id"], "query": query, "error": str(e)}
+    result["latency"] = time.perf_counter() - started
+    return result
+
+def _process_batch_chunk(items, method: str):
+    """Answer a chunk of queries in one task to amortize process-pool overhead"""
+    return [_process_batch_item(item, method) for item in items]
+
+def _read_batch_queries(input_file: str) -> Iterator[Dict[str, Any]]:
+    """Stream queries from a JSONL file; each line needs a query, message or text field"""
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"id": line_number, "error": f"Invalid JSON: {e}"}
+                continue
+            if isinstance(record, str):
+                record = {"query": record}
+            elif not isinstance(record, dict):
+                yield {"id": line_number, "error": f"Expected a JSON object or string, got {type(record).__name__}"}
+                continue
+            query = record.get("query") or record.get("message") or record.get("text")
+            if not query:
+                yield {"id": record.get("id", line_number), "error": "Missing query"}
+                continue
+            item = {"id": record.get("id", line_number), "query": query}
+            if record.get("method"):
+                item["method"] = record["method"]
+            yield item
+
+def run_batch(
+    input_file: str,
+    output_file: str,
+    method: str = "fallback",
+    workers: int = 4,
+    executor: str = "auto",
+    max_in_flight: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Stream a JSONL file of queries through IndicSahayak.get_response.
+    
+    Results are written to output_file in input order. At most max_in_flight
+    queries (default 4x workers x chunk_size) are held in memory at once.
+    Queries for network-bound methods (their own "method" field, else method)
+    go to a thread pool, rule-based ones to a process pool with chunked tasks,
+    unless executor is set to "thread" or "process".
+    """
+    def kind_of(item: Dict[str, Any]) -> str:
+        if executor != "auto":
+            return executor
+        return "thread" if item.get("method", method) in IO_BOUND_METHODS else "process"
+    
+    chunk_sizes = {kind: chunk_size or (1 if kind == "thread" else 32) for kind in ("thread", "process")}
+    max_in_flight = max_in_flight or workers * 4 * max(chunk_sizes.values())
+    max_pending_chunks = max(1, max_in_flight // max(chunk_sizes.values()))
+    
+    latencies = []
+    processed = 0
+    errors = 0
+    started = time.perf_counter()
+    pools = {}
+    
+    def submit(kind: str, items):
+        if kind not in pools:
+            pool_class = ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+            pools[kind] = pool_class(max_workers=workers)
+        return pools[kind].submit(_process_batch_chunk, items, method)
+    
+    try:
+        with open(output_file, 'w', encoding='utf-8') as out:
+            pending = deque()
+            chunk = []
+            chunk_kind = None
+            
+            def drain_one():
+                nonlocal processed, errors
+                for result in pending.popleft().result():
+                    processed += 1
+                    if "error" in result:
+                        errors += 1
+                    if "latency" in result:
+                        latencies.append(result["latency"])
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            
+            def flush():
+                nonlocal chunk
+                if len(pending) >= max_pending_chunks:
+                    drain_one()
+                pending.append(submit(chunk_kind, chunk))
+                chunk = []
+            
+            for item in _read_batch_queries(input_file):
+                # Unreadable lines are passed through untouched, so they join whatever chunk is open
+                kind = chunk_kind if "error" in item and chunk_kind else kind_of(item)
+                if chunk and kind != chunk_kind:
+                    flush()
+                chunk.append(item)
+                chunk_kind = kind
+                if len(chunk) >= chunk_sizes[kind]:
+                    flush()
+            if chunk:
+                flush()
+            while pending:
+                drain_one()
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+    
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    
+    def percentile(p: float) -> float:
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+    
+    return {
+        "processed": processed,
+        "errors": errors,
+        "executor": "+".join(sorted(pools)) or executor,
+        "workers": workers,
+        "elapsed_seconds": elapsed,
+        "throughput_qps": processed / elapsed if elapsed > 0 else 0.0,
+        "latency_avg_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "latency_p50_ms": percentile(0.50) * 1000,
+        "latency_p95_ms": percentile(0.95) * 1000,
+        "latency_p99_ms": percentile(0.99) * 1000
+    }
+
+def batch_demo(argv):
+    """Parse batch-mode arguments, run the batch and print a summary"""
+    parser = argparse.ArgumentParser(prog="demo.py batch", description="Answer a JSONL file of queries")
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    parser.add_argument("--method", default="fallback", help="huggingface, local or fallback")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--executor", choices=["auto", "thread", "process"], default="auto")
+    parser.add_argument("--max-in-flight", type=int, help="Queries held in memory at once")
+    parser.add_argument("--chunk-size", type=int, help="Queries per pool task (default 1 for threads, 32 for processes)")
+    args = parser.parse_args(argv)
+    
+    if args.method in IO_BOUND_METHODS and args.method not in Config.configured_methods():
+        print(f"⚠️  '{args.method}' is not configured; those queries get rule-based replies")
+    
+    summary = run_batch(
+        args.input_file,
+        args.output_file,
+        method=args.method,
+        workers=args.workers,
+        executor=args.executor,
+        max_in_flight=args.max_in_flight,
+        chunk_size=args.chunk_size
+    )
+    
+    print("📦 Batch Summary:")
+    print(f"  Processed: {summary['processed']} ({summary['errors']} errors)")
+    print(f"  Executor: {summary['executor']} x {summary['workers']}")
+    print(f"  Elapsed: {summary['elapsed_seconds']:.2f}s")
+    print(f"  Throughput: {summary['throughput_qps']:.1f} queries/s")
+    print(f"  Latency: avg {summary['latency_avg_ms']:.3f} ms, "
+          f"p50 {summary['latency_p50_ms']:.3f} ms, "
+          f"p95 {summary['latency_p95_ms']:.3f} ms, "
+          f"p99 {summary['latency_p99_ms']:.3f} ms")
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "interactive":
         interactive_demo()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch_demo(sys.argv[2:])
     else:
         run_demo()
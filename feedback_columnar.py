@@ -0,0 +1,203 @@
+"""
+Columnar feedback storage for IndicSahayak
+Exports feedback to Parquet or Arrow IPC with typed, dictionary-encoded
+columns, and reads it back through memory maps straight into pyarrow
+tables, pandas DataFrames and FeedbackAnalyzer aggregates without building
+a Python object per record. Requires the optional pyarrow dependency.
+"""
+
+from dataclasses import fields
+from datetime import datetime
+from typing import Iterable, List, Optional
+from feedback_system import (
+    UserFeedback, FeedbackAggregate, FeedbackSketches, SCORE_FIELDS
+)
+from sketches import HyperLogLog
+from config import Config
+
+INT_FIELDS = ["rating"] + list(SCORE_FIELDS)
+CATEGORY_FIELDS = ["language_used", "interaction_type"]
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Columnar feedback storage requires pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _resolve_format(path: str, format: Optional[str]) -> str:
+    if format:
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format: {format}")
+        return format
+    for suffix, name in FORMATS.items():
+        if path.endswith(suffix):
+            return name
+    raise ValueError(f"Cannot infer columnar format from {path}; pass format='parquet' or 'arrow'")
+
+
+def feedback_schema():
+    """Arrow schema with one typed column per UserFeedback field"""
+    pa = _pyarrow()
+    columns = []
+    for field in fields(UserFeedback):
+        if field.name in INT_FIELDS:
+            type_ = pa.int8()
+        elif field.name in CATEGORY_FIELDS:
+            type_ = pa.dictionary(pa.int8(), pa.string())
+        elif field.name == "timestamp":
+            type_ = pa.timestamp("us")
+        elif field.name == "would_recommend":
+            type_ = pa.bool_()
+        else:
+            type_ = pa.string()
+        columns.append(pa.field(field.name, type_))
+    return pa.schema(columns)
+
+
+def feedback_to_table(feedback_data: Iterable[UserFeedback]):
+    """Build an Arrow table from feedback records, one column at a time"""
+    pa = _pyarrow()
+    records = list(feedback_data)
+    schema = feedback_schema()
+    arrays = []
+    for column in schema:
+        values = [getattr(f, column.name) for f in records]
+        if column.name == "timestamp":
+            arrays.append(pa.array([datetime.fromisoformat(v) for v in values], column.type))
+        elif column.name in CATEGORY_FIELDS:
+            arrays.append(pa.array(values, pa.string()).dictionary_encode().cast(column.type))
+        else:
+            arrays.append(pa.array(values, column.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def table_to_feedback(table) -> List[UserFeedback]:
+    """Materialize UserFeedback records; only needed when a FeedbackCollector must own them"""
+    records = []
+    for row in table.to_pylist():
+        row["timestamp"] = row["timestamp"].isoformat()
+        records.append(UserFeedback(**row))
+    return records
+
+
+def write_feedback_table(table, path: str, format: Optional[str] = None):
+    """Write a feedback table as Parquet (compressed) or Arrow IPC (mappable as-is)"""
+    pa = _pyarrow()
+    if _resolve_format(path, format) == "parquet":
+        pa.parquet.write_table(table, path, compression="zstd")
+    else:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def read_feedback_table(path: str, format: Optional[str] = None):
+    """
+    Read a feedback table through a memory map. Arrow IPC files are
+    zero-copy: column buffers point straight into the mapped file.
+    """
+    pa = _pyarrow()
+    if _resolve_format(path, format) == "parquet":
+        return pa.parquet.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def read_feedback_frame(path: str, format: Optional[str] = None):
+    """pandas DataFrame of a columnar export; language and type become categoricals"""
+    return read_feedback_table(path, format).to_pandas()
+
+
+def _decoded(table, names: List[str]):
+    # Group-by keys must be plain strings rather than dictionary arrays
+    pa = _pyarrow()
+    columns = {}
+    for name in names:
+        column = table[name]
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(pa.string())
+        elif pa.types.is_boolean(column.type) or pa.types.is_integer(column.type):
+            column = column.cast(pa.int64())
+        columns[name] = column
+    return pa.table(columns)
+
+
+def aggregate_from_table(table, track_users: bool = True) -> FeedbackAggregate:
+    """
+    FeedbackAggregate computed with Arrow kernels. Issue text is analyzed
+    once per distinct (language, text) pair and weighted by its count.
+    """
+    pa = _pyarrow()
+    pc = pa.compute
+    aggregate = FeedbackAggregate(track_users)
+    if not table.num_rows:
+        return aggregate
+
+    aggregate.count = table.num_rows
+    aggregate.rating_sum = pc.sum(table["rating"]).as_py()
+    for item in pc.value_counts(table["rating"]).to_pylist():
+        aggregate.rating_counts[item["values"]] = item["counts"]
+    aggregate.recommend_count = pc.sum(table["would_recommend"].cast(pa.int64())).as_py()
+    for field in SCORE_FIELDS:
+        aggregate.score_sums[field] = pc.sum(table[field]).as_py()
+
+    by_language = _decoded(table, [
+        "language_used", "rating", "language_accuracy", "cultural_sensitivity", "would_recommend"
+    ]).group_by("language_used").aggregate([
+        ("rating", "count"), ("rating", "sum"), ("language_accuracy", "sum"),
+        ("cultural_sensitivity", "sum"), ("would_recommend", "sum")
+    ])
+    for row in by_language.to_pylist():
+        aggregate.languages[row["language_used"]] = [
+            row["rating_count"], row["rating_sum"], row["language_accuracy_sum"],
+            row["cultural_sensitivity_sum"], row["would_recommend_sum"]
+        ]
+
+    by_type = _decoded(table, [
+        "interaction_type", "rating", "helpfulness", "user_satisfaction"
+    ]).group_by("interaction_type").aggregate([
+        ("rating", "count"), ("rating", "sum"), ("helpfulness", "sum"), ("user_satisfaction", "sum")
+    ])
+    for row in by_type.to_pylist():
+        aggregate.interaction_types[row["interaction_type"]] = [
+            row["rating_count"], row["rating_sum"], row["helpfulness_sum"], row["user_satisfaction_sum"]
+        ]
+
+    for text_field in ("technical_issues", "improvement_suggestions"):
+        texts = _decoded(table, ["language_used", text_field])
+        texts = texts.filter(pc.greater(pc.utf8_length(texts[text_field]), 0))
+        counts = texts.group_by(["language_used", text_field]).aggregate([(text_field, "count")])
+        for row in counts.to_pylist():
+            aggregate.issues.add_text(row["language_used"], row[text_field], row[f"{text_field}_count"])
+
+    if track_users:
+        aggregate.user_ids = set(pc.unique(table["user_id"]).to_pylist())
+    return aggregate
+
+
+def sketches_from_table(
+    table,
+    precision: int = Config.HLL_PRECISION,
+    relative_accuracy: float = Config.QUANTILE_RELATIVE_ACCURACY
+) -> FeedbackSketches:
+    """FeedbackSketches fed from distinct users and per-value score counts"""
+    pa = _pyarrow()
+    pc = pa.compute
+    sketches = FeedbackSketches(precision, relative_accuracy)
+    sketches.users.update(pc.unique(table["user_id"]).to_pylist())
+    pairs = _decoded(table, ["language_used", "user_id"]).group_by(["language_used", "user_id"]).aggregate([])
+    for row in pairs.to_pylist():
+        language_users = sketches.users_by_language.get(row["language_used"])
+        if language_users is None:
+            language_users = sketches.users_by_language[row["language_used"]] = HyperLogLog(precision)
+        language_users.add(row["user_id"])
+    for name, sketch in sketches.scores.items():
+        for entry in pc.value_counts(table[name]).to_pylist():
+            sketch.add(entry["values"], entry["counts"])
+    return sketches
@@ -0,0 +1,284 @@
+"""
+Sidecar offset index for IndicSahayak feedback files
+Maps feedback_id and timestamp to the byte range of each record in the
+JSON data file or the JSON-lines journal, so single lookups and time-window
+scans read only the records they need through a memory map
+"""
+
+import json
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from feedback_system import UserFeedback
+
+INDEX_VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+LINE_RECORD = re.compile(rb"[^\n]+")
+FEEDBACK_ID = re.compile(rb'"feedback_id"\s*:\s*"([^"]*)"')
+TIMESTAMP = re.compile(rb'"timestamp"\s*:\s*"([^"]*)"')
+
+
+def _to_micros(value) -> int:
+    """Naive-local microseconds since the epoch, the ordering key for timestamps"""
+    if isinstance(value, (bytes, str)):
+        value = datetime.fromisoformat(value.decode() if isinstance(value, bytes) else value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - EPOCH) // MICROSECOND
+
+
+class FeedbackIndex:
+    """
+    Offset index for one feedback file, stored next to it as ``<file>.idx``.
+    The index records the size and mtime of the file it describes and is
+    rebuilt when they no longer match; an appended journal is extended
+    in place by indexing only the new tail.
+    """
+
+    def __init__(self, data_file: str, index_file: Optional[str] = None):
+        self.data_file = data_file
+        self.index_file = index_file or data_file + ".idx"
+        self.source_size = -1
+        self.source_mtime_ns = -1
+        self.format = "lines"
+        self.offsets = array("q")
+        self.lengths = array("q")
+        self.times = array("q")
+        self.ids: List[str] = []
+        self._by_time = array("q")  # Record positions sorted by timestamp
+        self._sorted_times = array("q")
+        self._positions: Optional[Dict[str, int]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _source_stat(self):
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_size, stat.st_mtime_ns
+
+    def is_stale(self) -> bool:
+        return self._source_stat() != (self.source_size, self.source_mtime_ns)
+
+    def ensure(self) -> "FeedbackIndex":
+        """Load the sidecar if it matches the data file, otherwise (re)build it"""
+        if not self.is_stale():
+            return self
+        if self.source_size < 0 and os.path.exists(self.index_file):
+            self.load()
+            if not self.is_stale():
+                return self
+        size, _ = self._source_stat()
+        if self.format == "lines" and 0 < self.source_size < size and self._is_append():
+            self._index_range(self.source_size)
+        else:
+            self.build()
+        self.save()
+        return self
+
+    def _open(self) -> Optional[mmap.mmap]:
+        size, _ = self._source_stat()
+        if self._mmap is not None and len(self._mmap) == size:
+            return self._mmap
+        self.close()
+        if not size:
+            return None
+        self._file = open(self.data_file, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+        self._mmap = None
+        self._file = None
+
+    def _is_append(self) -> bool:
+        """Whether the file only grew since indexing: the old end and last record are unchanged"""
+        data = self._open()
+        if data is None or data[self.source_size - 1:self.source_size] != b"\n":
+            return False
+        if not self.offsets:
+            return True
+        offset, length = self.offsets[-1], self.lengths[-1]
+        last = FEEDBACK_ID.search(data[offset:offset + length])
+        return last is not None and last.group(1).decode() == self.ids[-1]
+
+    def build(self):
+        """Scan the whole data file and index every record"""
+        self.offsets, self.lengths, self.times, self.ids = array("q"), array("q"), array("q"), []
+        data = self._open()
+        head = data[:64].lstrip() if data is not None else b""
+        self.format = "array" if head.startswith(b"[") else "lines"
+        self._index_range(0)
+        self.rebuilds += 1
+
+    def _index_range(self, start: int):
+        """Index records from byte ``start`` to the end of the file"""
+        size, mtime_ns = self._source_stat()
+        data = self._open()
+        if data is not None:
+            records = self._array_records(data) if self.format == "array" else self._line_records(data, start)
+            for offset, length, feedback_id, timestamp in records:
+                self.offsets.append(offset)
+                self.lengths.append(length)
+                self.times.append(_to_micros(timestamp))
+                self.ids.append(feedback_id)
+        self.source_size, self.source_mtime_ns = size, mtime_ns
+        self._sort()
+
+    @staticmethod
+    def _line_records(data, start: int):
+        for match in LINE_RECORD.finditer(data, start):
+            record = match.group()
+            feedback_id = FEEDBACK_ID.search(record)
+            timestamp = TIMESTAMP.search(record)
+            if feedback_id is None or timestamp is None:
+                # A torn journal line; read_journal skips it too
+                continue
+            yield match.start(), len(record), feedback_id.group(1).decode(), timestamp.group(1)
+
+    @staticmethod
+    def _array_records(data):
+        # Decode each element of the top-level array in place (C speed), tracking
+        # the byte position alongside the character position for UTF-8 text
+        text = data[:].decode("utf-8")
+        decoder = json.JSONDecoder()
+        position = text.find("[") + 1
+        byte_position = len(text[:position].encode("utf-8"))
+        while position:
+            start = ARRAY_SEPARATOR.match(text, position).end()
+            if start >= len(text) or text[start] == "]":
+                return
+            record, end = decoder.raw_decode(text, start)
+            byte_start = byte_position + len(text[position:start].encode("utf-8"))
+            byte_position = byte_start + len(text[start:end].encode("utf-8"))
+            position = end
+            yield byte_start, byte_position - byte_start, record["feedback_id"], record["timestamp"]
+
+    def _sort(self):
+        self._by_time = array("q", sorted(range(len(self.times)), key=self.times.__getitem__))
+        self._sorted_times = array("q", (self.times[i] for i in self._by_time))
+        self._positions = None
+
+    def save(self):
+        """Write the sidecar atomically: JSON header line, then raw arrays and ids"""
+        if not os.path.exists(self.data_file):
+            return
+        header = {
+            "version": INDEX_VERSION,
+            "format": self.format,
+            "source_size": self.source_size,
+            "source_mtime_ns": self.source_mtime_ns,
+            "count": len(self.offsets)
+        }
+        tmp_file = self.index_file + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                for values in (self.offsets, self.lengths, self.times, self._by_time):
+                    f.write(values.tobytes())
+                f.write("\n".join(self.ids).encode())
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"Error saving feedback index: {e}")
+
+    def load(self):
+        """Read the sidecar; a corrupt or outdated one is treated as missing"""
+        try:
+            with open(self.index_file, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != INDEX_VERSION:
+                    return
+                count = header["count"]
+                arrays = []
+                for _ in range(4):
+                    values = array("q")
+                    values.frombytes(f.read(count * values.itemsize))
+                    arrays.append(values)
+                ids = f.read().decode().split("\n") if count else []
+        except Exception as e:
+            print(f"Error loading feedback index: {e}")
+            return
+        if len(ids) != count:
+            return
+        self.offsets, self.lengths, self.times, self._by_time = arrays
+        self._sorted_times = array("q", (self.times[i] for i in self._by_time))
+        self.ids = ids
+        self.format = header["format"]
+        self.source_size = header["source_size"]
+        self.source_mtime_ns = header["source_mtime_ns"]
+        self._positions = None
+
+    def _read(self, position: int) -> Optional[Dict[str, Any]]:
+        data = self._open()
+        offset = self.offsets[position]
+        try:
+            return json.loads(data[offset:offset + self.lengths[position]])
+        except json.JSONDecodeError:
+            # A torn journal line that still carries its id and timestamp
+            print(f"Skipping corrupt feedback line in {self.data_file}")
+            return None
+
+    def get(self, feedback_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one record by id, reading only its bytes"""
+        self.ensure()
+        if self._positions is None:
+            self._positions = {feedback_id: i for i, feedback_id in enumerate(self.ids)}
+        position = self._positions.get(feedback_id)
+        return self._read(position) if position is not None else None
+
+    def scan(self, start, end) -> Iterator[Dict[str, Any]]:
+        """Records with start <= timestamp < end, oldest first"""
+        self.ensure()
+        low = bisect_left(self._sorted_times, _to_micros(start))
+        high = bisect_left(self._sorted_times, _to_micros(end))
+        for i in range(low, high):
+            record = self._read(self._by_time[i])
+            if record is not None:
+                yield record
+
+
+class IndexedFeedbackReader:
+    """
+    Random access to a FeedbackCollector's storage without loading it:
+    the main data file and its journal each get an offset index, and
+    journal records take precedence as the newer copy.
+    """
+
+    def __init__(self, storage_file: str):
+        self.storage_file = storage_file
+        self.indexes = [FeedbackIndex(storage_file + ".journal"), FeedbackIndex(storage_file)]
+
+    def get(self, feedback_id: str) -> Optional[UserFeedback]:
+        for index in self.indexes:
+            record = index.get(feedback_id)
+            if record is not None:
+                return UserFeedback(**record)
+        return None
+
+    def scan(self, start, end) -> Iterator[UserFeedback]:
+        """Feedback in [start, end) from both files, each id once; oldest first within each file"""
+        seen = set()
+        for index in self.indexes:
+            for record in index.scan(start, end):
+                if record["feedback_id"] not in seen:
+                    seen.add(record["feedback_id"])
+                    yield UserFeedback(**record)
+
+    def close(self):
+        for index in self.indexes:
+            index.close()
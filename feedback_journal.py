@@ -0,0 +1,178 @@
+"""
+Append-only feedback journal with a background group-commit writer
+Feedback submissions become a queue put; a writer thread appends batched
+records as JSON lines and fsyncs once per batch
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_STOP = object()
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Exclusive lock on ``path + ".lock"``, held across processes (API workers
+    sharing one feedback file) as well as threads
+    """
+    with open(path + ".lock", 'a+') as f:
+        f.seek(0)
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield records from a journal file, skipping a torn final line"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last line can be partial (crash mid-write); nothing after it is trusted
+                print(f"Skipping corrupt journal line in {path}")
+                return
+
+
+def append_records(path: str, records: List[Dict[str, Any]], fsync: bool = True):
+    """Append records as JSON lines with a single write (and fsync)"""
+    data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(data)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+
+
+class GroupCommitWriter:
+    """
+    Background writer that appends records to a JSON-lines journal.
+
+    Records are written in batches when ``batch_size`` records are waiting
+    or ``max_delay`` seconds have passed since the first one, with a single
+    write and fsync per batch. The queue is bounded: when it is full,
+    ``submit`` blocks, pushing back on producers instead of growing memory.
+    A ``sink`` callable, when given, receives each batch instead of the file.
+    With ``locked``, each append holds the journal's file_lock so another
+    process can fold and remove the journal without losing a batch.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        batch_size: int = Config.FEEDBACK_BATCH_SIZE,
+        max_delay: float = Config.FEEDBACK_BATCH_DELAY,
+        max_queue: int = Config.FEEDBACK_QUEUE_SIZE,
+        fsync: bool = True,
+        sink: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        locked: bool = False
+    ):
+        self.path = path
+        self.sink = sink
+        self.locked = locked
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self.batches_written = 0
+        self.records_written = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, Any], timeout: Optional[float] = None):
+        """Queue a record for writing; blocks while the queue is full"""
+        if self._closed:
+            raise RuntimeError("Feedback writer is closed")
+        self._queue.put(record, timeout=timeout)
+
+    def flush(self):
+        """Block until every submitted record is durably written"""
+        self._queue.join()
+
+    def close(self):
+        """Drain the queue, write the final batch and stop the writer thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            batch: List[Dict[str, Any]] = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        try:
+            if self.sink is not None:
+                self.sink(batch)
+            else:
+                with file_lock(self.path) if self.locked else nullcontext():
+                    append_records(self.path, batch, self.fsync)
+            self.batches_written += 1
+            self.records_written += len(batch)
+        except Exception as e:
+            self.errors += 1
+            print(f"Error writing feedback batch: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches_written": self.batches_written,
+            "records_written": self.records_written,
+            "average_batch_size": self.records_written / self.batches_written if self.batches_written else 0,
+            "errors": self.errors
+        }
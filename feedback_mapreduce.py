@@ -0,0 +1,177 @@
+"""
+Parallel feedback analytics for IndicSahayak
+Builds the FeedbackAnalyzer report over many feedback files (replica stores,
+journals, segment directories, columnar exports) by mapping each shard to a
+partial FeedbackAggregate on a process pool and merging the partials.
+Large JSON-lines files are split into byte ranges so a few big shards still
+spread across every core.
+
+Usage:
+    python feedback_mapreduce.py PATH [PATH ...] [--workers 8] [--sketches] [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+from config import Config
+from feedback_system import FeedbackAggregate, FeedbackAnalyzer, FeedbackSketches, UserFeedback
+
+# (path, start byte, end byte); a range of (0, -1) means the whole file
+Task = Tuple[str, int, int]
+
+JSON_LINES_SUFFIXES = (".jsonl", ".journal")
+COLUMNAR_SUFFIXES = (".parquet", ".arrow", ".feather", ".ipc")
+SHARD_SUFFIXES = (".json",) + JSON_LINES_SUFFIXES + COLUMNAR_SUFFIXES
+
+
+def discover_shards(paths: Iterable[str]) -> List[str]:
+    """
+    Expand directories (e.g. a segment directory) into their feedback files.
+    Journals are only picked up when named explicitly: a store's journal can
+    repeat records already compacted into its main file.
+    """
+    shards = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(SHARD_SUFFIXES) and not name.endswith(".journal") and name != "manifest.json":
+                    shards.append(os.path.join(path, name))
+        else:
+            shards.append(path)
+    return shards
+
+
+def plan_tasks(paths: Iterable[str], split_bytes: int = Config.ANALYTICS_SPLIT_BYTES) -> List[Task]:
+    """One map task per shard, or per split_bytes range of a JSON-lines shard"""
+    tasks = []
+    for path in discover_shards(paths):
+        size = os.path.getsize(path)
+        if path.endswith(JSON_LINES_SUFFIXES) and size > split_bytes:
+            tasks.extend((path, start, min(start + split_bytes, size)) for start in range(0, size, split_bytes))
+        else:
+            tasks.append((path, 0, -1))
+    # Biggest tasks first so a large one does not start last and hold up the reduce
+    tasks.sort(key=lambda task: -(task[2] - task[1] if task[2] >= 0 else os.path.getsize(task[0])))
+    return tasks
+
+
+def _json_lines(path: str, start: int, end: int) -> Iterable[dict]:
+    """Records whose line starts in [start, end); the previous range owns a straddling line"""
+    with open(path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while end < 0 or position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping corrupt feedback line in {path}")
+
+
+def map_task(task: Task, use_sketches: bool = False) -> Tuple[FeedbackAggregate, Optional[FeedbackSketches]]:
+    """Partial aggregate (and sketches) of one task; runs inside a pool worker"""
+    path, start, end = task
+    if path.endswith(COLUMNAR_SUFFIXES):
+        from feedback_columnar import aggregate_from_table, read_feedback_table, sketches_from_table
+        table = read_feedback_table(path)
+        sketches = sketches_from_table(table) if use_sketches else None
+        return aggregate_from_table(table, track_users=not use_sketches), sketches
+
+    aggregate = FeedbackAggregate(track_users=not use_sketches)
+    sketches = FeedbackSketches(Config.HLL_PRECISION, Config.QUANTILE_RELATIVE_ACCURACY) if use_sketches else None
+    if path.endswith(JSON_LINES_SUFFIXES):
+        records = _json_lines(path, start, end)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+    for item in records:
+        feedback = UserFeedback(**item)
+        aggregate.add(feedback)
+        if sketches is not None:
+            sketches.add(feedback)
+    return aggregate, sketches
+
+
+def _map_task_chunk(tasks: List[Task], use_sketches: bool):
+    """Map several small tasks in one worker call and pre-merge them"""
+    aggregate, sketches = map_task(tasks[0], use_sketches)
+    for task in tasks[1:]:
+        other, other_sketches = map_task(task, use_sketches)
+        aggregate.merge(other)
+        if sketches is not None:
+            sketches.merge(other_sketches)
+    return aggregate, sketches
+
+
+def analyze_shards(
+    paths: Iterable[str],
+    workers: int = Config.ANALYTICS_WORKERS,
+    use_sketches: bool = False,
+    split_bytes: int = Config.ANALYTICS_SPLIT_BYTES
+) -> FeedbackAnalyzer:
+    """
+    Map every shard to a partial aggregate in parallel and merge the partials.
+    The returned analyzer's generate_report() has the same structure as one
+    built over all the records in a single collector. Use sketches for very
+    large inputs: exact distinct users otherwise ship every user id through
+    the reduce.
+    """
+    tasks = plan_tasks(paths, split_bytes)
+    workers = workers or os.cpu_count() or 1
+    aggregate = FeedbackAggregate(track_users=not use_sketches)
+    sketches = FeedbackSketches(Config.HLL_PRECISION, Config.QUANTILE_RELATIVE_ACCURACY) if use_sketches else None
+    if not tasks:
+        return FeedbackAnalyzer.from_aggregate(aggregate, sketches)
+
+    # Deal tasks round-robin (biggest first) into about four chunks per worker,
+    # so many small shards cost one process round trip per chunk, not per file
+    chunk_count = min(len(tasks), workers * 4)
+    chunks = [tasks[i::chunk_count] for i in range(chunk_count)]
+    if workers == 1:
+        results = (_map_task_chunk(chunk, use_sketches) for chunk in chunks)
+        for partial, partial_sketches in results:
+            aggregate.merge(partial)
+            if sketches is not None:
+                sketches.merge(partial_sketches)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial, partial_sketches in pool.map(_map_task_chunk, chunks, [use_sketches] * len(chunks)):
+                aggregate.merge(partial)
+                if sketches is not None:
+                    sketches.merge(partial_sketches)
+    return FeedbackAnalyzer.from_aggregate(aggregate, sketches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Feedback report over sharded feedback files")
+    parser.add_argument("paths", nargs="+", help="Feedback files or directories of them")
+    parser.add_argument("--workers", type=int, default=Config.ANALYTICS_WORKERS, help="Processes (0 = every core)")
+    parser.add_argument("--sketches", action="store_true", help="Approximate distinct users and quantiles")
+    parser.add_argument("--output", help="Write the report JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = analyze_shards(args.paths, args.workers, args.sketches).generate_report()
+    elapsed = time.perf_counter() - started
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Analyzed {report['overall_metrics']['total_feedback']} records in {elapsed:.2f}s")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
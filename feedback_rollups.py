@@ -0,0 +1,192 @@
+"""
+Time-bucket rollups for IndicSahayak feedback
+Keeps hourly and daily aggregates up to date as feedback arrives, so trend
+and window queries read buckets instead of rescanning every record
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Per-cell counters, in order
+CELL_FIELDS = [
+    "count", "rating", "response_quality", "cultural_sensitivity", "language_accuracy",
+    "helpfulness", "response_speed", "user_satisfaction", "recommended"
+]
+SCORE_FIELDS = CELL_FIELDS[1:-1]
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# (language, interaction_type) -> counters
+Bucket = Dict[Tuple[str, str], List[int]]
+
+
+def _parse_time(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        # Stored timestamps are naive local time
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _floor_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil(moment: datetime, floor, step: timedelta) -> datetime:
+    floored = floor(moment)
+    return floored if floored == moment else floored + step
+
+
+class TimeBucketRollups:
+    """
+    Hourly and daily rollups of feedback counters per language and
+    interaction type. Window boundaries are aligned to whole hours.
+    """
+
+    def __init__(self):
+        self.hourly: Dict[datetime, Bucket] = {}
+        self.daily: Dict[datetime, Bucket] = {}
+
+    def add(self, feedback):
+        """Fold one feedback record into its hour and day buckets"""
+        moment = _parse_time(feedback.timestamp)
+        key = (feedback.language_used, feedback.interaction_type)
+        values = (
+            1, feedback.rating, feedback.response_quality, feedback.cultural_sensitivity,
+            feedback.language_accuracy, feedback.helpfulness, feedback.response_speed,
+            feedback.user_satisfaction, int(bool(feedback.would_recommend))
+        )
+        for buckets, start in ((self.hourly, _floor_hour(moment)), (self.daily, _floor_day(moment))):
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = {}
+            cell = bucket.get(key)
+            if cell is None:
+                bucket[key] = list(values)
+            else:
+                for i, value in enumerate(values):
+                    cell[i] += value
+
+    def rebuild(self, feedback_data: Iterable):
+        self.hourly = {}
+        self.daily = {}
+        for feedback in feedback_data:
+            self.add(feedback)
+
+    def merge(self, other: "TimeBucketRollups") -> "TimeBucketRollups":
+        """Combine rollups built over disjoint feedback and return self"""
+        for buckets, other_buckets in ((self.hourly, other.hourly), (self.daily, other.daily)):
+            for start, other_bucket in other_buckets.items():
+                bucket = buckets.setdefault(start, {})
+                for key, values in other_bucket.items():
+                    cell = bucket.get(key)
+                    bucket[key] = list(values) if cell is None else [a + b for a, b in zip(cell, values)]
+        return self
+
+    def _window_buckets(self, start: datetime, end: datetime) -> List[Bucket]:
+        """
+        Buckets covering [start, end): whole days from the daily rollup and
+        the ragged edges from the hourly rollup
+        """
+        start = _floor_hour(start)
+        end = _ceil(end, _floor_hour, HOUR)
+        if start >= end:
+            return []
+
+        first_day = _ceil(start, _floor_day, DAY)
+        last_day = _floor_day(end)
+        selected: List[Bucket] = []
+        if first_day >= last_day:
+            hour_ranges = [(start, end)]
+        else:
+            hour_ranges = [(start, first_day), (last_day, end)]
+            # Few buckets exist relative to the days in a long range, so scan whichever is smaller
+            if len(self.daily) < (last_day - first_day).days:
+                selected.extend(b for day, b in self.daily.items() if first_day <= day < last_day)
+            else:
+                day = first_day
+                while day < last_day:
+                    bucket = self.daily.get(day)
+                    if bucket:
+                        selected.append(bucket)
+                    day += DAY
+        for range_start, range_end in hour_ranges:
+            hour = range_start
+            while hour < range_end:
+                bucket = self.hourly.get(hour)
+                if bucket:
+                    selected.append(bucket)
+                hour += HOUR
+        return selected
+
+    @staticmethod
+    def _summarize(
+        buckets: Iterable[Bucket],
+        language: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        totals = [0] * len(CELL_FIELDS)
+        language_counts: Dict[str, int] = {}
+        type_counts: Dict[str, int] = {}
+        for bucket in buckets:
+            for (lang, itype), cell in bucket.items():
+                if (language and lang != language) or (interaction_type and itype != interaction_type):
+                    continue
+                for i, value in enumerate(cell):
+                    totals[i] += value
+                language_counts[lang] = language_counts.get(lang, 0) + cell[0]
+                type_counts[itype] = type_counts.get(itype, 0) + cell[0]
+
+        count = totals[0]
+        metrics: Dict[str, Any] = {"total_feedback": count}
+        for i, name in enumerate(SCORE_FIELDS, 1):
+            metrics[f"average_{name}"] = totals[i] / count if count else 0
+        metrics["recommendation_rate"] = totals[-1] / count * 100 if count else 0
+        metrics["language_counts"] = language_counts
+        metrics["interaction_type_counts"] = type_counts
+        return metrics
+
+    def window_metrics(
+        self,
+        start,
+        end,
+        language: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Aggregate metrics for feedback in [start, end), optionally filtered"""
+        buckets = self._window_buckets(_parse_time(start), _parse_time(end))
+        metrics = self._summarize(buckets, language, interaction_type)
+        metrics["buckets_read"] = len(buckets)
+        return metrics
+
+    def time_series(
+        self,
+        start,
+        end,
+        granularity: str = "day",
+        language: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """One metrics point per hour or day bucket in [start, end); empty buckets are skipped"""
+        if granularity == "hour":
+            buckets, floor = self.hourly, _floor_hour
+        elif granularity == "day":
+            buckets, floor = self.daily, _floor_day
+        else:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+
+        start = floor(_parse_time(start))
+        end = _parse_time(end)
+        series = []
+        for bucket_start in sorted(b for b in buckets if start <= b < end):
+            point = self._summarize([buckets[bucket_start]], language, interaction_type)
+            if point["total_feedback"]:
+                point["bucket"] = bucket_start.isoformat()
+                series.append(point)
+        return series
@@ -0,0 +1,403 @@
+"""
+Segmented feedback storage for IndicSahayak
+Feedback is appended to an active JSON-lines segment that is sealed by size
+or age. Sealed segments are immutable and carry summary stats in a manifest,
+so range queries skip segments outside the window and answer fully covered
+ones from their stats. Compaction merges small segments and enforces the
+retention window.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import Config
+from feedback_journal import append_records, read_journal
+from feedback_system import UserFeedback, SCORE_FIELDS
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _parse_time(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def new_stats() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "min_time": None,
+        "max_time": None,
+        "rating_sum": 0,
+        "score_sums": {field: 0 for field in SCORE_FIELDS},
+        "recommend_count": 0,
+        "language_counts": {},
+        "interaction_type_counts": {}
+    }
+
+
+def add_to_stats(stats: Dict[str, Any], record: Dict[str, Any]):
+    """Fold one feedback record (as a dict) into segment stats"""
+    stats["count"] += 1
+    timestamp = record["timestamp"]
+    if stats["min_time"] is None or _parse_time(timestamp) < _parse_time(stats["min_time"]):
+        stats["min_time"] = timestamp
+    if stats["max_time"] is None or _parse_time(timestamp) > _parse_time(stats["max_time"]):
+        stats["max_time"] = timestamp
+    stats["rating_sum"] += record["rating"]
+    for field in SCORE_FIELDS:
+        stats["score_sums"][field] += record[field]
+    stats["recommend_count"] += int(bool(record["would_recommend"]))
+    for key, counts in (("language_used", stats["language_counts"]),
+                        ("interaction_type", stats["interaction_type_counts"])):
+        counts[record[key]] = counts.get(record[key], 0) + 1
+
+
+def merge_stats(stats: Dict[str, Any], other: Dict[str, Any]):
+    if not other["count"]:
+        return
+    stats["count"] += other["count"]
+    for key, pick in (("min_time", min), ("max_time", max)):
+        if stats[key] is None:
+            stats[key] = other[key]
+        else:
+            stats[key] = pick(stats[key], other[key], key=_parse_time)
+    stats["rating_sum"] += other["rating_sum"]
+    for field, total in other["score_sums"].items():
+        stats["score_sums"][field] += total
+    stats["recommend_count"] += other["recommend_count"]
+    for key in ("language_counts", "interaction_type_counts"):
+        for name, count in other[key].items():
+            stats[key][name] = stats[key].get(name, 0) + count
+
+
+class SegmentedFeedbackStore:
+    """
+    Directory of feedback segments plus a manifest. Appends only touch the
+    active segment; sealed segments are read-only files, so compaction can
+    rewrite them in the background and swap the manifest atomically.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_records: int = Config.FEEDBACK_SEGMENT_MAX_RECORDS,
+        max_segment_age: float = Config.FEEDBACK_SEGMENT_MAX_AGE,
+        retention_days: int = Config.FEEDBACK_RETENTION_DAYS
+    ):
+        self.directory = directory
+        self.max_segment_records = max_segment_records
+        self.max_segment_age = max_segment_age
+        self.retention_days = retention_days
+        # Called with the retention cutoff after compaction drops records, so an
+        # in-memory view (the collector's) can drop them too
+        self.on_expire: Optional[Callable[[datetime], None]] = None
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self._load_manifest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _new_segment(self, sealed: bool = False) -> Dict[str, Any]:
+        name = f"segment-{self.next_id:06d}.jsonl"
+        self.next_id += 1
+        return {"name": name, "sealed": sealed, "created": time.time(), "stats": new_stats()}
+
+    def _load_manifest(self):
+        manifest = None
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                print(f"Error loading segment manifest: {e}")
+        if manifest is None:
+            self.next_id = 1
+            self.segments: List[Dict[str, Any]] = []
+            self.active = self._new_segment()
+            self._save_manifest()
+            return
+        self.next_id = manifest["next_id"]
+        self.segments = manifest["segments"]
+        self.active = manifest["active"]
+        # Active stats are only persisted on rotation; recompute them from the file
+        self.active["stats"] = new_stats()
+        for record in read_journal(self._path(self.active["name"])):
+            add_to_stats(self.active["stats"], record)
+
+    def _save_manifest(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "next_id": self.next_id,
+            "segments": self.segments,
+            "active": self.active
+        }
+        tmp_file = self.manifest_path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.manifest_path)
+
+    def append(self, feedback: UserFeedback):
+        self.append_records([asdict(feedback)])
+
+    def append_records(self, records: List[Dict[str, Any]]):
+        """Append a batch of feedback dicts to the active segment, rotating when full"""
+        if not records:
+            return
+        with self._lock:
+            append_records(self._path(self.active["name"]), records)
+            for record in records:
+                add_to_stats(self.active["stats"], record)
+            if self._should_rotate():
+                self.rotate()
+
+    def _should_rotate(self) -> bool:
+        count = self.active["stats"]["count"]
+        if count >= self.max_segment_records:
+            return True
+        return count > 0 and time.time() - self.active["created"] >= self.max_segment_age
+
+    def rotate(self):
+        """Seal the active segment and start a new one"""
+        with self._lock:
+            if not self.active["stats"]["count"]:
+                return
+            sealed = dict(self.active, sealed=True, sealed_at=time.time())
+            self._seal_file(sealed["name"])
+            self.segments.append(sealed)
+            self.active = self._new_segment()
+            self._save_manifest()
+
+    def _seal_file(self, name: str):
+        path = self._path(name)
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.chmod(path, 0o444)
+
+    def _all_segments(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.segments + [self.active]
+
+    @staticmethod
+    def _overlaps(segment: Dict[str, Any], start: Optional[datetime], end: Optional[datetime]) -> bool:
+        stats = segment["stats"]
+        if not stats["count"]:
+            return False
+        if start is not None and _parse_time(stats["max_time"]) < start:
+            return False
+        if end is not None and _parse_time(stats["min_time"]) >= end:
+            return False
+        return True
+
+    def _segment_records(self, segment: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        return read_journal(self._path(segment["name"]))
+
+    def read(self, start=None, end=None) -> Iterator[UserFeedback]:
+        """Feedback with start <= timestamp < end, reading only overlapping segments"""
+        start = _parse_time(start) if start is not None else None
+        end = _parse_time(end) if end is not None else None
+        for segment in self._all_segments():
+            if not self._overlaps(segment, start, end):
+                continue
+            stats = segment["stats"]
+            inside = ((start is None or _parse_time(stats["min_time"]) >= start) and
+                      (end is None or _parse_time(stats["max_time"]) < end))
+            for record in self._segment_records(segment):
+                if inside or ((start is None or _parse_time(record["timestamp"]) >= start) and
+                              (end is None or _parse_time(record["timestamp"]) < end)):
+                    yield UserFeedback(**record)
+
+    def summary(self, start=None, end=None) -> Dict[str, Any]:
+        """
+        Aggregate stats for [start, end). Segments entirely inside the window
+        are answered from their stats; only boundary segments are read.
+        """
+        start = _parse_time(start) if start is not None else None
+        end = _parse_time(end) if end is not None else None
+        total = new_stats()
+        segments_read = segments_skipped = 0
+        for segment in self._all_segments():
+            if not self._overlaps(segment, start, end):
+                segments_skipped += 1
+                continue
+            stats = segment["stats"]
+            if ((start is None or _parse_time(stats["min_time"]) >= start) and
+                    (end is None or _parse_time(stats["max_time"]) < end)):
+                merge_stats(total, stats)
+                continue
+            segments_read += 1
+            for record in self._segment_records(segment):
+                moment = _parse_time(record["timestamp"])
+                if (start is None or moment >= start) and (end is None or moment < end):
+                    add_to_stats(total, record)
+
+        count = total["count"]
+        metrics: Dict[str, Any] = {"total_feedback": count}
+        metrics["average_rating"] = total["rating_sum"] / count if count else 0
+        for field, value in total["score_sums"].items():
+            metrics[f"average_{field}"] = value / count if count else 0
+        metrics["recommendation_rate"] = total["recommend_count"] / count * 100 if count else 0
+        metrics["language_counts"] = total["language_counts"]
+        metrics["interaction_type_counts"] = total["interaction_type_counts"]
+        metrics["segments_read"] = segments_read
+        metrics["segments_skipped"] = segments_skipped
+        return metrics
+
+    def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Drop records past the retention window and merge runs of small sealed
+        segments. New segments are written beside the old ones and swapped in
+        through the manifest, so readers and appends are never blocked on I/O.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self.active["stats"]["count"] and time.time() - self.active["created"] >= self.max_segment_age:
+                    self.rotate()
+                sealed = list(self.segments)
+
+            cutoff = None
+            if self.retention_days:
+                cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
+
+            kept: List[Dict[str, Any]] = []
+            removed: List[str] = []
+            dropped_records = 0
+            # Retention: whole segments past the cutoff go, boundary segments are filtered
+            for segment in sealed:
+                stats = segment["stats"]
+                if cutoff is not None and _parse_time(stats["max_time"]) < cutoff:
+                    removed.append(segment["name"])
+                    dropped_records += stats["count"]
+                elif cutoff is not None and _parse_time(stats["min_time"]) < cutoff:
+                    records = [r for r in self._segment_records(segment) if _parse_time(r["timestamp"]) >= cutoff]
+                    dropped_records += stats["count"] - len(records)
+                    kept.append({"records": records, "source": [segment]})
+                    removed.append(segment["name"])
+                else:
+                    kept.append({"records": None, "source": [segment]})
+
+            # Merge adjacent small segments up to the full segment size
+            small = self.max_segment_records // 4
+            merged: List[Dict[str, Any]] = []
+            for item in kept:
+                count = self._item_count(item)
+                previous = merged[-1] if merged else None
+                mergeable = previous is not None and (len(previous["source"]) > 1 or self._item_count(previous) < small)
+                if (mergeable and count < small
+                        and self._item_count(previous) + count <= self.max_segment_records):
+                    previous["records"] = self._item_records(previous) + self._item_records(item)
+                    previous["source"] += item["source"]
+                    continue
+                merged.append(item)
+
+            new_segments: List[Dict[str, Any]] = []
+            segments_merged = 0
+            for item in merged:
+                if item["records"] is None:
+                    new_segments.append(item["source"][0])
+                    continue
+                if len(item["source"]) > 1:
+                    segments_merged += len(item["source"])
+                removed.extend(s["name"] for s in item["source"] if s["name"] not in removed)
+                if item["records"]:
+                    new_segments.append(self._write_sealed(item["records"]))
+
+            with self._lock:
+                # Segments sealed while we worked are kept after the compacted ones
+                sealed_names = {s["name"] for s in sealed}
+                self.segments = new_segments + [s for s in self.segments if s["name"] not in sealed_names]
+                self._save_manifest()
+            for name in removed:
+                self._remove(name)
+            self._remove_orphans()
+            if dropped_records and self.on_expire is not None:
+                self.on_expire(cutoff)
+            return {
+                "segments": len(self.segments) + 1,
+                "segments_merged": segments_merged,
+                "segments_removed": len(removed),
+                "records_dropped": dropped_records
+            }
+
+    @staticmethod
+    def _item_count(item: Dict[str, Any]) -> int:
+        if item["records"] is not None:
+            return len(item["records"])
+        return item["source"][0]["stats"]["count"]
+
+    def _item_records(self, item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if item["records"] is None:
+            return list(self._segment_records(item["source"][0]))
+        return item["records"]
+
+    def _write_sealed(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            segment = self._new_segment(sealed=True)
+        segment["sealed_at"] = time.time()
+        records.sort(key=lambda r: _parse_time(r["timestamp"]))
+        for record in records:
+            add_to_stats(segment["stats"], record)
+        append_records(self._path(segment["name"]), records)
+        os.chmod(self._path(segment["name"]), 0o444)
+        return segment
+
+    def _remove(self, name: str):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def _remove_orphans(self):
+        """Delete segment files left behind by an interrupted compaction"""
+        with self._lock:
+            known = {s["name"] for s in self._all_segments()}
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(".jsonl") and name not in known:
+                self._remove(name)
+
+    def start_compactor(self, interval: float = Config.FEEDBACK_COMPACTION_INTERVAL):
+        """Run compact() every ``interval`` seconds on a daemon thread"""
+        if self._compactor is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"Error compacting feedback segments: {e}")
+
+        self._compactor = threading.Thread(target=run, name="feedback-compactor", daemon=True)
+        self._compactor.start()
+
+    def close(self):
+        """Stop the compactor and persist the manifest"""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        with self._lock:
+            self._save_manifest()
+
+    def get_stats(self) -> Dict[str, Any]:
+        segments = self._all_segments()
+        return {
+            "segments": len(segments),
+            "sealed_segments": len(segments) - 1,
+            "records": sum(s["stats"]["count"] for s in segments),
+            "active_records": self.active["stats"]["count"]
+        }
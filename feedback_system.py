@@ -4,12 +4,19 @@ Handles collection, storage, and analysis of user feedback
 """
 
 import json
-import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import os
 from dataclasses import dataclass, asdict
 import uuid
+from config import Config
+from feedback_rollups import TimeBucketRollups
+from sketches import HyperLogLog, QuantileSketch, SpaceSaving
+from text_analysis import extract_terms
+from feedback_journal import GroupCommitWriter, file_lock, read_journal
+import atexit
+import threading
+import weakref
 
 @dataclass
 class UserFeedback:
@@ -34,35 +41,209 @@ class UserFeedback:
 class FeedbackCollector:
     """Collects and manages user feedback"""
     
-    def __init__(self, storage_file: str = "feedback_data.json"):
+    def __init__(
+        self,
+        storage_file: str = "feedback_data.json",
+        async_writes: bool = False,
+        segment_dir: Optional[str] = None
+    ):
         self.storage_file = storage_file
+        self.journal_file = storage_file + ".journal"
         self.feedback_data: List[UserFeedback] = []
+        self.version = 0  # Bumped on every change so analyzers can cache derived results
+        self.rollups = TimeBucketRollups()
+        # Running totals behind get_summary, so sidebar metrics never scan records
+        self._rating_sum = 0
+        self._language_counts: Dict[str, int] = {}
+        self._summary_cache = None
+        # Response latencies reported with feedback; records do not carry them
+        self.latency_ms = QuantileSketch(Config.QUANTILE_RELATIVE_ACCURACY)
+        self._listeners = []
+        self._lock = threading.RLock()
+        # Segmented mode stores feedback in rotated segments instead of one JSON file
+        self.segments = None
+        if segment_dir:
+            from feedback_segments import SegmentedFeedbackStore
+            self.segments = SegmentedFeedbackStore(segment_dir)
+            self.segments.on_expire = self.drop_before
         self.load_feedback_data()
+        # In async mode add_feedback only enqueues; a background thread group-commits to the journal
+        self.writer: Optional[GroupCommitWriter] = None
+        if async_writes:
+            sink = self.segments.append_records if self.segments is not None else None
+            # Appends take the journal lock: other processes may compact the same file
+            self.writer = GroupCommitWriter(self.journal_file, sink=sink, locked=sink is None)
+        if async_writes or self.segments is not None:
+            atexit.register(self.close)
     
     def load_feedback_data(self):
-        """Load existing feedback data from file"""
-        if os.path.exists(self.storage_file):
-            try:
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.feedback_data = [UserFeedback(**item) for item in data]
-            except Exception as e:
-                print(f"Error loading feedback data: {e}")
-                self.feedback_data = []
+        """Load existing feedback data from file, then replay the journal"""
+        with self._lock:
+            if self.segments is not None:
+                self.feedback_data = list(self.segments.read())
+            elif os.path.exists(self.journal_file):
+                # Locked so another process cannot fold the journal between the two reads
+                with file_lock(self.journal_file):
+                    self.feedback_data = [UserFeedback(**item) for item in self._read_stored_records()]
+            else:
+                self.feedback_data = [UserFeedback(**item) for item in self._read_main_file()]
+            self.rollups.rebuild(self.feedback_data)
+            self._rebuild_totals()
+            self.version += 1
     
-    def save_feedback_data(self):
-        """Save feedback data to file"""
+    def _read_main_file(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.storage_file):
+            return []
         try:
-            data = [asdict(feedback) for feedback in self.feedback_data]
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
         except Exception as e:
-            print(f"Error saving feedback data: {e}")
+            print(f"Error loading feedback data: {e}")
+            return []
+    
+    def _read_stored_records(self) -> List[Dict[str, Any]]:
+        """Main file plus journal as on disk, each id once; call with the journal lock held"""
+        records = self._read_main_file()
+        # Records journaled before the last compaction may also be in the main file
+        seen = {item.get("feedback_id") for item in records}
+        for item in read_journal(self.journal_file):
+            if item.get("feedback_id") not in seen:
+                records.append(item)
+                seen.add(item.get("feedback_id"))
+        return records
+    
+    def _rebuild_totals(self):
+        self._rating_sum = 0
+        self._language_counts = {}
+        for feedback in self.feedback_data:
+            self._count(feedback)
+    
+    def _count(self, feedback: UserFeedback):
+        self._rating_sum += feedback.rating
+        self._language_counts[feedback.language_used] = self._language_counts.get(feedback.language_used, 0) + 1
+    
+    def save_feedback_data(self):
+        """Save feedback data to file"""
+        with self._lock:
+            try:
+                data = [asdict(feedback) for feedback in self.feedback_data]
+                with open(self.storage_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+            except Exception as e:
+                print(f"Error saving feedback data: {e}")
     
     def add_feedback(self, feedback: UserFeedback):
         """Add new feedback"""
-        self.feedback_data.append(feedback)
-        self.save_feedback_data()
+        with self._lock:
+            self.feedback_data.append(feedback)
+            self.rollups.add(feedback)
+            self._count(feedback)
+            self.version += 1
+            for listener in list(self._listeners):
+                if isinstance(listener, weakref.WeakMethod):
+                    listener = listener()
+                    if listener is None:
+                        continue
+                listener(feedback)
+            if self.writer is None:
+                if self.segments is not None:
+                    self.segments.append(feedback)
+                else:
+                    self.save_feedback_data()
+        if self.writer is not None:
+            # Outside the lock: a full queue blocks this producer, not readers
+            self.writer.submit(asdict(feedback))
+    
+    def flush(self):
+        """Wait until all queued feedback is durably on disk"""
+        if self.writer is not None:
+            self.writer.flush()
+    
+    def compact(self):
+        """Fold the journal into the main file and truncate it (segmented mode: compact segments)"""
+        self.flush()
+        if self.segments is not None:
+            self.segments.compact()
+            return
+        # Every API worker appends to the same journal: fold what is on disk, which
+        # includes the other workers' records, not just this process's view
+        with self._lock, file_lock(self.journal_file):
+            try:
+                data = self._read_stored_records()
+                seen = {item.get("feedback_id") for item in data}
+                data.extend(asdict(f) for f in self.feedback_data if f.feedback_id not in seen)
+                tmp_file = self.storage_file + ".tmp"
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.storage_file)
+                if os.path.exists(self.journal_file):
+                    os.remove(self.journal_file)
+            except Exception as e:
+                print(f"Error compacting feedback data: {e}")
+    
+    def close(self):
+        """Flush pending writes, stop the writer and compact the journal"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            # Without a journal nothing is left to fold: this process wrote nothing, or
+            # another process already compacted its records into the main file
+            if self.segments is None and os.path.exists(self.journal_file):
+                self.compact()
+        if self.segments is not None:
+            self.segments.close()
+    
+    def drop_before(self, cutoff: datetime):
+        """Forget feedback older than cutoff, e.g. after segment retention deleted it on disk"""
+        with self._lock:
+            kept = [f for f in self.feedback_data if datetime.fromisoformat(f.timestamp) >= cutoff]
+            if len(kept) == len(self.feedback_data):
+                return
+            self.feedback_data = kept
+            self.rollups.rebuild(self.feedback_data)
+            self._rebuild_totals()
+            self.version += 1
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Queue depth and batch counters of the background writer"""
+        return self.writer.get_stats() if self.writer is not None else {}
+    
+    def export_columnar(self, path: str, format: Optional[str] = None):
+        """Export all feedback to Parquet or Arrow IPC (format inferred from the suffix; needs pyarrow)"""
+        from feedback_columnar import feedback_to_table, write_feedback_table
+        with self._lock:
+            records = list(self.feedback_data)
+        write_feedback_table(feedback_to_table(records), path, format)
+    
+    def load_columnar(self, path: str, format: Optional[str] = None):
+        """Replace the in-memory feedback with a columnar export"""
+        from feedback_columnar import read_feedback_table, table_to_feedback
+        records = table_to_feedback(read_feedback_table(path, format))
+        with self._lock:
+            self.feedback_data = records
+            self.rollups.rebuild(self.feedback_data)
+            self._rebuild_totals()
+            self.version += 1
+    
+    def add_listener(self, listener):
+        """
+        Call listener(feedback) after each new feedback is added.
+        Bound methods are held weakly so short-lived analyzers are not kept alive.
+        """
+        with self._lock:
+            if hasattr(listener, "__self__"):
+                # Drop the entry once its analyzer is collected, so listeners do not pile up
+                ref = weakref.WeakMethod(listener, self._remove_listener)
+                self._listeners.append(ref)
+            else:
+                self._listeners.append(listener)
+    
+    def _remove_listener(self, ref):
+        with self._lock:
+            if ref in self._listeners:
+                self._listeners.remove(ref)
     
     def create_feedback(
         self,
@@ -79,9 +260,10 @@ class FeedbackCollector:
         user_satisfaction: int = 5,
         would_recommend: bool = True,
         improvement_suggestions: str = "",
-        technical_issues: str = ""
+        technical_issues: str = "",
+        response_latency_ms: Optional[float] = None
     ) -> UserFeedback:
-        """Create a new feedback entry"""
+        """Create a new feedback entry, recording the rated response's latency if given"""
         feedback = UserFeedback(
             feedback_id=str(uuid.uuid4()),
             user_id=user_id,
@@ -101,8 +283,32 @@ class FeedbackCollector:
             technical_issues=technical_issues
         )
         self.add_feedback(feedback)
+        if response_latency_ms is not None:
+            self.record_latency(response_latency_ms)
         return feedback
     
+    def record_latency(self, latency_ms: float):
+        """Feed a response latency into the sketch analyzers report quantiles from"""
+        with self._lock:
+            self.latency_ms.add(latency_ms)
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Count, average rating and per-language counts from running totals, cached per version"""
+        with self._lock:
+            cached = self._summary_cache
+            if cached is None or cached[0] != self.version:
+                count = len(self.feedback_data)
+                summary = {"total_feedback": count, "average_rating": self._rating_sum / count if count else 0}
+                if count:
+                    summary["language_breakdown"] = dict(self._language_counts)
+                cached = self._summary_cache = (self.version, summary)
+            return cached[1]
+    
+    def get_latest_feedback(self, limit: int = 5) -> List[UserFeedback]:
+        """The most recently added feedback, oldest first"""
+        with self._lock:
+            return self.feedback_data[-limit:]
+    
     def get_feedback_by_user(self, user_id: str) -> List[UserFeedback]:
         """Get all feedback from a specific user"""
         return [f for f in self.feedback_data if f.user_id == user_id]
@@ -118,138 +324,449 @@ class FeedbackCollector:
             f for f in self.feedback_data 
             if datetime.fromisoformat(f.timestamp) >= cutoff_date
         ]
+    
+    def get_window_metrics(
+        self,
+        start,
+        end,
+        language: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get aggregate metrics for feedback in [start, end) from the time-bucket rollups"""
+        return self.rollups.window_metrics(start, end, language, interaction_type)
+    
+    def get_recent_metrics(self, days: int = 7) -> Dict[str, Any]:
+        """Get aggregate metrics for the last N days without scanning records"""
+        now = datetime.now()
+        return self.rollups.window_metrics(now - timedelta(days=days), now + timedelta(hours=1))
+    
+    def get_time_series(
+        self,
+        start,
+        end,
+        granularity: str = "day",
+        language: Optional[str] = None,
+        interaction_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get per-hour or per-day metrics for feedback in [start, end)"""
+        return self.rollups.time_series(start, end, granularity, language, interaction_type)
+
+_collectors: Dict[str, FeedbackCollector] = {}
+_collectors_lock = threading.Lock()
+
+def get_feedback_collector(storage_file: str = Config.FEEDBACK_FILE) -> FeedbackCollector:
+    """
+    Process-wide collector for a storage file, shared by the assistant, the
+    Streamlit UI and the HTTP API so feedback is held in memory only once
+    """
+    with _collectors_lock:
+        collector = _collectors.get(storage_file)
+        if collector is None:
+            collector = _collectors[storage_file] = FeedbackCollector(storage_file, async_writes=True)
+        return collector
+
+# Languages and interaction types always present in breakdowns, even with no feedback
+REPORT_LANGUAGES = ["Hindi", "Telugu", "English", "Mixed"]
+REPORT_INTERACTION_TYPES = ["translation", "learning", "general", "cultural"]
+
+# Score fields summed for the overall metrics, with their improvement-area labels
+SCORE_FIELDS = {
+    "response_quality": "Response Quality",
+    "cultural_sensitivity": "Cultural Sensitivity",
+    "language_accuracy": "Language Accuracy",
+    "helpfulness": "Helpfulness",
+    "response_speed": "Response Speed",
+    "user_satisfaction": "User Satisfaction"
+}
+
+class IssueTracker:
+    """
+    Streaming top-k of issue terms from technical_issues and
+    improvement_suggestions, overall and per language. Text is normalized
+    and split into script-aware words and bigrams, so near-identical
+    phrasings share counts; memory is fixed by the Space-Saving capacity.
+    """
+    
+    def __init__(self, capacity: int = Config.ISSUE_TRACKER_CAPACITY,
+                 language_capacity: int = Config.ISSUE_TRACKER_LANGUAGE_CAPACITY):
+        self.capacity = capacity
+        self.language_capacity = language_capacity
+        self.overall = SpaceSaving(capacity)
+        self.by_language: Dict[str, SpaceSaving] = {}
+    
+    def add(self, f: UserFeedback):
+        for text in (f.technical_issues, f.improvement_suggestions):
+            if text:
+                self.add_text(f.language_used, text)
+    
+    def add_text(self, language: str, text: str, weight: int = 1):
+        """Count the terms of one issue text, as if it occurred weight times"""
+        counter = self.by_language.get(language)
+        if counter is None:
+            counter = self.by_language[language] = SpaceSaving(self.language_capacity)
+        # Count each term once per text so a repeated word does not dominate
+        for term in set(extract_terms(text)):
+            self.overall.add(term, weight)
+            counter.add(term, weight)
+    
+    def merge(self, other: "IssueTracker") -> "IssueTracker":
+        self.overall.merge(other.overall)
+        for language, counter in other.by_language.items():
+            if language in self.by_language:
+                self.by_language[language].merge(counter)
+            else:
+                self.by_language[language] = SpaceSaving.from_dict(counter.to_dict())
+        return self
+    
+    def top_issues(self, limit: int = 5, language: Optional[str] = None) -> List[str]:
+        """
+        Most frequent issue terms. A single word is dropped when the tracked
+        phrases containing it account for most of its occurrences, so
+        "slow response" is reported instead of "slow" and "response".
+        """
+        counter = self.overall if language is None else self.by_language.get(language)
+        if counter is None:
+            return []
+        candidates = counter.top(limit * 4)
+        phrases = [(term.split(), count) for term, count in candidates if " " in term]
+        selected = []
+        for term, count in candidates:
+            if " " not in term:
+                covered = sum(count_p for words, count_p in phrases if term in words)
+                if covered >= 0.8 * count:
+                    continue
+            selected.append(term)
+            if len(selected) == limit:
+                break
+        return selected
+
+class FeedbackAggregate:
+    """
+    Partial aggregate of feedback built in a single pass.
+    Aggregates over disjoint subsets can be combined with merge(), and every
+    FeedbackAnalyzer report section is derived from one aggregate.
+    """
+    
+    def __init__(self, track_users: bool = True):
+        self.track_users = track_users
+        self.count = 0
+        self.rating_sum = 0
+        self.rating_counts: Dict[int, int] = {}
+        self.recommend_count = 0
+        self.score_sums = {field: 0 for field in SCORE_FIELDS}
+        # language -> [count, rating, language_accuracy, cultural_sensitivity, recommended]
+        self.languages: Dict[str, List[int]] = {}
+        # interaction type -> [count, rating, helpfulness, user_satisfaction]
+        self.interaction_types: Dict[str, List[int]] = {}
+        self.issues = IssueTracker()
+        self.user_ids: set = set()
+    
+    def add(self, f: UserFeedback):
+        """Fold one feedback record into the aggregate"""
+        self.count += 1
+        self.rating_sum += f.rating
+        self.rating_counts[f.rating] = self.rating_counts.get(f.rating, 0) + 1
+        self.recommend_count += f.would_recommend
+        sums = self.score_sums
+        sums["response_quality"] += f.response_quality
+        sums["cultural_sensitivity"] += f.cultural_sensitivity
+        sums["language_accuracy"] += f.language_accuracy
+        sums["helpfulness"] += f.helpfulness
+        sums["response_speed"] += f.response_speed
+        sums["user_satisfaction"] += f.user_satisfaction
+        
+        lang = self.languages.get(f.language_used)
+        if lang is None:
+            lang = self.languages[f.language_used] = [0, 0, 0, 0, 0]
+        lang[0] += 1
+        lang[1] += f.rating
+        lang[2] += f.language_accuracy
+        lang[3] += f.cultural_sensitivity
+        lang[4] += f.would_recommend
+        
+        itype = self.interaction_types.get(f.interaction_type)
+        if itype is None:
+            itype = self.interaction_types[f.interaction_type] = [0, 0, 0, 0]
+        itype[0] += 1
+        itype[1] += f.rating
+        itype[2] += f.helpfulness
+        itype[3] += f.user_satisfaction
+        
+        self.issues.add(f)
+        
+        if self.track_users:
+            self.user_ids.add(f.user_id)
+    
+    def merge(self, other: "FeedbackAggregate") -> "FeedbackAggregate":
+        """Combine another aggregate into this one and return self"""
+        self.count += other.count
+        self.rating_sum += other.rating_sum
+        for rating, count in other.rating_counts.items():
+            self.rating_counts[rating] = self.rating_counts.get(rating, 0) + count
+        self.recommend_count += other.recommend_count
+        for field, total in other.score_sums.items():
+            self.score_sums[field] += total
+        for groups, other_groups in ((self.languages, other.languages),
+                                     (self.interaction_types, other.interaction_types)):
+            for key, values in other_groups.items():
+                if key in groups:
+                    groups[key] = [a + b for a, b in zip(groups[key], values)]
+                else:
+                    groups[key] = list(values)
+        self.issues.merge(other.issues)
+        self.user_ids |= other.user_ids
+        return self
+    
+    @classmethod
+    def from_feedback(cls, feedback_data, track_users: bool = True) -> "FeedbackAggregate":
+        aggregate = cls(track_users)
+        for feedback in feedback_data:
+            aggregate.add(feedback)
+        return aggregate
+    
+    def overall_metrics(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"total_feedback": 0}
+        n = self.count
+        sums = self.score_sums
+        return {
+            "total_feedback": n,
+            "average_rating": self.rating_sum / n,
+            "average_response_quality": sums["response_quality"] / n,
+            "average_cultural_sensitivity": sums["cultural_sensitivity"] / n,
+            "average_language_accuracy": sums["language_accuracy"] / n,
+            "average_helpfulness": sums["helpfulness"] / n,
+            "average_response_speed": sums["response_speed"] / n,
+            "average_user_satisfaction": sums["user_satisfaction"] / n,
+            "recommendation_rate": self.recommend_count / n * 100
+        }
+    
+    def language_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        breakdown = {}
+        for language in REPORT_LANGUAGES + [l for l in self.languages if l not in REPORT_LANGUAGES]:
+            count, rating, accuracy, sensitivity, recommended = self.languages.get(language, [0, 0, 0, 0, 0])
+            breakdown[language] = {
+                "count": count,
+                "average_rating": rating / count if count else 0,
+                "average_language_accuracy": accuracy / count if count else 0,
+                "average_cultural_sensitivity": sensitivity / count if count else 0,
+                "recommendation_rate": recommended / count * 100 if count else 0
+            }
+        return breakdown
+    
+    def interaction_type_breakdown(self) -> Dict[str, Dict[str, Any]]:
+        breakdown = {}
+        types = REPORT_INTERACTION_TYPES + [t for t in self.interaction_types if t not in REPORT_INTERACTION_TYPES]
+        for interaction_type in types:
+            count, rating, helpfulness, satisfaction = self.interaction_types.get(interaction_type, [0, 0, 0, 0])
+            breakdown[interaction_type] = {
+                "count": count,
+                "average_rating": rating / count if count else 0,
+                "average_helpfulness": helpfulness / count if count else 0,
+                "average_user_satisfaction": satisfaction / count if count else 0
+            }
+        return breakdown
+    
+    def improvement_areas(self) -> List[str]:
+        if not self.count:
+            return []
+        aspects = {label: self.score_sums[field] / self.count for field, label in SCORE_FIELDS.items()}
+        # Sort by lowest scores (areas needing improvement) and keep the top 3 below 4.0
+        sorted_aspects = sorted(aspects.items(), key=lambda x: x[1])
+        return [aspect for aspect, score in sorted_aspects[:3] if score < 4.0]
+    
+    def common_issues(self, limit: int = 5, language: Optional[str] = None) -> List[str]:
+        return self.issues.top_issues(limit, language)
+    
+    def to_report(self) -> Dict[str, Any]:
+        """Build the report structure returned by FeedbackAnalyzer.generate_report"""
+        return {
+            "overall_metrics": self.overall_metrics(),
+            "language_breakdown": self.language_breakdown(),
+            "interaction_type_breakdown": self.interaction_type_breakdown(),
+            "improvement_areas": self.improvement_areas(),
+            "common_issues": self.common_issues(),
+            "total_users": len(self.user_ids),
+            "report_generated": datetime.now().isoformat()
+        }
+
+class FeedbackSketches:
+    """
+    Fixed-memory approximate analytics: HyperLogLog distinct users overall
+    and per language, and quantile sketches for every score plus response
+    latency. Sketches from different shards or replicas merge exactly.
+    """
+    
+    SCORES = ["rating"] + list(SCORE_FIELDS)
+    
+    def __init__(self, precision: int = 12, relative_accuracy: float = 0.01):
+        self.precision = precision
+        self.relative_accuracy = relative_accuracy
+        self.users = HyperLogLog(precision)
+        self.users_by_language: Dict[str, HyperLogLog] = {}
+        self.scores = {name: QuantileSketch(relative_accuracy) for name in self.SCORES}
+        self.latency_ms = QuantileSketch(relative_accuracy)
+    
+    def add(self, f: UserFeedback):
+        self.users.add(f.user_id)
+        language_users = self.users_by_language.get(f.language_used)
+        if language_users is None:
+            language_users = self.users_by_language[f.language_used] = HyperLogLog(self.precision)
+        language_users.add(f.user_id)
+        for name, sketch in self.scores.items():
+            sketch.add(getattr(f, name))
+    
+    def record_latency(self, latency_ms: float):
+        """Feed a response latency to sketches without a collector (which tracks its own)"""
+        self.latency_ms.add(latency_ms)
+    
+    def merge(self, other: "FeedbackSketches") -> "FeedbackSketches":
+        self.users.merge(other.users)
+        for language, sketch in other.users_by_language.items():
+            if language in self.users_by_language:
+                self.users_by_language[language].merge(sketch)
+            else:
+                self.users_by_language[language] = HyperLogLog.from_dict(sketch.to_dict())
+        for name, sketch in other.scores.items():
+            self.scores[name].merge(sketch)
+        self.latency_ms.merge(other.latency_ms)
+        return self
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "distinct_users": self.users.count(),
+            "distinct_users_by_language": {
+                language: sketch.count() for language, sketch in self.users_by_language.items()
+            },
+            "score_quantiles": {name: sketch.quantiles() for name, sketch in self.scores.items()},
+            "latency_ms_quantiles": self.latency_ms.quantiles()
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "relative_accuracy": self.relative_accuracy,
+            "users": self.users.to_dict(),
+            "users_by_language": {k: v.to_dict() for k, v in self.users_by_language.items()},
+            "scores": {k: v.to_dict() for k, v in self.scores.items()},
+            "latency_ms": self.latency_ms.to_dict()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeedbackSketches":
+        sketches = cls(data["precision"], data["relative_accuracy"])
+        sketches.users = HyperLogLog.from_dict(data["users"])
+        sketches.users_by_language = {k: HyperLogLog.from_dict(v) for k, v in data["users_by_language"].items()}
+        sketches.scores = {k: QuantileSketch.from_dict(v) for k, v in data["scores"].items()}
+        sketches.latency_ms = QuantileSketch.from_dict(data["latency_ms"])
+        return sketches
 
 class FeedbackAnalyzer:
     """Analyzes user feedback and generates insights"""
     
-    def __init__(self, feedback_collector: FeedbackCollector):
+    def __init__(self, feedback_collector: Optional[FeedbackCollector], use_sketches: bool = False):
         self.feedback_collector = feedback_collector
+        self._aggregate_cache = None
+        # Sketch mode: approximate distinct users and quantiles in fixed memory,
+        # kept current on insert instead of rebuilt per report
+        self.use_sketches = use_sketches
+        self._sketches: Optional[FeedbackSketches] = None
+        self._sketch_version = None
+        if feedback_collector is not None:
+            feedback_collector.add_listener(self._on_feedback_added)
+    
+    @classmethod
+    def from_table(cls, table, use_sketches: bool = False) -> "FeedbackAnalyzer":
+        """
+        Analyzer over a columnar feedback table (see feedback_columnar),
+        computed with Arrow kernels instead of per-record objects
+        """
+        from feedback_columnar import aggregate_from_table, sketches_from_table
+        aggregate = aggregate_from_table(table, track_users=not use_sketches)
+        return cls.from_aggregate(aggregate, sketches_from_table(table) if use_sketches else None)
+    
+    @classmethod
+    def from_aggregate(
+        cls, aggregate: FeedbackAggregate, sketches: Optional[FeedbackSketches] = None
+    ) -> "FeedbackAnalyzer":
+        """Analyzer over a precomputed (e.g. merged) aggregate, with optional sketches"""
+        analyzer = cls(None, use_sketches=sketches is not None)
+        analyzer._aggregate_cache = (None, aggregate)
+        analyzer._sketches = sketches
+        return analyzer
+    
+    def _on_feedback_added(self, feedback: UserFeedback):
+        # Only apply incrementally when a structure was current before this insert;
+        # anything stale is rebuilt on the next read instead
+        collector = self.feedback_collector
+        previous_key = (collector.version - 1, len(collector.feedback_data) - 1)
+        if self._aggregate_cache is not None and self._aggregate_cache[0] == previous_key:
+            self._aggregate_cache[1].add(feedback)
+            self._aggregate_cache = ((collector.version, len(collector.feedback_data)), self._aggregate_cache[1])
+        if self._sketches is not None and self._sketch_version == collector.version - 1:
+            self._sketches.add(feedback)
+            self._sketch_version = collector.version
+    
+    def get_sketches(self) -> FeedbackSketches:
+        """Sketches over all feedback, rebuilt only if the collector changed behind our back"""
+        collector = self.feedback_collector
+        if collector is None:
+            return self._sketches
+        if self._sketches is None or self._sketch_version != collector.version:
+            self._sketches = FeedbackSketches(Config.HLL_PRECISION, Config.QUANTILE_RELATIVE_ACCURACY)
+            for feedback in collector.feedback_data:
+                self._sketches.add(feedback)
+            # Shared, not copied: latencies recorded later show up without a rebuild
+            self._sketches.latency_ms = collector.latency_ms
+            self._sketch_version = collector.version
+        return self._sketches
+    
+    def get_aggregate(self) -> FeedbackAggregate:
+        """
+        Single-pass aggregate of all feedback, cached until the collector changes
+        """
+        collector = self.feedback_collector
+        if collector is None:
+            return self._aggregate_cache[1]
+        with collector._lock:
+            key = (collector.version, len(collector.feedback_data))
+            cached = self._aggregate_cache
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            feedback_data = list(collector.feedback_data)
+        # Built from the snapshot outside the lock; the key says which data it covers
+        aggregate = FeedbackAggregate.from_feedback(feedback_data, track_users=not self.use_sketches)
+        self._aggregate_cache = (key, aggregate)
+        return aggregate
     
     def get_overall_metrics(self) -> Dict[str, Any]:
         """Get overall feedback metrics"""
-        if not self.feedback_collector.feedback_data:
-            return {"total_feedback": 0}
-        
-        feedback_data = self.feedback_collector.feedback_data
-        
-        # Calculate averages
-        metrics = {
-            "total_feedback": len(feedback_data),
-            "average_rating": sum(f.rating for f in feedback_data) / len(feedback_data),
-            "average_response_quality": sum(f.response_quality for f in feedback_data) / len(feedback_data),
-            "average_cultural_sensitivity": sum(f.cultural_sensitivity for f in feedback_data) / len(feedback_data),
-            "average_language_accuracy": sum(f.language_accuracy for f in feedback_data) / len(feedback_data),
-            "average_helpfulness": sum(f.helpfulness for f in feedback_data) / len(feedback_data),
-            "average_response_speed": sum(f.response_speed for f in feedback_data) / len(feedback_data),
-            "average_user_satisfaction": sum(f.user_satisfaction for f in feedback_data) / len(feedback_data),
-            "recommendation_rate": sum(f.would_recommend for f in feedback_data) / len(feedback_data) * 100
-        }
-        
-        return metrics
+        return self.get_aggregate().overall_metrics()
     
     def get_language_breakdown(self) -> Dict[str, Dict[str, Any]]:
         """Get feedback breakdown by language"""
-        language_metrics = {}
-        
-        for language in ["Hindi", "Telugu", "English", "Mixed"]:
-            lang_feedback = self.feedback_collector.get_feedback_by_language(language)
-            
-            if lang_feedback:
-                language_metrics[language] = {
-                    "count": len(lang_feedback),
-                    "average_rating": sum(f.rating for f in lang_feedback) / len(lang_feedback),
-                    "average_language_accuracy": sum(f.language_accuracy for f in lang_feedback) / len(lang_feedback),
-                    "average_cultural_sensitivity": sum(f.cultural_sensitivity for f in lang_feedback) / len(lang_feedback),
-                    "recommendation_rate": sum(f.would_recommend for f in lang_feedback) / len(lang_feedback) * 100
-                }
-            else:
-                language_metrics[language] = {
-                    "count": 0,
-                    "average_rating": 0,
-                    "average_language_accuracy": 0,
-                    "average_cultural_sensitivity": 0,
-                    "recommendation_rate": 0
-                }
-        
-        return language_metrics
+        return self.get_aggregate().language_breakdown()
     
     def get_interaction_type_breakdown(self) -> Dict[str, Dict[str, Any]]:
         """Get feedback breakdown by interaction type"""
-        type_metrics = {}
-        
-        for interaction_type in ["translation", "learning", "general", "cultural"]:
-            type_feedback = [f for f in self.feedback_collector.feedback_data if f.interaction_type == interaction_type]
-            
-            if type_feedback:
-                type_metrics[interaction_type] = {
-                    "count": len(type_feedback),
-                    "average_rating": sum(f.rating for f in type_feedback) / len(type_feedback),
-                    "average_helpfulness": sum(f.helpfulness for f in type_feedback) / len(type_feedback),
-                    "average_user_satisfaction": sum(f.user_satisfaction for f in type_feedback) / len(type_feedback)
-                }
-            else:
-                type_metrics[interaction_type] = {
-                    "count": 0,
-                    "average_rating": 0,
-                    "average_helpfulness": 0,
-                    "average_user_satisfaction": 0
-                }
-        
-        return type_metrics
+        return self.get_aggregate().interaction_type_breakdown()
     
     def get_improvement_areas(self) -> List[str]:
         """Identify areas for improvement based on feedback"""
-        if not self.feedback_collector.feedback_data:
-            return []
-        
-        feedback_data = self.feedback_collector.feedback_data
-        
-        # Calculate average scores for different aspects
-        aspects = {
-            "Response Quality": sum(f.response_quality for f in feedback_data) / len(feedback_data),
-            "Cultural Sensitivity": sum(f.cultural_sensitivity for f in feedback_data) / len(feedback_data),
-            "Language Accuracy": sum(f.language_accuracy for f in feedback_data) / len(feedback_data),
-            "Helpfulness": sum(f.helpfulness for f in feedback_data) / len(feedback_data),
-            "Response Speed": sum(f.response_speed for f in feedback_data) / len(feedback_data),
-            "User Satisfaction": sum(f.user_satisfaction for f in feedback_data) / len(feedback_data)
-        }
-        
-        # Sort by lowest scores (areas needing improvement)
-        sorted_aspects = sorted(aspects.items(), key=lambda x: x[1])
-        
-        # Return top 3 areas for improvement
-        return [aspect for aspect, score in sorted_aspects[:3] if score < 4.0]
+        return self.get_aggregate().improvement_areas()
     
-    def get_common_issues(self) -> List[str]:
-        """Get common issues mentioned in feedback"""
-        issues = []
-        
-        for feedback in self.feedback_collector.feedback_data:
-            if feedback.technical_issues:
-                issues.append(feedback.technical_issues)
-            if feedback.improvement_suggestions:
-                issues.append(feedback.improvement_suggestions)
-        
-        # Simple frequency analysis (in a real implementation, you'd use NLP)
-        issue_counts = {}
-        for issue in issues:
-            issue_counts[issue] = issue_counts.get(issue, 0) + 1
-        
-        # Return most common issues
-        sorted_issues = sorted(issue_counts.items(), key=lambda x: x[1], reverse=True)
-        return [issue for issue, count in sorted_issues[:5]]
+    def get_common_issues(self, language: Optional[str] = None) -> List[str]:
+        """Get common issues mentioned in feedback, optionally for one language"""
+        return self.get_aggregate().common_issues(language=language)
     
     def generate_report(self) -> Dict[str, Any]:
-        """Generate comprehensive feedback report"""
-        return {
-            "overall_metrics": self.get_overall_metrics(),
-            "language_breakdown": self.get_language_breakdown(),
-            "interaction_type_breakdown": self.get_interaction_type_breakdown(),
-            "improvement_areas": self.get_improvement_areas(),
-            "common_issues": self.get_common_issues(),
-            "total_users": len(set(f.user_id for f in self.feedback_collector.feedback_data)),
-            "report_generated": datetime.now().isoformat()
-        }
+        """Generate comprehensive feedback report from one cached pass over the data"""
+        report = self.get_aggregate().to_report()
+        if self.use_sketches:
+            sketch_summary = self.get_sketches().summary()
+            report["total_users"] = sketch_summary["distinct_users"]
+            report["approximate"] = sketch_summary
+        return report
 
 class FeedbackVisualizer:
     """Creates visualizations for feedback data"""
@@ -259,16 +776,14 @@ class FeedbackVisualizer:
     
     def create_rating_distribution_chart(self) -> str:
         """Create a simple text-based rating distribution chart"""
-        if not self.analyzer.feedback_collector.feedback_data:
+        aggregate = self.analyzer.get_aggregate()
+        if not aggregate.count:
             return "No feedback data available"
         
-        ratings = [f.rating for f in self.analyzer.feedback_collector.feedback_data]
-        rating_counts = {i: ratings.count(i) for i in range(1, 6)}
-        
         chart = "Rating Distribution:\n"
         for rating in range(5, 0, -1):
-            count = rating_counts[rating]
-            bar = "█" * (count * 20 // len(ratings))
+            count = aggregate.rating_counts.get(rating, 0)
+            bar = "█" * (count * 20 // aggregate.count)
             chart += f"{rating} stars: {bar} ({count})\n"
         
         return chart
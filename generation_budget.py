@@ -0,0 +1,158 @@
+"""
+Adaptive generation budgets for IndicSahayak
+Chooses max_new_tokens and stop sequences per request from its intent and
+language. Budgets start from Config.GENERATION_BUDGETS and are then learned
+from observed completion lengths, so greetings end early while long answers
+and paragraph translations are not truncated.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+from config import Config
+from sketches import QuantileSketch
+from text_analysis import AnalyzedText, analyze_text
+
+INTENTS = ("greeting", "translation", "learning", "cultural", "general")
+
+INTENT_KEYWORDS = {
+    "translation": ["translat", "meaning of", "in hindi", "in telugu", "in english", "अनुवाद", "मतलब", "అనువాద", "అర్థం"],
+    "greeting": ["hello", "hi", "hey", "namaste", "namaskar", "नमस्ते", "नमस्कार", "నమస్కారం", "నమస్తే"],
+    "learning": ["grammar", "learn", "teach", "vocabulary", "pronounc", "सीख", "व्याकरण", "शब्द", "నేర్చు", "వ్యాకరణ", "పదాలు"],
+    "cultural": ["festival", "culture", "tradition", "diwali", "sankranti", "त्योहार", "संस्कृति", "परंपरा", "పండుగ", "సంస్కృతి", "సంప్రదాయ"],
+}
+GREETING_MAX_WORDS = 4  # "hello, how do I say thank you" is not a greeting
+GREETING_MAX_CHARS = 64  # Longer inputs are not tokenized for the greeting check
+
+
+def classify_intent(text: Union[str, AnalyzedText]) -> str:
+    """Coarse intent of a user turn, used to pick its generation budget"""
+    analyzed = analyze_text(text)
+    if analyzed.contains(*INTENT_KEYWORDS["translation"]):
+        return "translation"
+    if len(analyzed.raw) <= GREETING_MAX_CHARS:
+        words = analyzed.tokens
+        if len(words) <= GREETING_MAX_WORDS and any(word in INTENT_KEYWORDS["greeting"] for word in words):
+            return "greeting"
+    for intent in ("learning", "cultural"):
+        if analyzed.contains(*INTENT_KEYWORDS[intent]):
+            return intent
+    return "general"
+
+
+class GenerationBudget:
+    """
+    Learned max_new_tokens per (intent, language).
+
+    Completion lengths are kept in quantile sketches, per language and per
+    intent across languages. A budget is the GENERATION_BUDGET_QUANTILE
+    length times GENERATION_BUDGET_HEADROOM once there are enough samples.
+    A completion that used its whole budget was probably cut off, so it is
+    recorded at twice its length and the budget grows.
+    """
+
+    def __init__(
+        self,
+        defaults: Optional[Dict[str, int]] = None,
+        min_tokens: int = Config.GENERATION_MIN_TOKENS,
+        max_tokens: int = Config.GENERATION_MAX_TOKENS,
+        min_samples: int = Config.GENERATION_MIN_SAMPLES,
+        quantile: float = Config.GENERATION_BUDGET_QUANTILE,
+        headroom: float = Config.GENERATION_BUDGET_HEADROOM
+    ):
+        self.defaults = defaults or Config.GENERATION_BUDGETS
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self.headroom = headroom
+        self._lock = threading.Lock()
+        # (intent, language or "*") -> completion token lengths
+        self._lengths: Dict[Tuple[str, str], QuantileSketch] = {}
+        self.truncated = 0
+
+    def _learned(self, intent: str, language: str) -> Optional[float]:
+        for key in ((intent, language), (intent, "*")):
+            sketch = self._lengths.get(key)
+            if sketch is not None and sketch.count >= self.min_samples:
+                return sketch.quantile(self.quantile) * self.headroom
+        return None
+
+    def budget(self, intent: str, language: str = "auto", input_tokens: int = 0) -> int:
+        """max_new_tokens for a request; translations also scale with their input"""
+        with self._lock:
+            learned = self._learned(intent, language)
+        tokens = learned if learned is not None else self.defaults.get(intent, Config.MAX_TOKENS)
+        if intent == "translation":
+            tokens = max(tokens, input_tokens * Config.TRANSLATION_TOKEN_RATIO + self.min_tokens)
+        return int(min(max(tokens, self.min_tokens), self.max_tokens))
+
+    @staticmethod
+    def stop_sequences(intent: str) -> List[str]:
+        stops = Config.GENERATION_STOP_SEQUENCES
+        return list(stops.get(intent, stops["default"]))
+
+    def plan(self, text: Union[str, AnalyzedText], language: str = "auto", input_tokens: int = 0) -> Dict[str, Any]:
+        """Intent, max_tokens and stop sequences for a user turn"""
+        intent = classify_intent(text)
+        return {
+            "intent": intent,
+            "language": language,
+            "max_tokens": self.budget(intent, language, input_tokens),
+            "stop": self.stop_sequences(intent)
+        }
+
+    def observe(
+        self,
+        intent: str,
+        language: str,
+        completion_tokens: int,
+        max_tokens: int,
+        finish_reason: Optional[str] = None
+    ):
+        """Record the length of a finished completion"""
+        truncated = finish_reason == "length" or (finish_reason is None and completion_tokens >= max_tokens)
+        length = min(max_tokens * 2, self.max_tokens) if truncated else completion_tokens
+        with self._lock:
+            if truncated:
+                self.truncated += 1
+            for key in ((intent, language), (intent, "*")):
+                sketch = self._lengths.get(key)
+                if sketch is None:
+                    sketch = self._lengths[key] = QuantileSketch(Config.QUANTILE_RELATIVE_ACCURACY)
+                sketch.add(length)
+
+    def observe_result(self, plan: Dict[str, Any], result: Dict[str, Any]):
+        """Record a client result for the plan it was generated with"""
+        if result.get("success") and "completion_tokens" in result:
+            self.observe(
+                plan["intent"], plan["language"], result["completion_tokens"],
+                plan["max_tokens"], result.get("finish_reason")
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            intents = {
+                intent: {
+                    "samples": sketch.count,
+                    "p50_tokens": sketch.quantile(0.5),
+                    "budget": None
+                }
+                for (intent, language), sketch in self._lengths.items() if language == "*"
+            }
+            truncated = self.truncated
+        for intent, stats in intents.items():
+            stats["budget"] = self.budget(intent)
+        return {"intents": intents, "truncated": truncated}
+
+
+_budget: Optional[GenerationBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_generation_budget() -> GenerationBudget:
+    """Process-wide budget shared by the assistant and the clients"""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = GenerationBudget()
+        return _budget
@@ -6,28 +6,69 @@ Handles interactions with open-source models on Hugging Face
 import requests
 import json
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 import os
 from config import Config
+from token_counter import TokenCounter, get_token_counter, build_usage
+from generation_budget import get_generation_budget
+from cassette import Cassette, get_cassette
+
+def _apply_stop(text: str, stop: Optional[List[str]]) -> Tuple[str, bool]:
+    """Cut text at the first stop sequence, for backends that ignore or echo them"""
+    cut = min((text.find(s) for s in stop or [] if s in text), default=-1)
+    if cut < 0:
+        return text, False
+    return text[:cut].rstrip(), True
+
+# Local token counts are estimates: a reply this close to the cap was most likely cut by it
+ESTIMATED_TRUNCATION_RATIO = 0.9
+
+def _finish_reason(stopped: bool, completion_tokens: int, max_tokens: int, exact: bool = False) -> str:
+    """Finish reason for backends that do not report one; exact is True for backend token counts"""
+    limit = max_tokens if exact else ESTIMATED_TRUNCATION_RATIO * max_tokens
+    return "stop" if stopped or completion_tokens < limit else "length"
+
+def _post(
+    cassette: Optional[Cassette],
+    client: str,
+    call: Dict[str, Any],
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    timeout: float
+):
+    """requests.post, or the cassette's recording/replay of it"""
+    if cassette is not None:
+        return cassette.post(client, call, url, headers, payload, timeout)
+    return requests.post(url, headers=headers, json=payload, timeout=timeout)
 
 class HuggingFaceClient:
     """Client for interacting with Hugging Face Inference API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        token_counter: Optional[TokenCounter] = None,
+        base_url: Optional[str] = None,
+        cassette: Optional[Cassette] = None
+    ):
         self.api_key = api_key or Config.HUGGINGFACE_API_KEY
-        self.base_url = "https://api-inference.huggingface.co/models"
+        self.base_url = base_url or Config.MODELS["huggingface"]["api_url"]
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.token_counter = token_counter or get_token_counter()
+        self.cassette = cassette or get_cassette()  # Records or replays traffic when set
     
     def generate_response(
         self, 
         prompt: str, 
         model: str = "microsoft/DialoGPT-medium",
-        max_tokens: int = 200,
+        max_tokens: int = Config.MAX_TOKENS,
         temperature: float = 0.7,
-        language: str = "auto"
+        language: str = "auto",
+        stop: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Generate response using Hugging Face Inference API
@@ -38,10 +79,12 @@ class HuggingFaceClient:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             language: Target language for response
+            stop: Sequences that end generation early
             
         Returns:
             Dictionary containing response and metadata
         """
+        started = time.perf_counter()
         try:
             # Prepare the request payload
             payload = {
@@ -51,16 +94,24 @@ class HuggingFaceClient:
                     "temperature": temperature,
                     "top_p": Config.TOP_P,
                     "return_full_text": False,
-                    "do_sample": True
+                    "do_sample": True,
+                    "details": True  # finish_reason and generated_tokens, where the backend supports it
                 }
             }
+            if stop:
+                payload["parameters"]["stop"] = stop
             
             # Make the API request
-            response = requests.post(
+            call = {
+                "prompt": prompt, "model": model, "max_tokens": max_tokens,
+                "temperature": temperature, "language": language, "stop": stop
+            }
+            response = _post(
+                self.cassette, "huggingface", call,
                 f"{self.base_url}/{model}",
-                headers=self.headers,
-                json=payload,
-                timeout=Config.MODELS["huggingface"]["timeout"]
+                self.headers,
+                payload,
+                Config.MODELS["huggingface"]["timeout"]
             )
             
             if response.status_code == 200:
@@ -68,28 +119,46 @@ class HuggingFaceClient:
                 
                 # Handle different response formats
                 if isinstance(result, list) and len(result) > 0:
-                    generated_text = result[0].get("generated_text", "")
-                elif isinstance(result, dict):
+                    result = result[0]
+                if isinstance(result, dict):
                     generated_text = result.get("generated_text", "")
+                    details = result.get("details") or {}
                 else:
                     generated_text = str(result)
+                    details = {}
+                generated_text, stopped = _apply_stop(generated_text, stop)
                 
+                usage = build_usage(self.token_counter, prompt, generated_text, started, time.perf_counter())
+                exact = "generated_tokens" in details
+                if exact:
+                    usage["completion_tokens"] = details["generated_tokens"]
+                    usage["total_tokens"] = usage["prompt_tokens"] + details["generated_tokens"]
+                    if usage["latency"] > 0:
+                        usage["tokens_per_second"] = details["generated_tokens"] / usage["latency"]
+                if details.get("finish_reason") and not stopped:
+                    # TGI reports "length", "eos_token" or "stop_sequence"
+                    finish_reason = "length" if details["finish_reason"] == "length" else "stop"
+                else:
+                    finish_reason = _finish_reason(stopped, usage["completion_tokens"], max_tokens, exact)
                 return {
                     "success": True,
                     "response": generated_text,
                     "model": model,
                     "language": language,
-                    "tokens_used": len(generated_text.split())
+                    "tokens_used": usage["completion_tokens"],
+                    "finish_reason": finish_reason,
+                    **usage
                 }
             
             elif response.status_code == 503:
                 # Model is loading, wait and retry
-                return self._handle_model_loading(model, prompt, max_tokens, temperature, language)
+                return self._handle_model_loading(model, prompt, max_tokens, temperature, language, stop)
             
             else:
                 return {
                     "success": False,
                     "error": f"API Error: {response.status_code} - {response.text}",
+                    "status_code": response.status_code,
                     "model": model
                 }
                 
@@ -112,17 +181,20 @@ class HuggingFaceClient:
         prompt: str, 
         max_tokens: int, 
         temperature: float, 
-        language: str
+        language: str,
+        stop: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Handle model loading scenario by waiting and retrying
         """
         max_retries = 3
         wait_time = 10
+        # A replayed cassette recorded the wait already; keep it on the replay's clock
+        scale = self.cassette.time_scale if self.cassette is not None and self.cassette.replaying else 1.0
         
         for attempt in range(max_retries):
-            time.sleep(wait_time)
-            result = self.generate_response(prompt, model, max_tokens, temperature, language)
+            time.sleep(wait_time * scale)
+            result = self.generate_response(prompt, model, max_tokens, temperature, language, stop)
             
             if result["success"]:
                 return result
@@ -139,10 +211,12 @@ class HuggingFaceClient:
         self, 
         text: str, 
         source_lang: str, 
-        target_lang: str
+        target_lang: str,
+        max_tokens: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Translate text between languages using multilingual models
+        Translate text between languages using multilingual models.
+        Without max_tokens the budget scales with the length of the text.
         """
         # Use a multilingual translation model
         model = "facebook/mbart-large-50-many-to-many-mmt"
@@ -150,7 +224,15 @@ class HuggingFaceClient:
         # Create translation prompt
         prompt = f"Translate the following {source_lang} text to {target_lang}: {text}"
         
-        return self.generate_response(prompt, model, max_tokens=100)
+        budget = get_generation_budget()
+        plan = {
+            "intent": "translation",
+            "language": target_lang,
+            "max_tokens": max_tokens or budget.budget("translation", target_lang, self.token_counter.count(text))
+        }
+        result = self.generate_response(prompt, model, max_tokens=plan["max_tokens"], language=target_lang)
+        budget.observe_result(plan, result)
+        return result
     
     def get_available_models(self) -> List[str]:
         """
@@ -179,21 +261,30 @@ class HuggingFaceClient:
 class LocalModelClient:
     """Client for local model deployment (Ollama, etc.)"""
     
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        token_counter: Optional[TokenCounter] = None,
+        cassette: Optional[Cassette] = None
+    ):
         self.base_url = base_url
         self.headers = {"Content-Type": "application/json"}
+        self.token_counter = token_counter or get_token_counter()
+        self.cassette = cassette or get_cassette()  # Records or replays traffic when set
     
     def generate_response(
         self, 
         prompt: str, 
         model: str = "llama2:7b",
-        max_tokens: int = 200,
+        max_tokens: int = Config.MAX_TOKENS,
         temperature: float = 0.7,
-        language: str = "auto"
+        language: str = "auto",
+        stop: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Generate response using local model
         """
+        started = time.perf_counter()
         try:
             payload = {
                 "model": model,
@@ -204,29 +295,51 @@ class LocalModelClient:
                     "num_predict": max_tokens
                 }
             }
+            if stop:
+                payload["options"]["stop"] = stop
             
-            response = requests.post(
+            call = {
+                "prompt": prompt, "model": model, "max_tokens": max_tokens,
+                "temperature": temperature, "language": language, "stop": stop
+            }
+            response = _post(
+                self.cassette, "local", call,
                 f"{self.base_url}/api/generate",
-                headers=self.headers,
-                json=payload,
-                timeout=60
+                self.headers,
+                payload,
+                60
             )
             
             if response.status_code == 200:
                 result = response.json()
-                generated_text = result.get("response", "")
+                generated_text, stopped = _apply_stop(result.get("response", ""), stop)
+                
+                usage = build_usage(self.token_counter, prompt, generated_text, started, time.perf_counter())
+                # Prefer the exact counts Ollama reports from the model's own tokenizer
+                if "prompt_eval_count" in result and "eval_count" in result:
+                    usage["prompt_tokens"] = result["prompt_eval_count"]
+                    usage["completion_tokens"] = result["eval_count"]
+                    usage["total_tokens"] = result["prompt_eval_count"] + result["eval_count"]
+                    usage["tokenizer"] = "ollama"
+                    if result.get("eval_duration"):
+                        usage["tokens_per_second"] = result["eval_count"] / (result["eval_duration"] / 1e9)
                 
                 return {
                     "success": True,
                     "response": generated_text,
                     "model": model,
                     "language": language,
-                    "tokens_used": len(generated_text.split())
+                    "tokens_used": usage["completion_tokens"],
+                    "finish_reason": result.get("done_reason") or _finish_reason(
+                        stopped, usage["completion_tokens"], max_tokens, usage.get("tokenizer") == "ollama"
+                    ),
+                    **usage
                 }
             else:
                 return {
                     "success": False,
                     "error": f"Local API Error: {response.status_code} - {response.text}",
+                    "status_code": response.status_code,
                     "model": model
                 }
                 
@@ -241,6 +354,8 @@ class LocalModelClient:
         """
         Test if local model is available
         """
+        if self.cassette is not None and self.cassette.replaying:
+            return True
         try:
             response = requests.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
@@ -250,25 +365,36 @@ class LocalModelClient:
 class DifyClient:
     """Client for Dify.ai platform"""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        token_counter: Optional[TokenCounter] = None,
+        cassette: Optional[Cassette] = None
+    ):
         self.api_key = api_key or Config.DIFY_API_KEY
         self.base_url = base_url or Config.MODELS["dify"]["api_url"]
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.token_counter = token_counter or get_token_counter()
+        self.cassette = cassette or get_cassette()  # Records or replays traffic when set
     
     def generate_response(
         self, 
         prompt: str, 
         workflow_id: str = None,
-        max_tokens: int = 200,
+        max_tokens: int = Config.MAX_TOKENS,
         temperature: float = 0.7,
-        language: str = "auto"
+        language: str = "auto",
+        stop: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
-        Generate response using Dify.ai workflow
+        Generate response using Dify.ai workflow. The workflow owns its model
+        settings, so stop sequences are applied to the answer locally.
         """
+        started = time.perf_counter()
         try:
             workflow_id = workflow_id or Config.MODELS["dify"]["workflow_id"]
             
@@ -281,28 +407,38 @@ class DifyClient:
                 "user": "indic_sahayak_user"
             }
             
-            response = requests.post(
+            call = {
+                "prompt": prompt, "workflow_id": workflow_id, "max_tokens": max_tokens,
+                "temperature": temperature, "language": language, "stop": stop
+            }
+            response = _post(
+                self.cassette, "dify", call,
                 f"{self.base_url}/workflows/run",
-                headers=self.headers,
-                json=payload,
-                timeout=Config.MODELS["dify"]["timeout"]
+                self.headers,
+                payload,
+                Config.MODELS["dify"]["timeout"]
             )
             
             if response.status_code == 200:
                 result = response.json()
                 generated_text = result.get("data", {}).get("outputs", {}).get("answer", "")
+                generated_text, _ = _apply_stop(generated_text, stop)
                 
+                usage = build_usage(self.token_counter, prompt, generated_text, started, time.perf_counter())
                 return {
                     "success": True,
                     "response": generated_text,
                     "model": "dify_workflow",
                     "language": language,
-                    "tokens_used": len(generated_text.split())
+                    "tokens_used": usage["completion_tokens"],
+                    "finish_reason": "stop",  # The workflow does not cap its answer at max_tokens
+                    **usage
                 }
             else:
                 return {
                     "success": False,
                     "error": f"Dify API Error: {response.status_code} - {response.text}",
+                    "status_code": response.status_code,
                     "model": "dify_workflow"
                 }
                 
@@ -317,6 +453,8 @@ class DifyClient:
         """
         Test if Dify connection is working
         """
+        if self.cassette is not None and self.cassette.replaying:
+            return True
         try:
             response = requests.get(
                 f"{self.base_url}/workflows",
@@ -326,3 +464,10 @@ class DifyClient:
             return response.status_code == 200
         except:
             return False
+
+CLIENT_CLASSES = {"huggingface": HuggingFaceClient, "local": LocalModelClient, "dify": DifyClient}
+
+def create_clients(methods: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """One client per method, by default for every backend in Config.configured_methods()"""
+    methods = Config.configured_methods() if methods is None else methods
+    return {method: CLIENT_CLASSES[method]() for method in methods}
@@ -3,16 +3,40 @@
 IndicSahayak - AI Assistant for Indic Languages
 A multilingual AI assistant specializing in Hindi and Telugu languages
 Built with open-source LLMs and frameworks
+
+Streamlit and pandas are imported only by the UI code paths, so library
+and CLI users do not pay for them at import time.
 """
 
-import streamlit as st
-import requests
 import json
 import time
-from datetime import datetime
-import pandas as pd
-from typing import Dict, List, Optional
+import re
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
 import os
+from config import Config
+from conversation_memory import ConversationMemory
+from transliteration import detect_script, get_transliterator
+from generation_budget import get_generation_budget
+from response_cache import get_response_cache
+from text_analysis import AnalyzedText, analyze_text
+from token_counter import get_token_counter
+
+# "transliterate <text>" / "romanize <text>", optionally ending in "to Hindi|Telugu"
+TRANSLITERATION_REQUEST = re.compile(
+    r"^\s*(?:please\s+)?(?:transliterate|romani[sz]e)\b\s*:?\s*(?P<text>.+?)"
+    r"(?:\s+(?:to|into|in)\s+(?P<target>hindi|telugu|devanagari|roman|english))?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+# Latin letters left after converting to script mean the tables could not read the input
+LATIN_LETTER = re.compile("[A-Za-z\u00C0-\u024F\u1E00-\u1EFF]")
+
+
+@lru_cache(maxsize=None)
+def _with_roman(text: str) -> str:
+    """Canned reply followed by its Roman transliteration"""
+    return f"{text} ({get_transliterator(Config.TRANSLITERATION_SCHEME).to_roman(text)})"
 
 class IndicSahayak:
     """
@@ -20,21 +44,49 @@ class IndicSahayak:
     Supports multiple deployment methods: Hugging Face API, local models, etc.
     """
     
-    def __init__(self):
+    def __init__(self, clients: Optional[Dict[str, object]] = None):
         self.name = "IndicSahayak"
+        # Optional backend clients keyed by method ("huggingface", "local", "dify").
+        # Methods without a client keep using the rule-based responses.
+        self.clients = clients or {}
         self.supported_languages = ["Hindi", "Telugu", "English"]
         self.current_language = "Hindi"
-        self.conversation_history = []
-        self.user_feedback = []
-        
-        # System prompt for the AI assistant
-        self.system_prompt = self._get_system_prompt()
-        
-    def _get_system_prompt(self) -> str:
+        self.conversation_history = ConversationMemory(spill=False)  # Bounded; not per session
+        self.generation_budget = get_generation_budget()  # max_new_tokens and stops per intent/language
+        self.response_cache = get_response_cache()  # Model replies by normalized query; warm across restarts
+        self._feedback_collector = None
+    
+    @property
+    def feedback_collector(self):
+        """
+        Process-wide feedback store, shared with every other assistant and the API
+        """
+        if self._feedback_collector is None:
+            from feedback_system import get_feedback_collector
+            self._feedback_collector = get_feedback_collector()
+        return self._feedback_collector
+    
+    @property
+    def feedback_version(self) -> int:
+        """
+        Changes whenever feedback is added, so derived views can be memoized
+        """
+        return self.feedback_collector.version
+    
+    @property
+    def system_prompt(self) -> str:
+        """
+        System prompt for the AI assistant, built on first use
+        """
+        return self._get_system_prompt()
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_system_prompt() -> str:
         """
         Comprehensive system prompt designed for Indic language support
         """
-        return """
+        prompt = """
 You are IndicSahayak (इंडिक सहायक / ఇండిక్ సహాయక), an AI assistant specialized in helping users with Hindi and Telugu languages. You are knowledgeable, helpful, and culturally aware.
 
 CORE IDENTITY:
@@ -104,32 +156,114 @@ Telugu: "నమస్కారం! నేను మీకు ఎలా సహా
 
 Remember: You are not just a translator, but a cultural bridge and learning companion for Hindi and Telugu speakers.
 """
+        if Config.APPEND_TRANSLITERATION:
+            # Romanization is added locally after generation, so the model need not spend tokens on it
+            prompt = prompt.replace(
+                "- Provide transliterations when helpful (Roman script for Hindi/Telugu)",
+                "- Do not add Roman transliterations; they are added automatically"
+            )
+            prompt = re.sub(r" \((?:Namaste|Namaskaram)[^)]*\)", "", prompt)
+        return prompt
 
-    def detect_language(self, text: str) -> str:
+    def detect_language(self, text: Union[str, AnalyzedText]) -> str:
         """
-        Simple language detection based on script
+        Simple language detection based on script: Devanagari, then Telugu, else English
         """
-        if any('\u0900' <= char <= '\u097F' for char in text):  # Devanagari
-            return "Hindi"
-        elif any('\u0C00' <= char <= '\u0C7F' for char in text):  # Telugu
-            return "Telugu"
-        else:
-            return "English"
+        return analyze_text(text).language
     
     def get_response(self, user_input: str, method: str = "huggingface") -> str:
         """
         Get response from the AI assistant using different methods
         """
-        detected_lang = self.detect_language(user_input)
+        # Normalize, fold and classify the input once; every stage below reuses it
+        analyzed = analyze_text(user_input)
+        local = self._get_transliteration_response(analyzed)
+        if local is not None:
+            return local
         
-        if method == "huggingface":
-            return self._get_huggingface_response(user_input, detected_lang)
+        detected_lang = analyzed.language
+        
+        if method in self.clients:
+            return self._get_client_response(method, analyzed, detected_lang)
+        elif method == "huggingface":
+            return self._get_huggingface_response(analyzed, detected_lang)
         elif method == "local":
-            return self._get_local_response(user_input, detected_lang)
+            return self._get_local_response(analyzed, detected_lang)
         else:
-            return self._get_fallback_response(user_input, detected_lang)
+            return self._get_fallback_response(analyzed, detected_lang)
+    
+    def warm_response(self, user_input: str, method: str = "huggingface") -> bool:
+        """
+        Answer a query to fill the response cache; True only if a model reply is now cached
+        """
+        self.get_response(user_input, method)
+        return ("chat", method, analyze_text(user_input).key) in self.response_cache
+    
+    def _get_transliteration_response(self, user_input: Union[str, AnalyzedText]) -> Optional[str]:
+        """
+        Answer "transliterate ..." requests with the local tables instead of a model call
+        """
+        match = TRANSLITERATION_REQUEST.match(analyze_text(user_input).text)
+        if not match:
+            return None
+        text = match.group("text").strip().strip("\"'“”")
+        target = (match.group("target") or "").lower()
+        transliterator = get_transliterator(Config.TRANSLITERATION_SCHEME)
+        if detect_script(text):
+            return transliterator.to_roman(text)
+        scripts = {"hindi": "Devanagari", "devanagari": "Devanagari", "telugu": "Telugu"}
+        if target not in scripts:
+            return None
+        converted = transliterator.to_script(text, scripts[target])
+        # Half-converted output is worse than letting the model answer
+        return None if LATIN_LETTER.search(converted) else converted
+    
+    def add_transliteration(self, response: str) -> str:
+        """
+        Append a Roman transliteration to a reply containing Hindi or Telugu script
+        """
+        if not detect_script(response):
+            return response
+        return f"{response}\n\n({get_transliterator(Config.TRANSLITERATION_SCHEME).to_roman(response)})"
+    
+    def build_prompt(self, user_input: str) -> str:
+        """
+        Build the full model prompt for a user turn
+        """
+        return f"{self.system_prompt}\n\nUser: {user_input}\nAssistant:"
     
-    def _get_huggingface_response(self, user_input: str, language: str) -> str:
+    def plan_generation(self, analyzed: AnalyzedText, language: str, token_counter=None) -> Dict[str, object]:
+        """
+        Generation budget for a user turn. Translations scale with the user's
+        text in the prompt; the fixed system prompt is not part of what is translated.
+        """
+        counter = token_counter or get_token_counter()
+        return self.generation_budget.plan(analyzed, language, input_tokens=counter.count(analyzed.text))
+    
+    def _get_client_response(self, method: str, user_input: Union[str, AnalyzedText], language: str) -> str:
+        """
+        Get response from an injected backend client, falling back to rules on failure
+        """
+        analyzed = analyze_text(user_input)
+        key = ("chat", method, analyzed.key)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+        client = self.clients[method]
+        plan = self.plan_generation(analyzed, language, getattr(client, "token_counter", None))
+        result = client.generate_response(
+            self.build_prompt(analyzed.text), language=language, max_tokens=plan["max_tokens"], stop=plan["stop"]
+        )
+        self.generation_budget.observe_result(plan, result)
+        if result.get("success") and result.get("response"):
+            response = result["response"]
+            if Config.APPEND_TRANSLITERATION:
+                response = self.add_transliteration(response)
+            self.response_cache.put(key, response)
+            return response
+        return self._get_fallback_response(analyzed, language)
+    
+    def _get_huggingface_response(self, user_input: Union[str, AnalyzedText], language: str) -> str:
         """
         Get response using Hugging Face Inference API with open-source models
         """
@@ -145,10 +279,13 @@ Remember: You are not just a translator, but a cultural bridge and learning comp
                 "Content-Type": "application/json"
             }
             
+            analyzed = analyze_text(user_input)
+            plan = self.plan_generation(analyzed, language)
             payload = {
-                "inputs": f"{self.system_prompt}\n\nUser: {user_input}\nAssistant:",
+                "inputs": self.build_prompt(analyzed.text),
                 "parameters": {
-                    "max_new_tokens": 200,
+                    "max_new_tokens": plan["max_tokens"],
+                    "stop": plan["stop"],
                     "temperature": 0.7,
                     "return_full_text": False
                 }
@@ -156,109 +293,159 @@ Remember: You are not just a translator, but a cultural bridge and learning comp
             
             # This is a placeholder - actual implementation would make the API call
             # For now, we'll return a structured response
-            return self._generate_structured_response(user_input, language)
+            return self._generate_structured_response(analyzed, language)
             
         except Exception as e:
             return f"क्षमा करें, तकनीकी समस्या है। कृपया पुनः प्रयास करें। (Sorry, there's a technical issue. Please try again.)"
     
-    def _get_local_response(self, user_input: str, language: str) -> str:
+    def _get_local_response(self, user_input: Union[str, AnalyzedText], language: str) -> str:
         """
         Get response using local model (Ollama, etc.)
         """
         # Placeholder for local model integration
         return self._generate_structured_response(user_input, language)
     
-    def _get_fallback_response(self, user_input: str, language: str) -> str:
+    def _get_fallback_response(self, user_input: Union[str, AnalyzedText], language: str) -> str:
         """
         Fallback response when other methods fail
         """
         return self._generate_structured_response(user_input, language)
     
-    def _generate_structured_response(self, user_input: str, language: str) -> str:
+    def _generate_structured_response(self, user_input: Union[str, AnalyzedText], language: str) -> str:
         """
         Generate a structured response based on the input
         """
         # Simple rule-based responses for demonstration
         # In a real implementation, this would be replaced by actual LLM inference
+        # Keywords are matched against the casefolded text, computed once per request
+        analyzed = analyze_text(user_input)
         
         if language == "Hindi":
-            if "नमस्ते" in user_input or "hello" in user_input.lower():
-                return "नमस्ते! मैं IndicSahayak हूं। मैं आपकी कैसे मदद कर सकता हूं? (Namaste! Main IndicSahayak hoon. Main aapki kaise madad kar sakta hoon?)"
-            elif "अंग्रेजी" in user_input or "english" in user_input.lower():
+            if analyzed.contains("नमस्ते", "hello"):
+                return _with_roman("नमस्ते! मैं IndicSahayak हूं। मैं आपकी कैसे मदद कर सकता हूं?")
+            elif analyzed.contains("अंग्रेजी", "english"):
                 return "हां, मैं अंग्रेजी में भी बात कर सकता हूं। आप किस भाषा में बात करना चाहते हैं? (Yes, I can also speak in English. Which language would you like to use?)"
             else:
                 return f"आपका प्रश्न समझ गया। मैं आपकी मदद करने की कोशिश करूंगा। (I understand your question. I'll try to help you.)"
         
         elif language == "Telugu":
-            if "నమస్కారం" in user_input or "hello" in user_input.lower():
-                return "నమస్కారం! నేను ఇండిక్ సహాయక్. నేను మీకు ఎలా సహాయం చేయగలను? (Namaskaram! Nenu IndicSahayak. Nenu meeku ela sahayam cheyagalanu?)"
-            elif "ఇంగ్లీష్" in user_input or "english" in user_input.lower():
+            if analyzed.contains("నమస్కారం", "hello"):
+                return _with_roman("నమస్కారం! నేను ఇండిక్ సహాయక్. నేను మీకు ఎలా సహాయం చేయగలను?")
+            elif analyzed.contains("ఇంగ్లీష్", "english"):
                 return "అవును, నేను ఇంగ్లీష్ లో కూడా మాట్లాడగలను. మీరు ఏ భాషలో మాట్లాడాలనుకుంటున్నారు? (Yes, I can also speak in English. Which language would you like to use?)"
             else:
                 return f"మీ ప్రశ్న అర్థమైంది. నేను మీకు సహాయం చేయడానికి ప్రయత్నిస్తాను. (I understand your question. I'll try to help you.)"
         
         else:  # English
-            if "hello" in user_input.lower() or "hi" in user_input.lower():
+            if analyzed.contains("hello", "hi"):
                 return "Hello! I'm IndicSahayak, your AI assistant for Hindi and Telugu languages. How can I help you today?"
-            elif "hindi" in user_input.lower():
+            elif analyzed.contains("hindi"):
                 return "Yes, I can help you with Hindi! I can assist with translations, grammar, vocabulary, and cultural understanding. What would you like to know?"
-            elif "telugu" in user_input.lower():
+            elif analyzed.contains("telugu"):
                 return "Yes, I can help you with Telugu! I can assist with translations, grammar, vocabulary, and cultural understanding. What would you like to know?"
             else:
                 return "I'm here to help you with Hindi and Telugu languages. Feel free to ask me anything about language learning, translation, or cultural topics!"
     
-    def add_feedback(self, user_id: str, rating: int, comments: str, language_used: str):
+    def add_feedback(
+        self, user_id: str, rating: int, comments: str, language_used: str,
+        response_latency_ms: Optional[float] = None
+    ):
         """
-        Add user feedback to the collection
+        Add user feedback to the shared feedback store. The sidebar asks for a
+        single rating, so every aspect score is that rating rather than the
+        collector's defaults of 5, and only 4-5 stars count as a recommendation.
+        response_latency_ms is how long the rated reply took, if known.
         """
-        feedback = {
-            "user_id": user_id,
-            "timestamp": datetime.now().isoformat(),
-            "rating": rating,
-            "comments": comments,
-            "language_used": language_used
-        }
-        self.user_feedback.append(feedback)
+        return self.feedback_collector.create_feedback(
+            user_id=user_id,
+            rating=rating,
+            language_used=language_used,
+            interaction_type="general",
+            comments=comments,
+            response_quality=rating,
+            cultural_sensitivity=rating,
+            language_accuracy=rating,
+            helpfulness=rating,
+            response_speed=rating,
+            user_satisfaction=rating,
+            would_recommend=rating >= 4,
+            response_latency_ms=response_latency_ms
+        )
     
     def get_feedback_summary(self) -> Dict:
         """
-        Get summary of user feedback
+        Get summary of user feedback from the store's running totals
         """
-        if not self.user_feedback:
-            return {"total_feedback": 0, "average_rating": 0}
-        
-        ratings = [f["rating"] for f in self.user_feedback]
-        return {
-            "total_feedback": len(self.user_feedback),
-            "average_rating": sum(ratings) / len(ratings),
-            "language_breakdown": self._get_language_breakdown()
+        return self.feedback_collector.get_summary()
+
+# Sidebar "AI Method" labels -> get_response methods
+UI_METHODS = {"Hugging Face API": "huggingface", "Local Model": "local", "Fallback": "fallback"}
+
+def create_configured_assistant() -> IndicSahayak:
+    """
+    Assistant with a client for every configured backend (see
+    Config.configured_methods), so chat replies reach the model and its cache.
+    Each client goes through its backend's shared scheduler, like /translate.
+    """
+    methods = Config.configured_methods()
+    if not methods:
+        return IndicSahayak()
+    from huggingface_client import create_clients
+    from scheduler import scheduled
+    return IndicSahayak({method: scheduled(client, method) for method, client in create_clients(methods).items()})
+
+def _create_assistant() -> IndicSahayak:
+    return create_configured_assistant()
+
+def _build_recent_feedback_frame(feedback_version: int, limit: int = 5):
+    import pandas as pd
+    records = get_shared_assistant().feedback_collector.get_latest_feedback(limit)
+    # Every session sees this table, so it leaves out who wrote each entry and what they wrote
+    return pd.DataFrame([
+        {
+            "timestamp": f.timestamp,
+            "rating": f.rating,
+            "language_used": f.language_used
         }
-    
-    def _get_language_breakdown(self) -> Dict:
-        """
-        Get breakdown of feedback by language
-        """
-        lang_counts = {}
-        for feedback in self.user_feedback:
-            lang = feedback["language_used"]
-            lang_counts[lang] = lang_counts.get(lang, 0) + 1
-        return lang_counts
+        for f in records
+    ])
+
+@lru_cache(maxsize=None)
+def _streamlit_cached(func, kind: str):
+    """
+    Wrap func with Streamlit's resource or data cache on first use
+    """
+    import streamlit as st
+    if kind == "resource":
+        return st.cache_resource(func)
+    return st.cache_data(max_entries=32)(func)
+
+def get_shared_assistant() -> IndicSahayak:
+    """
+    One assistant per process, shared by every session and rerun
+    """
+    return _streamlit_cached(_create_assistant, "resource")()
+
+def get_recent_feedback_frame(feedback_version: int, limit: int = 5):
+    """
+    DataFrame of the latest feedback; rebuilt only when the version changes
+    """
+    return _streamlit_cached(_build_recent_feedback_frame, "data")(feedback_version, limit)
 
 def main():
     """
     Main Streamlit application
     """
+    import streamlit as st
+    
     st.set_page_config(
         page_title="IndicSahayak - AI Assistant for Indic Languages",
         page_icon="🇮🇳",
         layout="wide"
     )
     
-    # Initialize the assistant
-    if "assistant" not in st.session_state:
-        st.session_state.assistant = IndicSahayak()
-    
-    assistant = st.session_state.assistant
+    # Shared across sessions; see get_shared_assistant
+    assistant = get_shared_assistant()
     
     # Header
     st.markdown("""
@@ -285,7 +472,7 @@ def main():
         # Method selection
         method = st.selectbox(
             "AI Method",
-            ["Hugging Face API", "Local Model", "Fallback"],
+            list(UI_METHODS),
             index=2
         )
         
@@ -299,30 +486,45 @@ def main():
     # Main chat interface
     st.header("💬 Chat with IndicSahayak")
     
-    # Chat history
+    # Chat history: recent turns in memory, all turns in the shared session store.
+    # The session id rides in the URL so any replica (or a restarted one) can resume it.
     if "messages" not in st.session_state:
-        st.session_state.messages = []
+        from session_store import get_session_store
+        session_id = st.query_params.get("session")
+        if not session_id:
+            session_id = st.query_params["session"] = uuid.uuid4().hex
+        st.session_state.messages = ConversationMemory(session_id, store=get_session_store())
+    if "history_window" not in st.session_state:
+        st.session_state.history_window = Config.CHAT_HISTORY_PAGE_SIZE
     
-    # Display chat history
-    for message in st.session_state.messages:
+    # Display only the latest window of chat history so reruns stay cheap
+    messages = st.session_state.messages
+    hidden = messages.available() - st.session_state.history_window
+    if hidden > 0:
+        if st.button(f"⬆️ Load older messages ({hidden} hidden)"):
+            st.session_state.history_window += Config.CHAT_HISTORY_PAGE_SIZE
+            st.rerun()
+    for message in messages.window(st.session_state.history_window):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
     # Chat input
     if prompt := st.chat_input("Type your message here..."):
         # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.messages.append("user", prompt)
         with st.chat_message("user"):
             st.markdown(prompt)
         
         # Get assistant response
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
-                response = assistant.get_response(prompt, method.lower().replace(" ", ""))
+                started = time.perf_counter()
+                response = assistant.get_response(prompt, UI_METHODS[method])
+                st.session_state.last_response_latency_ms = (time.perf_counter() - started) * 1000
                 st.markdown(response)
         
         # Add assistant response to chat history
-        st.session_state.messages.append({"role": "assistant", "content": response})
+        st.session_state.messages.append("assistant", response)
     
     # Feedback collection
     st.markdown("---")
@@ -340,18 +542,21 @@ def main():
     
     if st.button("Submit Feedback"):
         if comments.strip():
-            assistant.add_feedback(user_id or "anonymous", rating, comments, language_used)
+            assistant.add_feedback(
+                user_id or "anonymous", rating, comments, language_used,
+                st.session_state.get("last_response_latency_ms")
+            )
             st.success("Thank you for your feedback! 🙏")
         else:
             st.warning("Please provide some comments.")
     
     # Display recent feedback
-    if assistant.user_feedback:
+    if assistant.get_feedback_summary()["total_feedback"] > 0:
         st.markdown("---")
         st.header("📈 Recent Feedback")
         
-        # Convert to DataFrame for display
-        df = pd.DataFrame(assistant.user_feedback[-5:])  # Show last 5
+        # Memoized on the feedback version, so unchanged reruns reuse the frame
+        df = get_recent_feedback_frame(assistant.feedback_version)  # Show last 5
         st.dataframe(df, use_container_width=True)
 
 if __name__ == "__main__":
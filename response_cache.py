@@ -0,0 +1,159 @@
+"""
+Response cache for IndicSahayak
+LRU cache of model replies and translations keyed by normalized query, with
+a TTL. The cache is snapshotted to disk on shutdown and restored on boot, so
+a deploy or restart does not start cold.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from config import Config
+from text_analysis import AnalyzedText, analyze_text
+
+SNAPSHOT_VERSION = 1
+
+
+def normalize_query(text: Union[str, AnalyzedText]) -> str:
+    """Cache key form of a query: NFC, casefolded, single-spaced, no trailing punctuation"""
+    return analyze_text(text).key
+
+
+class ResponseCache:
+    """Thread-safe LRU of JSON-serializable values keyed by string tuples"""
+
+    def __init__(
+        self,
+        max_entries: int = Config.RESPONSE_CACHE_SIZE,
+        ttl: float = Config.RESPONSE_CACHE_TTL,
+        snapshot_path: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        # key -> (value, created wall-clock time), least recently used first
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.restored = 0
+
+    def get(self, key: Tuple[str, ...]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl and time.time() - entry[1] > self.ttl):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, ...], value: Any, created: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, created or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: Tuple[str, ...]) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and not (self.ttl and time.time() - entry[1] > self.ttl)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self, path: Optional[str] = None) -> int:
+        """Atomically write live entries to disk in LRU order; returns the count"""
+        path = path or self.snapshot_path
+        if not path:
+            return 0
+        now = time.time()
+        with self._lock:
+            entries = [
+                [list(key), value, created] for key, (value, created) in self._entries.items()
+                if not (self.ttl and now - created > self.ttl)
+            ]
+        if not entries and not os.path.exists(path):
+            return 0  # Nothing to keep; do not leave an empty snapshot behind
+        tmp_path = None
+        try:
+            # Per-process temp file: API workers share the snapshot path and all save at exit
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"version": SNAPSHOT_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing response cache snapshot: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return 0
+        return len(entries)
+
+    def restore(self, path: Optional[str] = None) -> int:
+        """Load a snapshot, skipping expired entries; returns the count loaded"""
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading response cache snapshot: {e}")
+            return 0
+        if data.get("version") != SNAPSHOT_VERSION:
+            return 0
+        now = time.time()
+        loaded = 0
+        for key, value, created in data.get("entries", []):
+            if self.ttl and now - created > self.ttl:
+                continue
+            self.put(tuple(key), value, created)
+            loaded += 1
+        self.restored += loaded
+        return loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "restored": self.restored
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache, restored from Config.RESPONSE_CACHE_SNAPSHOT and saved at exit"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(snapshot_path=Config.RESPONSE_CACHE_SNAPSHOT or None)
+            _cache.restore()
+            atexit.register(_cache.snapshot)
+        return _cache
+
+
+def cached_translate(translator, text: str, source_lang: str, target_lang: str) -> Dict[str, Any]:
+    """translator.translate_text through the process-wide cache; only successes are cached"""
+    cache = get_response_cache()
+    key = ("translate", source_lang, target_lang, normalize_query(text))
+    cached = cache.get(key)
+    if cached is not None:
+        return dict(cached, cached=True)
+    result = translator.translate_text(text, source_lang, target_lang)
+    if result.get("success"):
+        cache.put(key, {k: v for k, v in result.items() if k in ("success", "response", "model", "language")})
+    return result
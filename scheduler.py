@@ -0,0 +1,315 @@
+"""
+Outbound admission control for IndicSahayak
+Per-backend token-bucket rate limiting with a bounded priority queue
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+from config import Config
+
+# Lower value runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens per second"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now < self.paused_until:
+            self.updated = now
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token; returns 0 on success or the seconds until one is available"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def estimate_wait(self, tokens_ahead: int) -> float:
+        """Seconds until ``tokens_ahead + 1`` tokens will have been available"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            pause = max(self.paused_until - now, 0.0)
+            deficit = tokens_ahead + 1 - self.tokens
+            return pause + max(deficit, 0) / self.rate
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens, e.g. after the backend answered 429"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+class _QueuedRequest:
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, priority: int, deadline: float):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+        self.future: Future = Future()
+
+
+class BackendScheduler:
+    """
+    Admission control for a single backend.
+    Requests wait in a bounded priority queue and are dispatched by a small
+    worker pool as the token bucket allows. A request is rejected up front
+    when the queue is full or its estimated wait would pass its deadline,
+    and again at dispatch time if the deadline has already expired.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        max_queue: int = 100,
+        concurrency: int = 4,
+        default_deadline: float = 10.0,
+        window: int = 1000
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_queue = max_queue
+        self.default_deadline = default_deadline
+        self._queue: List[tuple] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Metrics
+        self._wait_times: List[float] = []
+        self._window = window
+        self.metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected_queue_full": 0,
+            "rejected_deadline": 0,
+            "expired_in_queue": 0,
+            "rate_limited": 0,
+            "max_queue_depth": 0
+        }
+
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"scheduler-{name}-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        func: Callable[..., Dict[str, Any]],
+        *args,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Future:
+        """
+        Queue a client call. The returned future resolves to the client's
+        result dict, or to a rejection dict when the request is shed.
+        """
+        deadline = self.default_deadline if deadline is None else deadline
+        request = _QueuedRequest(func, args, kwargs, priority, time.monotonic() + deadline)
+
+        with self._cond:
+            self.metrics["submitted"] += 1
+            if self._closed:
+                request.future.set_result(self._rejection("Scheduler is shut down"))
+                return request.future
+            if len(self._queue) >= self.max_queue:
+                # Make room by shedding the lowest-priority queued request, if it ranks below this one
+                worst = max(self._queue)
+                self.metrics["rejected_queue_full"] += 1
+                if worst[0] <= priority:
+                    request.future.set_result(self._rejection("Queue is full"))
+                    return request.future
+                self._queue.remove(worst)
+                heapq.heapify(self._queue)
+                worst[2].future.set_result(self._rejection("Evicted by higher-priority request"))
+
+            ahead = sum(1 for item in self._queue if item[0] <= priority)
+            estimated_wait = self.bucket.estimate_wait(ahead)
+            if estimated_wait > deadline:
+                self.metrics["rejected_deadline"] += 1
+                request.future.set_result(
+                    self._rejection(f"Estimated queue wait {estimated_wait:.1f}s exceeds deadline {deadline:.1f}s")
+                )
+                return request.future
+
+            heapq.heappush(self._queue, (priority, next(self._counter), request))
+            self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], len(self._queue))
+            self._cond.notify()
+        return request.future
+
+    def call(self, func: Callable[..., Dict[str, Any]], *args, **kwargs) -> Dict[str, Any]:
+        """Submit and wait for the result"""
+        return self.submit(func, *args, **kwargs).result()
+
+    def _rejection(self, reason: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"Rejected by {self.name} scheduler: {reason}",
+            "rejected": True,
+            "model": self.name
+        }
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                _, _, request = heapq.heappop(self._queue)
+
+            # Wait for a token, giving up once the deadline passes
+            while True:
+                wait = self.bucket.try_acquire()
+                if wait == 0:
+                    break
+                if time.monotonic() + wait > request.deadline:
+                    wait = None
+                    break
+                time.sleep(wait)
+
+            now = time.monotonic()
+            self._record_wait(now - request.enqueued)
+            if wait is None or now > request.deadline:
+                with self._cond:
+                    self.metrics["expired_in_queue"] += 1
+                request.future.set_result(self._rejection("Deadline passed while queued"))
+                continue
+
+            try:
+                result = request.func(*request.args, **request.kwargs)
+            except Exception as e:
+                result = {"success": False, "error": f"Unexpected error: {str(e)}", "model": self.name}
+            if isinstance(result, dict) and result.get("status_code") == 429:
+                # Backend says we are over its limit: back off the whole bucket
+                with self._cond:
+                    self.metrics["rate_limited"] += 1
+                self.bucket.pause(Config.SCHEDULER_RATE_LIMIT_BACKOFF)
+            with self._cond:
+                self.metrics["completed"] += 1
+            request.future.set_result(result)
+
+    def _record_wait(self, seconds: float):
+        with self._cond:
+            self._wait_times.append(seconds)
+            if len(self._wait_times) > self._window:
+                del self._wait_times[:len(self._wait_times) - self._window]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, rejection counts and recent queue wait statistics"""
+        with self._cond:
+            waits = sorted(self._wait_times)
+            metrics = dict(self.metrics)
+            metrics["queue_depth"] = len(self._queue)
+        metrics["wait_time_avg"] = sum(waits) / len(waits) if waits else 0.0
+        metrics["wait_time_p95"] = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        metrics["wait_time_max"] = waits[-1] if waits else 0.0
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work; queued requests are still drained"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+class ScheduledClient:
+    """
+    Wraps a client from huggingface_client.py so that every call goes
+    through its backend's scheduler. Chat defaults to interactive priority
+    and translation to bulk priority.
+    """
+
+    def __init__(self, client: Any, scheduler: BackendScheduler):
+        self.client = client
+        self.scheduler = scheduler
+
+    def generate_response(
+        self,
+        *args,
+        priority: int = PRIORITY_INTERACTIVE,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return self.scheduler.call(
+            self.client.generate_response, *args, priority=priority, deadline=deadline, **kwargs
+        )
+
+    def translate_text(
+        self,
+        *args,
+        priority: int = PRIORITY_BULK,
+        deadline: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        return self.scheduler.call(
+            self.client.translate_text, *args, priority=priority, deadline=deadline, **kwargs
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything else (test_connection, get_available_models, ...) passes through
+        return getattr(self.client, name)
+
+
+_schedulers: Dict[str, BackendScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(backend: str) -> BackendScheduler:
+    """Get the process-wide scheduler for a backend, configured from Config.RATE_LIMITS"""
+    with _schedulers_lock:
+        if backend not in _schedulers:
+            limits = Config.RATE_LIMITS.get(backend, Config.RATE_LIMITS["default"])
+            _schedulers[backend] = BackendScheduler(
+                backend,
+                rate=limits["rate"],
+                burst=limits["burst"],
+                max_queue=limits["max_queue"],
+                concurrency=limits["concurrency"],
+                default_deadline=Config.SCHEDULER_DEFAULT_DEADLINE
+            )
+        return _schedulers[backend]
+
+
+def scheduled(client: Any, backend: str) -> ScheduledClient:
+    """Put a client behind the shared scheduler for its backend"""
+    return ScheduledClient(client, get_scheduler(backend))
+
+
+def get_all_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every scheduler created in this process"""
+    with _schedulers_lock:
+        schedulers = dict(_schedulers)
+    return {name: scheduler.get_metrics() for name, scheduler in schedulers.items()}
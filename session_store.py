@@ -0,0 +1,373 @@
+"""
+Shared chat session store for IndicSahayak
+Persists chat turns by session id so any app replica can serve any turn and
+a restart does not lose conversations. Writes are batched behind the caller
+(write-behind) and reads go through an in-memory LRU cache (read-through).
+SQLite is the default backend; others register a URL scheme.
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+
+Message = Dict[str, str]
+
+
+class SessionStore:
+    """
+    Base class for session stores. Subclasses implement the _backend_*
+    methods; batching and caching live here so every backend gets them.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = Config.SESSION_CACHE_SIZE,
+        cache_messages: int = Config.MAX_CHAT_HISTORY,
+        flush_interval: float = Config.SESSION_FLUSH_INTERVAL,
+        flush_batch: int = Config.SESSION_FLUSH_BATCH
+    ):
+        self.cache_size = cache_size
+        self.cache_messages = cache_messages
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self._lock = threading.Lock()
+        # session id -> (backend message count, latest messages), least recently used first
+        self._cache: "OrderedDict[str, Tuple[int, List[Message]]]" = OrderedDict()
+        self._pending: List[Tuple[str, str, str, float]] = []
+        self._pending_counts: Dict[str, int] = {}
+        self._flush_lock = threading.Lock()
+        self._flush_generation = 0  # Bumped when a batch starts and when it lands
+        self._wake = threading.Event()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+
+    # Backend interface
+
+    def _backend_count(self, session_id: str) -> int:
+        raise NotImplementedError
+
+    def _backend_read(self, session_id: str, offset: int, limit: int) -> List[Message]:
+        """Messages [offset, offset + limit) in insertion order"""
+        raise NotImplementedError
+
+    def _backend_write(self, rows: List[Tuple[str, str, str, float]]):
+        """Persist (session_id, role, content, created) rows in one batch"""
+        raise NotImplementedError
+
+    def _backend_delete(self, session_id: str):
+        raise NotImplementedError
+
+    def _backend_top_queries(self, limit: int) -> List[Tuple[str, int]]:
+        """Most frequent user message texts with their counts"""
+        raise NotImplementedError
+
+    # Public API
+
+    def append(self, session_id: str, role: str, content: str):
+        """Record a message; it reaches the backend on the next batch flush"""
+        with self._lock:
+            self._pending.append((session_id, role, content, time.time()))
+            self._pending_counts[session_id] = self._pending_counts.get(session_id, 0) + 1
+            cached = self._cache.get(session_id)
+            if cached is not None:
+                messages = cached[1]
+                messages.append({"role": role, "content": content})
+                del messages[:-self.cache_messages]
+            if len(self._pending) >= self.flush_batch:
+                self._wake.set()
+
+    def _stable_generation(self) -> int:
+        """Flush generation with no batch in flight; waits for one being written"""
+        while True:
+            with self._lock:
+                generation = self._flush_generation
+            if not generation % 2:
+                return generation
+            with self._flush_lock:
+                pass
+
+    def count(self, session_id: str) -> int:
+        """Total messages in a session, including ones not flushed yet"""
+        while True:
+            generation = self._stable_generation()
+            backend_count = self._backend_count(session_id)
+            with self._lock:
+                # A batch landing in between would be counted twice or not at all
+                if self._flush_generation == generation:
+                    return backend_count + self._pending_counts.get(session_id, 0)
+
+    def recent(self, session_id: str, limit: Optional[int] = None) -> List[Message]:
+        """
+        Latest messages of a session. Served from cache when the backend count
+        still matches (one point lookup), so turns written by another replica
+        are picked up on the next read.
+        """
+        limit = self.cache_messages if limit is None else limit
+        while True:
+            generation = self._stable_generation()
+            backend_count = self._backend_count(session_id)
+            with self._lock:
+                if self._flush_generation != generation:
+                    continue  # A batch landed after the count was read; read both again
+                cached = self._cache.get(session_id)
+                if cached is not None and cached[0] == backend_count and limit <= self.cache_messages:
+                    self._cache.move_to_end(session_id)
+                    self.hits += 1
+                    return list(cached[1][-limit:]) if limit else []
+                self.misses += 1
+                pending = [
+                    {"role": role, "content": content}
+                    for sid, role, content, _ in self._pending if sid == session_id
+                ]
+                break
+        fetch = max(limit, self.cache_messages)
+        offset = max(backend_count - fetch, 0)
+        # Only the rows the count covers; later flushes are not in the pending snapshot either
+        messages = self._backend_read(session_id, offset, backend_count - offset) + pending
+        with self._lock:
+            # Turns appended or flushed meanwhile would be missing from this copy
+            if self._flush_generation == generation and self._pending_counts.get(session_id, 0) == len(pending):
+                self._cache[session_id] = (backend_count, messages[-self.cache_messages:])
+                self._cache.move_to_end(session_id)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return messages[-limit:] if limit else []
+
+    def page(self, session_id: str, offset: int, limit: int) -> List[Message]:
+        """Messages [offset, offset + limit) for scrolling back through history"""
+        self.flush()
+        return self._backend_read(session_id, offset, limit)
+
+    def delete(self, session_id: str):
+        self.flush()
+        with self._lock:
+            self._cache.pop(session_id, None)
+        self._backend_delete(session_id)
+
+    def top_queries(self, limit: int) -> List[Tuple[str, int]]:
+        """Most frequent user messages across all sessions, e.g. for cache warming"""
+        self.flush()
+        return self._backend_top_queries(limit)
+
+    def flush(self):
+        """Write every pending message now"""
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._pending)
+                if not rows:
+                    return
+                # Odd while the batch is in flight: readers cannot tell whether the backend has it yet
+                self._flush_generation += 1
+            try:
+                self._backend_write(rows)
+                self.flushes += 1
+                written = True
+            except Exception as e:
+                print(f"Error writing session batch: {e}")
+                written = False
+            with self._lock:
+                if written:
+                    # Messages appended during the write stay pending
+                    del self._pending[:len(rows)]
+                    added: Dict[str, int] = {}
+                    for session_id, *_ in rows:
+                        added[session_id] = added.get(session_id, 0) + 1
+                    for session_id, count in added.items():
+                        remaining = self._pending_counts[session_id] - count
+                        if remaining:
+                            self._pending_counts[session_id] = remaining
+                        else:
+                            del self._pending_counts[session_id]
+                        # Cached counts move forward by what this batch adds
+                        cached = self._cache.get(session_id)
+                        if cached is not None:
+                            self._cache[session_id] = (cached[0] + count, cached[1])
+                self._flush_generation += 1
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+            cached = len(self._cache)
+        return {
+            "cached_sessions": cached,
+            "pending_messages": pending,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "flushes": self.flushes
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local backend, for tests and single-replica setups"""
+
+    def __init__(self, **kwargs):
+        self._sessions: Dict[str, List[Message]] = {}
+        self._data_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _backend_count(self, session_id: str) -> int:
+        with self._data_lock:
+            return len(self._sessions.get(session_id, []))
+
+    def _backend_read(self, session_id: str, offset: int, limit: int) -> List[Message]:
+        with self._data_lock:
+            return list(self._sessions.get(session_id, [])[offset:offset + limit])
+
+    def _backend_write(self, rows: List[Tuple[str, str, str, float]]):
+        with self._data_lock:
+            for session_id, role, content, _ in rows:
+                self._sessions.setdefault(session_id, []).append({"role": role, "content": content})
+
+    def _backend_delete(self, session_id: str):
+        with self._data_lock:
+            self._sessions.pop(session_id, None)
+
+    def _backend_top_queries(self, limit: int) -> List[Tuple[str, int]]:
+        with self._data_lock:
+            counts = Counter(
+                message["content"] for messages in self._sessions.values()
+                for message in messages if message["role"] == "user"
+            )
+        return counts.most_common(limit)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite backend. WAL mode lets replicas sharing the database file read
+    while another writes; each flush is a single transaction.
+    """
+
+    def __init__(self, path: str = "sessions.db", **kwargs):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    message_count INTEGER NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+        super().__init__(**kwargs)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; the writer thread and request threads never share one
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _backend_count(self, session_id: str) -> int:
+        row = self._connection().execute(
+            "SELECT message_count FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _backend_read(self, session_id: str, offset: int, limit: int) -> List[Message]:
+        rows = self._connection().execute(
+            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id LIMIT ? OFFSET ?",
+            (session_id, limit, offset)
+        ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def _backend_write(self, rows: List[Tuple[str, str, str, float]]):
+        counts: Dict[str, List[float]] = {}
+        for session_id, _, _, created in rows:
+            entry = counts.setdefault(session_id, [0, created])
+            entry[0] += 1
+            entry[1] = max(entry[1], created)
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, created) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.executemany(
+                """
+                INSERT INTO sessions (session_id, message_count, updated) VALUES (?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    message_count = message_count + excluded.message_count,
+                    updated = excluded.updated
+                """,
+                [(session_id, count, updated) for session_id, (count, updated) in counts.items()]
+            )
+
+    def _backend_delete(self, session_id: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def _backend_top_queries(self, limit: int) -> List[Tuple[str, int]]:
+        return self._connection().execute(
+            "SELECT content, COUNT(*) AS n FROM messages WHERE role = 'user' "
+            "GROUP BY content ORDER BY n DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+
+# URL scheme -> factory(location, **kwargs)
+SESSION_STORES: Dict[str, Callable[..., SessionStore]] = {
+    "sqlite": lambda location, **kwargs: SQLiteSessionStore(location or "sessions.db", **kwargs),
+    "memory": lambda location, **kwargs: MemorySessionStore(**kwargs),
+}
+
+_stores: Dict[str, SessionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def register_session_store(scheme: str, factory: Callable[..., SessionStore]):
+    """Make a backend available as ``<scheme>://<location>`` in SESSION_STORE_URL"""
+    SESSION_STORES[scheme] = factory
+
+
+def get_session_store(url: Optional[str] = None) -> SessionStore:
+    """Process-wide store for a URL such as sqlite:///path/sessions.db or memory://"""
+    url = url or Config.SESSION_STORE_URL
+    with _stores_lock:
+        store = _stores.get(url)
+        if store is None:
+            scheme, _, location = url.partition("://")
+            factory = SESSION_STORES.get(scheme)
+            if factory is None:
+                raise ValueError(f"Unknown session store: {scheme}")
+            # sqlite:///relative.db and sqlite:////abs/path.db, as in SQLAlchemy URLs
+            store = _stores[url] = factory(location[1:] if location.startswith("/") else location)
+            atexit.register(store.close)
+        return store
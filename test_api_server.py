@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from api_server import AsyncAssistantService, IndicSahayakAPI
+
+
+def _request(app, method, path, payload):
+    messages = []
+    body = json.dumps(payload).encode("utf-8")
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def _service(tmp_path):
+    return AsyncAssistantService(max_concurrency=2, feedback_file=str(tmp_path / "feedback.json"))
+
+
+def test_chat_returns_json(tmp_path):
+    app = IndicSahayakAPI(_service(tmp_path))
+    messages = _request(app, "POST", "/chat", {"message": "hello", "method": "fallback"})
+    assert messages[0]["status"] == 200
+    assert json.loads(messages[1]["body"])["success"] is True
+
+
+def test_failure_before_start_is_a_500(tmp_path):
+    service = _service(tmp_path)
+
+    async def broken_chat(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    service.chat = broken_chat
+    messages = _request(IndicSahayakAPI(service), "POST", "/chat", {"message": "hello"})
+    assert [m["status"] for m in messages if m["type"] == "http.response.start"] == [500]
+
+
+def test_mistyped_chat_fields_are_rejected(tmp_path):
+    app = IndicSahayakAPI(_service(tmp_path))
+    for path, payload in (
+        ("/chat", {"message": 123}),
+        ("/chat", {"message": ["x"]}),
+        ("/chat", {"message": "hello", "method": 1}),
+        ("/chat", {"message": "hello", "session_id": {"id": 1}}),
+        ("/history", {"session_id": 5}),
+    ):
+        messages = _request(app, "POST", path, payload)
+        assert messages[0]["status"] == 400, (path, payload)
+
+
+def test_invalid_feedback_is_rejected_before_it_is_stored(tmp_path):
+    service = _service(tmp_path)
+    app = IndicSahayakAPI(service)
+    valid = {"rating": 4, "language_used": "Hindi", "interaction_type": "general", "comments": "good"}
+    for change in ({"rating": "abc"}, {"rating": 99}, {"rating": True}, {"helpfulness": 0},
+                   {"would_recommend": "yes"}, {"comments": 7}, {"language_used": None}):
+        messages = _request(app, "POST", "/feedback", {**valid, **change})
+        assert messages[0]["status"] == 400, change
+    assert service.feedback_collector.feedback_data == []
+
+    messages = _request(app, "POST", "/feedback", {**valid, "helpfulness": 5, "would_recommend": False})
+    assert messages[0]["status"] == 201
+    assert len(service.feedback_collector.feedback_data) == 1
@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from feedback_system import FeedbackCollector
+from hot_paths import compare
+from indic_sahayak import IndicSahayak
+from load_generator import run_load
+from stub_servers import StubProfile, StubServer
+from synthetic import generate_feedback, generate_queries, write_feedback_file
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_compare_flags_only_regressions_over_the_threshold():
+    results = {"faster": {"min": 1.0}, "slower": {"min": 1.5}, "new": {"min": 2.0}}
+    baseline = {"results": {"faster": {"min": 1.25}, "slower": {"min": 1.0}}}
+    assert compare(results, baseline, threshold=0.2) == ["slower"]
+    assert results["slower"]["change"] == 0.5 and results["faster"]["change"] == pytest.approx(-0.2)
+    assert "change" not in results["new"]
+
+
+def test_synthetic_data_is_seeded(tmp_path):
+    assert generate_queries(5, 4, seed=1) == generate_queries(5, 4, seed=1)
+    path = str(tmp_path / "feedback.json")
+    write_feedback_file(path, 50)
+    assert FeedbackCollector(path).feedback_data == list(generate_feedback(50))
+
+
+def test_stub_server_loads_then_answers_in_the_script_of_the_last_turn():
+    server = StubServer("huggingface", StubProfile(latency="fixed:0", loading_requests=1)).start()
+    try:
+        url = f"{server.base_url}/test-model"
+        payload = {"inputs": "You are IndicSahayak\n\nUser: नमस्ते\nAssistant:"}
+        status, body = _post(url, payload)
+        assert status == 503 and "loading" in body["error"]
+        status, body = _post(url, payload)
+    finally:
+        server.stop()
+    assert status == 200 and body[0]["generated_text"].startswith("नमस्ते")
+
+
+def test_load_generator_completes_every_admitted_request():
+    report = run_load(IndicSahayak(), "fallback", rps=200, duration=0.25, queries=["hello", "नमस्ते"])
+    assert report["sent"] > 0 and report["completed"] == report["sent"]
+    assert report["failed"] == 0 and report["dropped"] == 0
+    assert report["latency_p50_ms"] <= report["latency_p99_ms"] <= report["latency_max_ms"]
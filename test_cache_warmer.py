@@ -0,0 +1,68 @@
+import json
+import threading
+
+import cache_warmer
+from cache_warmer import mine_queries, warm_cache
+from config import Config
+from indic_sahayak import IndicSahayak
+import response_cache
+from response_cache import ResponseCache
+
+
+def test_mine_groups_by_normalized_query(tmp_path):
+    traffic = tmp_path / "traffic.jsonl"
+    lines = (
+        [{"query": "What is Diwali?"}] * 3 + [{"message": "what is  diwali"}] * 2 + ["namaste"]
+        + [{"text": "hello", "source_lang": "English", "target_lang": "Hindi"}] * 4 + [42]
+    )
+    traffic.write_text("\n".join(json.dumps(line) for line in lines) + "\n{torn", encoding='utf-8')
+    items = mine_queries([str(traffic), str(tmp_path / "missing.jsonl")], top_n=2)
+    assert [(item["kind"], item["text"], item["count"]) for item in items] == [
+        ("chat", "What is Diwali?", 5), ("translate", "hello", 4)
+    ]
+
+
+def test_warm_cache_runs_each_kind_through_its_callable():
+    seen = []
+    lock = threading.Lock()
+
+    def chat(text, method):
+        with lock:
+            seen.append(("chat", text, method))
+        return method == "local"  # Only the local backend answers; the other reply is a fallback
+
+    items = [
+        {"kind": "chat", "text": "namaste", "method": None},
+        {"kind": "chat", "text": "diwali", "method": "local"},
+        {"kind": "translate", "text": "hello", "source_lang": "English", "target_lang": "Hindi"},
+    ]
+    stats = warm_cache(items, chat=chat, translate=None, method="huggingface", time_budget=10, workers=2)
+    assert sorted(seen) == [("chat", "diwali", "local"), ("chat", "namaste", "huggingface")]
+    assert stats["warmed"] == 1 and stats["not_cached"] == 1
+    assert stats["skipped"] == 1 and stats["errors"] == 0
+
+
+class EchoClient:
+    def generate_response(self, prompt, language="English", max_tokens=None, stop=None):
+        return {"success": True, "response": "from the model", "usage": {}}
+
+
+def test_only_model_replies_count_as_warmed(monkeypatch):
+    monkeypatch.setattr(Config, "APPEND_TRANSLITERATION", False)
+    assistant = IndicSahayak({"huggingface": EchoClient()})
+    assistant.response_cache = ResponseCache()
+    assert assistant.warm_response("what is diwali", "huggingface")
+    assert not assistant.warm_response("what is diwali", "local")
+
+
+def test_main_uses_only_configured_backends(tmp_path, monkeypatch, capsys):
+    for name in ("HUGGINGFACE_API_KEY", "DIFY_API_KEY", "CASSETTE_MODE"):
+        monkeypatch.setattr(Config, name, "")
+    monkeypatch.setattr(Config, "LOCAL_MODEL_ENABLED", False)
+    monkeypatch.setattr(response_cache, "_cache", ResponseCache())  # Not the process-wide snapshot
+    traffic = tmp_path / "traffic.jsonl"
+    traffic.write_text(json.dumps({"query": "what is diwali"}) + "\n", encoding='utf-8')
+    cache_warmer.main([str(traffic), "--budget", "5"])
+    out = capsys.readouterr().out
+    assert "No model backend is configured" in out
+    assert "Warmed 0 of 1 queries" in out and "1 skipped" in out
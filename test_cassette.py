@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import types
+
+import pytest
+
+from cassette import RECORD, REPLAY, Cassette, CassetteMiss, replay_traffic
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+
+
+@pytest.fixture
+def fake_requests(monkeypatch):
+    sent = []
+
+    def post(url, headers, json, timeout):
+        sent.append((url, headers, json))
+        return FakeResponse(200, [{"generated_text": f"reply {len(sent)}"}])
+
+    monkeypatch.setitem(sys.modules, "requests", types.SimpleNamespace(post=post))
+    return sent
+
+
+@pytest.mark.parametrize("name", ["traffic.jsonl", "traffic.jsonl.gz"])
+def test_record_then_replay_round_trip(tmp_path, fake_requests, name):
+    path = str(tmp_path / name)
+    recorder = Cassette(path, RECORD)
+    payload = {"inputs": "namaste", "parameters": {"max_new_tokens": 8}}
+    for _ in range(2):
+        recorder.post("huggingface", {"prompt": "namaste"}, "http://hf/model", {"Authorization": "Bearer secret"}, payload, 5)
+    assert recorder.save() == 2
+    assert len(fake_requests) == 2
+
+    player = Cassette(path, REPLAY, time_scale=0)
+    # Identical requests get their recorded responses in order, then wrap around
+    replies = [player.post("huggingface", {}, "http://hf/model", {}, payload, 5).json() for _ in range(3)]
+    assert [r[0]["generated_text"] for r in replies] == ["reply 1", "reply 2", "reply 1"]
+    with pytest.raises(CassetteMiss):
+        player.post("huggingface", {}, "http://hf/model", {}, {"inputs": "other"}, 5)
+    assert player.get_stats()["hits"] == 3 and player.get_stats()["misses"] == 1
+    assert len(fake_requests) == 2
+
+
+def test_api_keys_are_not_recorded(tmp_path, fake_requests):
+    path = str(tmp_path / "traffic.jsonl")
+    recorder = Cassette(path, RECORD)
+    recorder.post("dify", {"query": "hi"}, "http://dify", {"Authorization": "Bearer secret-key"}, {"inputs": {}}, 5)
+    recorder.save()
+    with open(recorder.part_path, encoding='utf-8') as f:
+        assert "secret-key" not in f.read()
+
+
+def test_recordings_from_several_processes_are_merged(tmp_path, fake_requests):
+    path = str(tmp_path / "traffic.jsonl.gz")
+    payload = {"inputs": "namaste"}
+    for pid in (101, 102):
+        recorder = Cassette(path, RECORD)
+        recorder.post("huggingface", {}, "http://hf/model", {}, payload, 5)
+        # Workers share the cassette name; each must keep its own file
+        assert recorder.save(f"{path}.{pid}") == 1
+    assert sorted(os.listdir(tmp_path)) == ["traffic.jsonl.gz.101", "traffic.jsonl.gz.102"]
+
+    player = Cassette(path, REPLAY, time_scale=0)
+    assert len(player.entries) == 2
+    replies = [player.post("huggingface", {}, "http://hf/model", {}, payload, 5).json() for _ in range(2)]
+    assert [r[0]["generated_text"] for r in replies] == ["reply 1", "reply 2"]
+
+
+def test_replay_traffic_reissues_recorded_calls(tmp_path, fake_requests):
+    path = str(tmp_path / "traffic.jsonl")
+    recorder = Cassette(path, RECORD)
+    for i in range(3):
+        recorder.post("local", {"prompt": f"q{i}"}, "http://ollama", {}, {"prompt": f"q{i}"}, 5)
+    recorder.save()
+
+    calls = []
+
+    class Client:
+        def generate_response(self, **call):
+            calls.append(call["prompt"])
+            return {"success": True}
+
+    stats = replay_traffic(Cassette(path, REPLAY, time_scale=0), {"local": Client()}, workers=1)
+    assert sorted(calls) == ["q0", "q1", "q2"]
+    assert stats["requests"] == 3 and stats["errors"] == 0
@@ -0,0 +1,31 @@
+from conversation_memory import ConversationMemory
+from session_store import MemorySessionStore
+
+
+def test_spilled_messages_page_back_in_order(tmp_path):
+    memory = ConversationMemory(max_messages=3, spill_dir=str(tmp_path))
+    for i in range(10):
+        memory.append("user" if i % 2 == 0 else "assistant", f"message {i}")
+    assert len(memory) == 10 and memory.in_memory == 3
+    assert [m["content"] for m in memory.window(5)] == [f"message {i}" for i in range(5, 10)]
+    assert [m["content"] for m in memory] == [f"message {i}" for i in range(10)]
+    memory.clear()
+    assert len(memory) == 0
+
+
+def test_without_spill_old_messages_are_dropped():
+    memory = ConversationMemory(max_messages=2, spill=False)
+    memory.extend([{"role": "user", "content": str(i)} for i in range(5)])
+    assert memory.dropped == 3 and memory.available() == 2
+
+
+def test_store_backed_memory_resumes_a_session():
+    store = MemorySessionStore(flush_interval=60)
+    first = ConversationMemory("s1", max_messages=2, store=store)
+    for i in range(5):
+        first.append("user", f"turn {i}")
+    store.flush()
+    resumed = ConversationMemory("s1", max_messages=2, store=store)
+    assert resumed.in_memory == 2 and resumed.available() == 5
+    assert [m["content"] for m in resumed.window(4)] == [f"turn {i}" for i in range(1, 5)]
+    store.close()
@@ -0,0 +1,66 @@
+import json
+
+import demo
+from config import Config
+from demo import _read_batch_queries, run_batch
+from indic_sahayak import IndicSahayak
+from response_cache import ResponseCache
+
+
+class EchoClient:
+    def generate_response(self, prompt, language="English", max_tokens=None, stop=None):
+        return {"success": True, "response": "from the model", "usage": {}}
+
+
+def _assistant():
+    assistant = IndicSahayak({"huggingface": EchoClient()})
+    assistant.response_cache = ResponseCache()  # Replies stay out of the process-wide snapshot
+    return assistant
+
+
+def test_batch_reader_reports_bad_lines_instead_of_raising(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('\n'.join(['"Hello"', '{"id": "q2", "message": "Namaste"}', '42', '[1, 2]', 'null', '{"id": 6}', '{bad']), encoding='utf-8')
+    items = list(_read_batch_queries(str(path)))
+    assert items[0] == {"id": 1, "query": "Hello"}
+    assert items[1] == {"id": "q2", "query": "Namaste"}
+    assert [item["id"] for item in items[2:]] == [3, 4, 5, 6, 7]
+    assert all("error" in item for item in items[2:])
+
+
+def test_run_batch_keeps_input_order(tmp_path):
+    source = tmp_path / "queries.jsonl"
+    source.write_text('\n'.join(json.dumps({"id": i, "query": f"hello {i}"}) for i in range(20)), encoding='utf-8')
+    output = tmp_path / "answers.jsonl"
+    run_batch(str(source), str(output), workers=2, executor="thread")
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [result["id"] for result in results] == list(range(20))
+    assert all(result.get("response") for result in results)
+
+
+def test_per_record_methods_choose_the_executor_and_reach_the_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "APPEND_TRANSLITERATION", False)
+    monkeypatch.setattr(demo, "create_configured_assistant", _assistant)
+    monkeypatch.setattr(demo, "_batch_assistant", None)
+    source = tmp_path / "queries.jsonl"
+    source.write_text('\n'.join(json.dumps({"id": i, "query": f"tell me about festival {i}", "method": "huggingface"})
+                                for i in range(5)), encoding='utf-8')
+    output = tmp_path / "answers.jsonl"
+    summary = run_batch(str(source), str(output), method="fallback", workers=2)
+    assert summary["executor"] == "thread"
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [result["response"] for result in results] == ["from the model"] * 5
+
+
+def test_mixed_methods_keep_input_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "APPEND_TRANSLITERATION", False)
+    monkeypatch.setattr(demo, "_batch_assistant", _assistant())
+    source = tmp_path / "queries.jsonl"
+    records = [{"id": i, "query": f"hello {i}", **({"method": "huggingface"} if i % 3 == 0 else {})} for i in range(9)]
+    source.write_text('\n'.join(json.dumps(record) for record in records), encoding='utf-8')
+    output = tmp_path / "answers.jsonl"
+    summary = run_batch(str(source), str(output), workers=2, chunk_size=2)
+    assert summary["executor"] == "process+thread"
+    results = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert [result["id"] for result in results] == list(range(9))
+    assert all((result["response"] == "from the model") == (result["id"] % 3 == 0) for result in results)
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from feedback_columnar import read_feedback_frame, read_feedback_table, table_to_feedback
+from feedback_system import FeedbackAnalyzer, FeedbackCollector
+
+
+def _collector(tmp_path, count=200):
+    rng = random.Random(5)
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"), async_writes=True)
+    for i in range(count):
+        rating = rng.randint(1, 5)
+        collector.create_feedback(
+            f"user-{rng.randrange(50)}", rating, rng.choice(["Hindi", "Telugu", "English"]),
+            rng.choice(["general", "translation"]), f"टिप्पणी {i}",
+            helpfulness=rng.randint(1, 5), would_recommend=rating >= 4,
+            technical_issues=rng.choice(["", "slow response", "wrong script"])
+        )
+    return collector
+
+
+@pytest.mark.parametrize("name", ["feedback.arrow", "feedback.parquet"])
+def test_export_round_trip(tmp_path, name):
+    collector = _collector(tmp_path)
+    path = str(tmp_path / name)
+    collector.export_columnar(path)
+    assert table_to_feedback(read_feedback_table(path)) == collector.feedback_data
+
+    reloaded = FeedbackCollector(str(tmp_path / "other.json"))
+    reloaded.load_columnar(path)
+    assert reloaded.feedback_data == collector.feedback_data
+
+
+def test_report_from_table_matches_the_collector(tmp_path):
+    collector = _collector(tmp_path)
+    path = str(tmp_path / "feedback.arrow")
+    collector.export_columnar(path)
+    analyzer = FeedbackAnalyzer(collector)
+    expected = analyzer.generate_report()
+    from_table = FeedbackAnalyzer.from_table(read_feedback_table(path))
+    report = from_table.generate_report()
+    assert from_table.get_aggregate().rating_counts == analyzer.get_aggregate().rating_counts
+    expected.pop("report_generated")
+    report.pop("report_generated")
+    assert report == expected
+
+
+def test_frame_has_categorical_language(tmp_path):
+    pytest.importorskip("pandas")
+    collector = _collector(tmp_path, 20)
+    path = str(tmp_path / "feedback.arrow")
+    collector.export_columnar(path)
+    frame = read_feedback_frame(path)
+    assert len(frame) == 20
+    assert str(frame["language_used"].dtype) == "category"
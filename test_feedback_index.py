@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from feedback_index import FeedbackIndex, IndexedFeedbackReader
+from feedback_system import FeedbackCollector
+
+
+def _collector(tmp_path, async_writes=False):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"), async_writes=async_writes)
+    for i in range(5):
+        collector.create_feedback(f"u{i}", 1 + i % 5, "Telugu", "general", f"comment {i} నమస్కారం")
+    return collector
+
+
+def test_round_trip_from_the_json_array(tmp_path):
+    collector = _collector(tmp_path)
+    reader = IndexedFeedbackReader(collector.storage_file)
+    for feedback in collector.feedback_data:
+        assert reader.get(feedback.feedback_id) == feedback
+    now = datetime.now()
+    assert [f.feedback_id for f in reader.scan(now - timedelta(hours=1), now + timedelta(hours=1))] == [
+        f.feedback_id for f in collector.feedback_data
+    ]
+    assert reader.get("missing") is None
+    reader.close()
+
+
+def test_index_is_reused_until_the_file_changes(tmp_path):
+    collector = _collector(tmp_path)
+    index = FeedbackIndex(collector.storage_file).ensure()
+    index.save()
+    reloaded = FeedbackIndex(collector.storage_file).ensure()
+    assert reloaded.rebuilds == 0 and len(reloaded) == 5
+    collector.create_feedback("late", 5, "Hindi", "general", "new")
+    assert len(reloaded.ensure()) == 6
+    reloaded.close()
+    index.close()
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    collector = _collector(tmp_path, async_writes=True)
+    collector.flush()
+    with open(collector.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"feedback_id": "torn", "timestamp": "%s", "rating": ' % datetime.now().isoformat())
+    reader = IndexedFeedbackReader(collector.storage_file)
+    now = datetime.now()
+    assert len(list(reader.scan(now - timedelta(hours=1), now + timedelta(hours=1)))) == 5
+    assert reader.get("torn") is None
+    reader.close()
+    collector.writer.close()
@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+
+from feedback_journal import GroupCommitWriter, append_records, read_journal
+from feedback_system import FeedbackCollector
+
+
+def _worker(path, added, a_closed):
+    collector = FeedbackCollector(path, async_writes=True)
+    collector.create_feedback("worker-b", 4, "Hindi", "general", "from worker b")
+    collector.flush()
+    added.set()
+    a_closed.wait(30)
+    collector.close()
+
+
+def test_group_commit_round_trip(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    writer = GroupCommitWriter(path, batch_size=8, max_delay=0.01)
+    for i in range(20):
+        writer.submit({"n": i})
+    writer.close()
+    assert [record["n"] for record in read_journal(path)] == list(range(20))
+    assert writer.get_stats()["records_written"] == 20
+
+
+def test_read_journal_skips_torn_last_line(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    append_records(path, [{"n": 1}, {"n": 2}])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"n": 3, "tru')
+    assert [record["n"] for record in read_journal(path)] == [1, 2]
+
+
+def test_two_collectors_in_one_process_keep_both_records(tmp_path):
+    path = str(tmp_path / "mp.json")
+    a = FeedbackCollector(path, async_writes=True)
+    b = FeedbackCollector(path, async_writes=True)
+    a.create_feedback("a", 5, "Hindi", "general", "from a")
+    b.create_feedback("b", 3, "Telugu", "general", "from b")
+    a.flush()
+    b.flush()
+    a.close()
+    b.close()
+    users = sorted(f.user_id for f in FeedbackCollector(path).feedback_data)
+    assert users == ["a", "b"]
+
+
+def test_worker_processes_sharing_a_file_keep_every_record(tmp_path):
+    path = str(tmp_path / "mp.json")
+    context = multiprocessing.get_context("spawn")
+    added = context.Event()
+    a_closed = context.Event()
+    # Worker A loads before worker B writes, so B's record is only on disk
+    collector = FeedbackCollector(path, async_writes=True)
+    worker = context.Process(target=_worker, args=(path, added, a_closed))
+    worker.start()
+    try:
+        assert added.wait(30)
+        collector.create_feedback("worker-a", 5, "English", "general", "from worker a")
+        # Worker A compacts first and removes the shared journal
+        collector.close()
+    finally:
+        a_closed.set()
+        worker.join(30)
+    assert worker.exitcode == 0
+    users = sorted(f.user_id for f in FeedbackCollector(path).feedback_data)
+    assert users == ["worker-a", "worker-b"]
+    assert not os.path.exists(path + ".journal")
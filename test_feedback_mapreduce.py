@@ -0,0 +1,54 @@
+import json
+import random
+from dataclasses import asdict
+
+import pytest
+
+from feedback_journal import append_records
+from feedback_mapreduce import analyze_shards, plan_tasks
+from feedback_system import FeedbackAnalyzer, FeedbackCollector
+
+
+def _records(tmp_path, count=300):
+    rng = random.Random(9)
+    collector = FeedbackCollector(str(tmp_path / "all.json"), async_writes=True)
+    for i in range(count):
+        collector.create_feedback(
+            f"user-{rng.randrange(80)}", rng.randint(1, 5), rng.choice(["Hindi", "Telugu", "English"]),
+            rng.choice(["general", "learning", "cultural"]), f"comment {i}",
+            response_quality=rng.randint(1, 5), technical_issues=rng.choice(["", "slow response"])
+        )
+    return collector
+
+
+def _report(analyzer):
+    report = analyzer.generate_report()
+    report.pop("report_generated")
+    return report
+
+
+def _shards(tmp_path, records):
+    array_file = tmp_path / "replica-1.json"
+    array_file.write_text(json.dumps(records[:100], ensure_ascii=False), encoding='utf-8')
+    lines_file = str(tmp_path / "replica-2.jsonl")
+    append_records(lines_file, records[100:])
+    return [str(array_file), lines_file]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_split_shards_match_a_single_analyzer(tmp_path, workers):
+    collector = _records(tmp_path)
+    paths = _shards(tmp_path, [asdict(f) for f in collector.feedback_data])
+    # Small splits put record boundaries inside byte ranges
+    assert len(plan_tasks(paths, split_bytes=4096)) > 3
+    analyzer = analyze_shards(paths, workers=workers, split_bytes=4096)
+    assert _report(analyzer) == _report(FeedbackAnalyzer(collector))
+
+
+def test_sketch_mode_approximates_distinct_users(tmp_path):
+    collector = _records(tmp_path)
+    paths = _shards(tmp_path, [asdict(f) for f in collector.feedback_data])
+    report = analyze_shards(paths, workers=1, use_sketches=True, split_bytes=4096).generate_report()
+    exact = len({f.user_id for f in collector.feedback_data})
+    assert abs(report["total_users"] - exact) <= 3
+    assert report["overall_metrics"]["total_feedback"] == 300
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from feedback_system import FeedbackCollector
+
+
+def test_window_metrics_match_a_scan(tmp_path):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"), async_writes=True)
+    base = datetime(2026, 3, 1, 10, 30)
+    for i in range(48):
+        feedback = collector.create_feedback(f"u{i}", 1 + i % 5, ["Hindi", "Telugu"][i % 2], "general", "ok")
+        feedback.timestamp = (base + timedelta(hours=i)).isoformat()
+    collector.rollups.rebuild(collector.feedback_data)
+
+    # Windows are aligned to whole hours
+    start = datetime(2026, 3, 1, 15)
+    end = start + timedelta(hours=24)
+    window = [f for f in collector.feedback_data if start <= datetime.fromisoformat(f.timestamp) < end]
+    metrics = collector.get_window_metrics(start, end)
+    assert metrics["total_feedback"] == len(window)
+    assert metrics["average_rating"] == sum(f.rating for f in window) / len(window)
+    assert collector.get_window_metrics(start, end, language="Telugu")["total_feedback"] == sum(
+        f.language_used == "Telugu" for f in window
+    )
+    daily = collector.get_time_series(base, base + timedelta(days=3), "day")
+    assert sum(point["total_feedback"] for point in daily) == 48
+    collector.writer.close()
@@ -0,0 +1,48 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from feedback_segments import SegmentedFeedbackStore
+from feedback_system import FeedbackCollector
+
+
+def _feedback(collector, user_id, days_ago):
+    feedback = collector.create_feedback(user_id, 4, "Hindi", "general", "ok")
+    return replace(feedback, feedback_id=f"{user_id}-{days_ago}",
+                   timestamp=(datetime.now() - timedelta(days=days_ago)).isoformat())
+
+
+def test_round_trip_across_rotated_segments(tmp_path):
+    directory = str(tmp_path / "segments")
+    store = SegmentedFeedbackStore(directory, max_segment_records=3)
+    collector = FeedbackCollector(str(tmp_path / "scratch.json"))
+    written = [_feedback(collector, f"u{i}", i) for i in range(10)]
+    for feedback in written:
+        store.append(feedback)
+    store.close()
+
+    reopened = SegmentedFeedbackStore(directory, max_segment_records=3)
+    assert sorted(f.feedback_id for f in reopened.read()) == sorted(f.feedback_id for f in written)
+    assert reopened.get_stats()["sealed_segments"] == 3
+    window = reopened.summary(datetime.now() - timedelta(days=4, hours=12), datetime.now())
+    assert window["total_feedback"] == 5
+
+
+def test_retention_drops_expired_records_from_disk_and_memory(tmp_path):
+    directory = str(tmp_path / "segments")
+    seed = FeedbackCollector(str(tmp_path / "scratch.json"))
+    store = SegmentedFeedbackStore(directory)
+    for days_ago in (100, 90, 5, 1):
+        store.append(_feedback(seed, f"u{days_ago}", days_ago))
+    store.close()
+
+    collector = FeedbackCollector(str(tmp_path / "unused.json"), segment_dir=directory)
+    assert collector.get_summary()["total_feedback"] == 4
+    collector.segments.retention_days = 30
+    collector.segments.max_segment_age = 0
+    collector.compact()
+    assert sorted(f.user_id for f in collector.segments.read()) == ["u1", "u5"]
+    assert sorted(f.user_id for f in collector.feedback_data) == ["u1", "u5"]
+    assert collector.get_summary()["total_feedback"] == 2
+    old = datetime.now() - timedelta(days=100)
+    assert collector.get_window_metrics(old - timedelta(days=1), old + timedelta(days=1))["total_feedback"] == 0
+    collector.close()
@@ -0,0 +1,52 @@
+import pytest
+
+from feedback_system import FeedbackAggregate, FeedbackAnalyzer, FeedbackCollector, FeedbackVisualizer
+
+
+def _add(collector, user_id, rating, language, issue=""):
+    return collector.create_feedback(user_id, rating, language, "general", "", helpfulness=rating,
+                                     would_recommend=rating >= 4, technical_issues=issue)
+
+
+def test_report_is_cached_until_feedback_changes(tmp_path):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    analyzer = FeedbackAnalyzer(collector)
+    _add(collector, "u1", 5, "Hindi")
+    _add(collector, "u2", 2, "Telugu", "slow response")
+    aggregate = analyzer.get_aggregate()
+    assert analyzer.get_aggregate() is aggregate
+    assert analyzer.get_overall_metrics()["total_feedback"] == 2
+
+    _add(collector, "u1", 4, "Tamil", "slow response")
+    report = analyzer.generate_report()
+    assert report["overall_metrics"]["total_feedback"] == 3
+    assert report["overall_metrics"]["recommendation_rate"] == pytest.approx(200 / 3)
+    # Languages outside the fixed list are reported too
+    assert report["language_breakdown"]["Tamil"]["count"] == 1
+    assert report["language_breakdown"]["English"]["count"] == 0
+    assert report["common_issues"] == ["slow response"]
+    assert report["total_users"] == 2
+
+
+def test_merged_aggregates_match_one_pass(tmp_path):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    feedback = [_add(collector, f"u{i % 4}", 1 + i % 5, ["Hindi", "Telugu", "English"][i % 3],
+                     ["", "wrong script"][i % 2]) for i in range(9)]
+    merged = FeedbackAggregate.from_feedback(feedback[:4]).merge(FeedbackAggregate.from_feedback(feedback[4:]))
+    one_pass = FeedbackAggregate.from_feedback(feedback)
+    assert merged.rating_counts == one_pass.rating_counts
+    whole = one_pass.to_report()
+    report = merged.to_report()
+    whole.pop("report_generated")
+    report.pop("report_generated")
+    assert report == whole
+
+
+def test_charts_work_without_a_collector(tmp_path):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    feedback = [_add(collector, "u1", rating, "Hindi") for rating in (5, 5, 3)]
+    chart = FeedbackVisualizer(FeedbackAnalyzer(collector)).create_rating_distribution_chart()
+    merged = FeedbackAnalyzer.from_aggregate(FeedbackAggregate.from_feedback(feedback))
+    assert FeedbackVisualizer(merged).create_rating_distribution_chart() == chart
+    assert "5 stars: " + "█" * 13 + " (2)" in chart
+    assert "Hindi:" in FeedbackVisualizer(merged).create_language_performance_chart()
@@ -0,0 +1,59 @@
+import pytest
+
+from generation_budget import GenerationBudget, classify_intent
+from indic_sahayak import IndicSahayak
+from response_cache import ResponseCache
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("Namaste!", "greeting"),
+    ("नमस्ते", "greeting"),
+    ("hello, how do I say thank you in telugu", "translation"),
+    ("Translate good morning to Hindi", "translation"),
+    ("Teach me Hindi grammar", "learning"),
+    ("Tell me about Sankranti", "cultural"),
+    ("What is the weather today", "general"),
+])
+def test_classify_intent(text, intent):
+    assert classify_intent(text) == intent
+
+
+def test_budget_learns_from_observed_lengths():
+    budget = GenerationBudget(defaults={"greeting": 64}, min_samples=5, quantile=0.95, headroom=1.25)
+    assert budget.budget("greeting", "Hindi") == 64
+    for _ in range(10):
+        budget.observe("greeting", "Hindi", 20, 64, "stop")
+    assert budget.budget("greeting", "Hindi") == 25
+    # Other languages fall back to the intent's cross-language sketch
+    assert budget.budget("greeting", "Telugu") == 25
+
+
+def test_truncated_completions_grow_the_budget():
+    budget = GenerationBudget(defaults={"general": 100}, min_samples=5, max_tokens=512)
+    for _ in range(10):
+        budget.observe("general", "English", 100, 100, "length")
+    assert budget.truncated == 10
+    assert budget.budget("general", "English") > 200
+
+
+def test_translation_budget_scales_with_input():
+    budget = GenerationBudget(defaults={"translation": 32}, min_tokens=16, max_tokens=512)
+    assert budget.budget("translation", "Hindi", input_tokens=100) == 216
+    assert budget.budget("translation", "Hindi", input_tokens=1000) == 512
+
+
+def test_assistant_budgets_translations_by_the_user_text():
+    class Client:
+        def generate_response(self, prompt, language="English", max_tokens=None, stop=None):
+            self.max_tokens = max_tokens
+            return {"success": False, "error": "offline"}
+
+    assistant = IndicSahayak({"huggingface": Client()})
+    assistant.generation_budget = GenerationBudget(defaults={"translation": 32}, min_tokens=16, max_tokens=512)
+    assistant.response_cache = ResponseCache()
+    short = "Translate good morning to Hindi"
+    long = short + ": " + " ".join(["the river flows past the old temple"] * 10)
+    assistant.get_response(short, "huggingface")
+    short_budget = assistant.clients["huggingface"].max_tokens
+    assistant.get_response(long, "huggingface")
+    assert short_budget < assistant.clients["huggingface"].max_tokens < 512
@@ -0,0 +1,49 @@
+import types
+
+import pytest
+
+pytest.importorskip("requests")
+
+import huggingface_client
+from huggingface_client import HuggingFaceClient, _finish_reason
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+        self.text = str(body)
+
+    def json(self):
+        return self.body
+
+
+def _generate(monkeypatch, body, max_tokens=10):
+    monkeypatch.setattr(huggingface_client, "_post", lambda *args: FakeResponse(body))
+    return HuggingFaceClient(api_key="test").generate_response("Hello", max_tokens=max_tokens)
+
+
+def test_reported_finish_reason_and_token_count_win(monkeypatch):
+    result = _generate(monkeypatch, [{"generated_text": "a b", "details": {"finish_reason": "length", "generated_tokens": 10}}])
+    assert result["finish_reason"] == "length"
+    assert result["completion_tokens"] == 10
+
+    result = _generate(monkeypatch, [{"generated_text": "a b c d e f g h i j", "details": {"finish_reason": "eos_token", "generated_tokens": 7}}])
+    assert result["finish_reason"] == "stop"
+
+
+def test_estimated_counts_near_the_cap_count_as_truncated():
+    assert _finish_reason(False, 9, 10) == "length"
+    assert _finish_reason(False, 8, 10) == "stop"
+    assert _finish_reason(False, 9, 10, exact=True) == "stop"
+    assert _finish_reason(True, 10, 10) == "stop"
+
+
+def test_model_loading_wait_follows_the_replay_time_scale(monkeypatch):
+    replies = iter([FakeResponse({}, 503), FakeResponse([{"generated_text": "ready"}])])
+    monkeypatch.setattr(huggingface_client, "_post", lambda *args: next(replies))
+    slept = []
+    monkeypatch.setattr(huggingface_client.time, "sleep", slept.append)
+    cassette = types.SimpleNamespace(replaying=True, time_scale=0)
+    result = HuggingFaceClient(api_key="test", cassette=cassette).generate_response("Hello")
+    assert result["success"] and slept == [0]
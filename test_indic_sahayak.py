@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import indic_sahayak
+from feedback_system import FeedbackCollector
+from indic_sahayak import IndicSahayak
+
+
+def test_import_does_not_load_ui_or_http_dependencies():
+    code = "import sys, indic_sahayak; print([m for m in ('streamlit', 'pandas', 'requests') if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_system_prompt_is_built_once():
+    first, second = IndicSahayak(), IndicSahayak()
+    assert first.system_prompt is second.system_prompt
+    assert "IndicSahayak" in first.system_prompt
+
+
+def test_feedback_summary_follows_the_shared_store(tmp_path):
+    assistant = IndicSahayak()
+    assistant._feedback_collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    assert assistant.get_feedback_summary() == {"total_feedback": 0, "average_rating": 0}
+    version = assistant.feedback_version
+    assistant.add_feedback("u1", 4, "good", "Hindi")
+    assistant.add_feedback("u2", 2, "slow", "Telugu")
+    assert assistant.feedback_version != version
+    summary = assistant.get_feedback_summary()
+    assert summary["total_feedback"] == 2 and summary["average_rating"] == 3
+    assert assistant.get_feedback_summary() is summary
+
+
+def test_recent_feedback_table_leaves_out_users_and_comments(tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    assistant = IndicSahayak()
+    assistant._feedback_collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    assistant.add_feedback("u1", 4, "my phone number is 98xxxx", "Hindi")
+    monkeypatch.setattr(indic_sahayak, "get_shared_assistant", lambda: assistant)
+    frame = indic_sahayak._build_recent_feedback_frame(assistant.feedback_version)
+    assert list(frame.columns) == ["timestamp", "rating", "language_used"]
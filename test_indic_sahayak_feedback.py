@@ -0,0 +1,40 @@
+from feedback_system import FeedbackAnalyzer, FeedbackCollector
+from indic_sahayak import IndicSahayak
+
+
+def test_sidebar_feedback_is_not_padded_with_top_scores(tmp_path):
+    assistant = IndicSahayak()
+    assistant._feedback_collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    feedback = assistant.add_feedback("u1", 1, "Wrong translation", "Hindi")
+    assert feedback.helpfulness == 1 and feedback.user_satisfaction == 1
+    assert feedback.would_recommend is False
+
+    metrics = FeedbackAnalyzer(assistant.feedback_collector).get_overall_metrics()
+    assert metrics["average_helpfulness"] == 1
+    assert metrics["recommendation_rate"] == 0
+    assert assistant.get_feedback_summary() == {
+        "total_feedback": 1, "average_rating": 1, "language_breakdown": {"Hindi": 1}
+    }
+
+
+def test_response_latency_reaches_the_sketch_report(tmp_path):
+    assistant = IndicSahayak()
+    assistant._feedback_collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    analyzer = FeedbackAnalyzer(assistant.feedback_collector, use_sketches=True)
+    assistant.add_feedback("u1", 4, "Quick", "Hindi", response_latency_ms=120.0)
+    assert analyzer.get_sketches().latency_ms.count == 1
+    # Recorded after the sketches were built: shared with the collector, so no rebuild needed
+    assistant.feedback_collector.record_latency(480.0)
+    latency = analyzer.get_sketches().latency_ms
+    assert latency.count == 2
+    assert 470 < latency.quantile(1.0) < 490
+
+
+def test_collected_analyzers_do_not_leave_listeners_behind(tmp_path):
+    collector = FeedbackCollector(str(tmp_path / "feedback.json"))
+    for _ in range(10):
+        FeedbackAnalyzer(collector).get_overall_metrics()
+    kept = FeedbackAnalyzer(collector)
+    assert len(collector._listeners) == 1
+    collector.create_feedback("u1", 3, "Hindi", "general", "ok")
+    assert kept.get_overall_metrics()["total_feedback"] == 1
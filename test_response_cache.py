@@ -0,0 +1,52 @@
+import os
+
+from config import Config
+from indic_sahayak import IndicSahayak, create_configured_assistant
+from response_cache import ResponseCache
+
+
+class EchoClient:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_response(self, prompt, language="English", max_tokens=None, stop=None):
+        self.calls += 1
+        return {"success": True, "response": "hello from the model", "usage": {}}
+
+
+def test_snapshot_restore_round_trip(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(snapshot_path=path)
+    cache.put(("chat", "huggingface", "hello"), "hi")
+    cache.put(("translate", "namaste", "Hindi", "English"), {"translated_text": "hello"})
+    assert cache.snapshot() == 2
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+    restored = ResponseCache(snapshot_path=path)
+    assert restored.restore() == 2
+    assert restored.get(("chat", "huggingface", "hello")) == "hi"
+
+
+def test_empty_cache_leaves_no_snapshot(tmp_path):
+    path = str(tmp_path / "cache.json")
+    assert ResponseCache(snapshot_path=path).snapshot() == 0
+    assert not os.path.exists(path)
+
+
+def test_chat_reply_from_an_injected_client_is_cached(monkeypatch):
+    monkeypatch.setattr(Config, "APPEND_TRANSLITERATION", False)
+    client = EchoClient()
+    assistant = IndicSahayak({"huggingface": client})
+    assistant.response_cache = ResponseCache()
+    assert assistant.get_response("Tell me about the monsoon", "huggingface") == "hello from the model"
+    assert assistant.get_response("tell me about the  monsoon", "huggingface") == "hello from the model"
+    assert client.calls == 1
+
+
+def test_configured_assistant_has_no_clients_without_backends(monkeypatch):
+    monkeypatch.setattr(Config, "HUGGINGFACE_API_KEY", "")
+    monkeypatch.setattr(Config, "DIFY_API_KEY", "")
+    monkeypatch.setattr(Config, "LOCAL_MODEL_ENABLED", False)
+    monkeypatch.setattr(Config, "CASSETTE_MODE", "")
+    assert Config.configured_methods() == []
+    assert create_configured_assistant().clients == {}
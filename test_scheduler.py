@@ -0,0 +1,31 @@
+from scheduler import BackendScheduler, ScheduledClient
+
+
+def _scheduler():
+    return BackendScheduler("test", rate=1000, burst=1000, concurrency=1)
+
+
+def test_429_status_pauses_the_bucket():
+    scheduler = _scheduler()
+    result = scheduler.call(lambda: {"success": False, "error": "API Error: 429 - slow down", "status_code": 429})
+    assert result["status_code"] == 429
+    assert scheduler.get_metrics()["rate_limited"] == 1
+    scheduler.shutdown()
+
+
+def test_429_in_error_text_alone_is_not_a_rate_limit():
+    scheduler = _scheduler()
+    scheduler.call(lambda: {"success": False, "error": "Local model error: cannot reach host:11434 429", "status_code": 500})
+    assert scheduler.get_metrics()["rate_limited"] == 0
+    scheduler.shutdown()
+
+
+def test_scheduled_client_passes_chat_calls_through():
+    class Client:
+        def generate_response(self, prompt, language="English", max_tokens=None, stop=None):
+            return {"success": True, "response": f"{language}: {prompt}"}
+
+    client = ScheduledClient(Client(), _scheduler())
+    assert client.generate_response("hi", language="Hindi", max_tokens=8)["response"] == "Hindi: hi"
+    assert client.scheduler.get_metrics()["completed"] == 1
+    client.scheduler.shutdown()
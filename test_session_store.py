@@ -0,0 +1,75 @@
+import pytest
+
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+def _store(kind, tmp_path, **kwargs):
+    kwargs.setdefault("flush_interval", 60)  # Tests flush explicitly
+    if kind == "sqlite":
+        return SQLiteSessionStore(str(tmp_path / "sessions.db"), **kwargs)
+    return MemorySessionStore(**kwargs)
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_pending_messages_are_readable_before_and_after_flush(kind, tmp_path):
+    store = _store(kind, tmp_path, cache_messages=4)
+    for i in range(6):
+        store.append("s1", "user" if i % 2 == 0 else "assistant", f"m{i}")
+    assert store.count("s1") == 6
+    assert [m["content"] for m in store.recent("s1")] == ["m2", "m3", "m4", "m5"]
+    store.flush()
+    assert store.get_stats()["pending_messages"] == 0
+    assert store.count("s1") == 6
+    assert [m["content"] for m in store.recent("s1", 2)] == ["m4", "m5"]
+    assert [m["content"] for m in store.page("s1", 0, 3)] == ["m0", "m1", "m2"]
+    store.close()
+
+
+def test_sqlite_replicas_see_each_others_turns(tmp_path):
+    a, b = _store("sqlite", tmp_path), _store("sqlite", tmp_path)
+    a.append("s1", "user", "hello")
+    a.flush()
+    assert b.recent("s1") == [{"role": "user", "content": "hello"}]
+    b.append("s1", "assistant", "namaste")
+    b.close()
+    # a's cached copy is stale; the backend count no longer matches, so it re-reads
+    assert [m["content"] for m in a.recent("s1")] == ["hello", "namaste"]
+    a.close()
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_top_queries_and_delete(kind, tmp_path):
+    store = _store(kind, tmp_path)
+    for session_id in ("s1", "s2", "s3"):
+        store.append(session_id, "user", "what is diwali")
+        store.append(session_id, "assistant", "a festival")
+    store.append("s1", "user", "namaste")
+    assert store.top_queries(1) == [("what is diwali", 3)]
+    store.delete("s1")
+    assert store.count("s1") == 0 and store.recent("s1") == []
+    store.close()
+
+
+def test_flush_between_count_and_pending_loses_no_turns():
+    class Store(MemorySessionStore):
+        race = False
+
+        def _backend_count(self, session_id):
+            count = super()._backend_count(session_id)
+            if self.race:
+                self.race = False
+                self.flush()  # Lands after the count was read, before pending is
+            return count
+
+    store = Store(cache_messages=2, flush_interval=60)
+    for i in range(4):
+        store.append("s1", "user", f"m{i}")
+        if i == 1:
+            store.flush()
+    store.race = True
+    assert [m["content"] for m in store.recent("s1")] == ["m2", "m3"]
+    store.append("s1", "user", "m4")
+    store.race = True
+    assert store.count("s1") == 5
+    assert [m["content"] for m in store.recent("s1")] == ["m3", "m4"]
+    store.close()
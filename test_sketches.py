@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from sketches import HyperLogLog, QuantileSketch, SpaceSaving
+
+
+@pytest.mark.parametrize("distinct", [100, 5000, 50000])
+def test_hyperloglog_within_four_standard_errors(distinct):
+    sketch = HyperLogLog(12)
+    for i in range(distinct):
+        sketch.add(f"user-{i}")
+        sketch.add(f"user-{i}")  # Duplicates do not count
+    standard_error = 1.04 / (sketch.num_registers ** 0.5)
+    assert abs(sketch.count() - distinct) <= 4 * standard_error * distinct + 1
+
+
+def test_hyperloglog_merge_is_the_union_and_round_trips():
+    a, b = HyperLogLog(10), HyperLogLog(10)
+    a.update(f"u{i}" for i in range(3000))
+    b.update(f"u{i}" for i in range(2000, 5000))
+    union = HyperLogLog.from_dict(a.to_dict()).merge(b)
+    assert abs(union.count() - 5000) <= 0.15 * 5000
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(12))
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(5, 1.5) for _ in range(20000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact * 1.0001
+
+
+def test_quantile_merge_matches_a_single_sketch():
+    rng = random.Random(3)
+    values = [rng.uniform(0, 1000) for _ in range(5000)] + [0.0] * 50
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    merged = QuantileSketch.from_dict(left.to_dict()).merge(right)
+    assert merged.quantiles((0.0, 0.5, 0.99)) == whole.quantiles((0.0, 0.5, 0.99))
+    assert merged.count == whole.count and merged.min == 0.0
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounded_error():
+    rng = random.Random(11)
+    stream = ["hot-a"] * 3000 + ["hot-b"] * 2000 + [f"cold-{rng.randrange(5000)}" for _ in range(10000)]
+    rng.shuffle(stream)
+    counter = SpaceSaving(capacity=64)
+    for item in stream:
+        counter.add(item)
+    top = dict(counter.top(2))
+    assert set(top) == {"hot-a", "hot-b"}
+    for item, true_count in (("hot-a", 3000), ("hot-b", 2000)):
+        assert true_count <= top[item] <= true_count + counter.errors[item]
+        assert counter.errors[item] <= len(stream) / counter.capacity
+    restored = SpaceSaving.from_dict(counter.to_dict())
+    assert restored.top(2) == counter.top(2)
@@ -0,0 +1,29 @@
+import unicodedata
+
+from text_analysis import analyze_text, extract_terms, tokenize
+
+
+def test_tokens_keep_indic_words_whole():
+    assert tokenize("नमस्ते दोस्त, తెలుగు Hello!") == ["नमस्ते", "दोस्त", "తెలుగు", "hello"]
+
+
+def test_equivalent_inputs_share_a_cache_key():
+    decomposed = unicodedata.normalize("NFD", "क़िताब")
+    a = analyze_text("What  is Diwali?")
+    b = analyze_text("what is diwali")
+    assert a.key == b.key and a.digest == b.digest
+    assert analyze_text(decomposed).key == analyze_text("क़िताब").key
+    assert analyze_text("नम‍स्ते").key == "नमस्ते"
+
+
+def test_language_and_scripts():
+    analyzed = analyze_text("Hello नमस्ते 2024")
+    assert analyzed.language == "Hindi"
+    assert analyzed.scripts["Latin"] == 5 and analyzed.scripts["Digit"] == 4
+    assert analyze_text("నమస్కారం").language == "Telugu"
+    assert analyze_text(analyzed) is analyzed
+
+
+def test_terms_skip_stopwords_before_forming_ngrams():
+    assert "translation literal" in extract_terms("translation was too literal")
+    assert "थोड़ा" not in extract_terms("थोड़ा तेज़ response")
@@ -0,0 +1,22 @@
+from token_counter import WORD_PATTERN, ScriptAwareEstimator, build_usage
+
+
+def test_vowel_signs_and_viramas_stay_inside_their_word():
+    assert WORD_PATTERN.findall("नमस्ते, आप कैसे हैं?") == ["नमस्ते", ",", "आप", "कैसे", "हैं", "?"]
+    assert WORD_PATTERN.findall("నమస్కారం మీరు") == ["నమస్కారం", "మీరు"]
+    # Joiners inside a conjunct do not split the word
+    assert WORD_PATTERN.findall("क्‍ष") == ["क्‍ष"]
+
+
+def test_counts_scale_with_script_ratios():
+    counter = ScriptAwareEstimator({"Devanagari": 3.0})
+    assert counter.count("") == 0
+    assert counter.count("नमस्ते") == 2
+    assert counter.count("Hello, world") == counter.count("Hello") + 1 + counter.count("world")
+
+
+def test_usage_totals_add_up():
+    usage = build_usage(ScriptAwareEstimator(), "नमस्ते दोस्त", "Hello there", 0.0, 0.5)
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
+    assert usage["latency"] == 0.5
+    assert usage["tokens_per_second"] == usage["completion_tokens"] / 0.5
@@ -0,0 +1,58 @@
+import pytest
+
+from indic_sahayak import IndicSahayak
+from transliteration import Transliterator, detect_script, to_roman, to_script
+
+HINDI = ["नमस्ते", "धन्यवाद", "आप कैसे हैं", "भारत", "हिन्दी", "क्या", "न"]
+TELUGU = ["నమస్కారం", "ధన్యవాదాలు", "తెలుగు", "మీరు ఎలా ఉన్నారు"]
+
+
+@pytest.mark.parametrize("scheme", ["iso", "itrans"])
+@pytest.mark.parametrize("text", HINDI + TELUGU)
+def test_script_round_trip(scheme, text):
+    script = detect_script(text)
+    assert to_script(to_roman(text, scheme), script, scheme) == text
+
+
+def test_known_romanizations():
+    assert to_roman("नमस्ते") == "namastē"
+    assert to_roman("नमस्ते", "itrans") == "namaste"
+    assert to_roman("తెలుగు") == "telugu"
+
+
+def test_joiners_do_not_split_or_survive_romanization():
+    assert to_roman("क्\u200dष") == to_roman("क्\u200cष") == to_roman("क्ष") == "kṣ"
+    assert to_roman("शक्\u200dति") == to_roman("शक्ति") == "śakti"
+    # Outside Indic text, e.g. in emoji sequences, joiners are left alone
+    assert to_roman("👩\u200d💻 नमस्ते") == "👩\u200d💻 namastē"
+
+
+@pytest.mark.parametrize("roman, expected", [
+    ("namaste", "नमस्ते"),
+    ("dhanyavaad", "धन्यवाद"),
+    ("Namaste", "नमस्ते"),
+    ("aap kaise", "आप कैसे"),
+    ("kya haal hai", "क्या हाल है"),
+    ("mera naam", "मेरा नाम"),
+])
+def test_informal_spellings_in_iso_scheme(roman, expected):
+    assert to_script(roman, "Devanagari") == expected
+
+
+def test_stream_matches_whole_text():
+    transliterator = Transliterator()
+    text = "नमस्ते दोस्त, आप कैसे हैं?"
+    chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+    assert "".join(transliterator.to_roman_stream(chunks)) == transliterator.to_roman(text)
+
+
+def test_transliteration_request_is_answered_locally():
+    assistant = IndicSahayak()
+    assert assistant._get_transliteration_response("transliterate namaste to hindi") == "नमस्ते"
+    assert assistant._get_transliteration_response("romanize नमस्ते") == "namastē"
+
+
+def test_unconvertible_request_is_left_to_the_model():
+    assistant = IndicSahayak()
+    assert assistant._get_transliteration_response("transliterate xerox to hindi") is None
+    assert assistant._get_transliteration_response("what is the weather") is None
@@ -0,0 +1,163 @@
+"""
+Script-aware text normalization for IndicSahayak
+Shared by analytics code that needs Hindi, Telugu and English text to
+compare equal regardless of Unicode form, case or joiner characters, and by
+the request path, which analyzes each input once (AnalyzedText) and hands
+the result to every stage
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Optional, Union
+from token_counter import WORD_CHARS
+
+WORD_PATTERN = re.compile(f"[{WORD_CHARS}]+", re.UNICODE)
+
+ZERO_WIDTH_CHARS = ("\u200b", "\u200c", "\u200d", "\ufeff")
+ZERO_WIDTH_PATTERN = re.compile(f"[{''.join(ZERO_WIDTH_CHARS)}]")
+TRAILING_PUNCTUATION = "?!.।॥ "
+
+SCRIPT_PATTERNS = {
+    "Devanagari": re.compile("[\u0900-\u097F]"),
+    "Telugu": re.compile("[\u0C00-\u0C7F]"),
+    "Latin": re.compile("[A-Za-z]"),
+    "Digit": re.compile("[0-9]"),
+}
+
+STOPWORDS = {
+    # English
+    "a", "an", "the", "is", "are", "was", "were", "be", "to", "of", "and", "or", "in", "on",
+    "for", "with", "it", "this", "that", "i", "me", "my", "you", "can", "could", "should",
+    "would", "more", "some", "very", "too", "bit", "please", "at", "as", "by", "so", "but",
+    # Hindi
+    "है", "हैं", "था", "थे", "को", "का", "की", "के", "में", "से", "और", "भी", "हो", "सकता",
+    "सकती", "थोड़ा", "बहुत", "कुछ", "यह", "वह", "पर", "ही", "तो", "ना", "नहीं",
+    # Telugu
+    "మరియు", "కూడా", "ఒక", "ఈ", "ఆ", "లో", "కు", "ని", "చాలా", "కొంచెం", "మరిన్ని",
+}
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize, drop zero-width characters and casefold"""
+    text = unicodedata.normalize("NFC", text)
+    text = ZERO_WIDTH_PATTERN.sub("", text)
+    return text.casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized word tokens, keeping Indic words whole"""
+    return WORD_PATTERN.findall(normalize_text(text))
+
+
+def extract_terms(text: str, max_n: int = 2) -> List[str]:
+    """
+    Content-word unigrams and n-grams up to max_n for frequency analysis.
+    Stopwords are removed before n-grams are formed, so "translation was
+    too literal" and "translation too literal" share "translation literal".
+    """
+    tokens = [t for t in tokenize(text) if t not in STOPWORDS and len(t) > 1]
+    terms = list(tokens)
+    for n in range(2, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            terms.append(" ".join(tokens[i:i + n]))
+    return terms
+
+
+class AnalyzedText:
+    """
+    One request input, analyzed once and shared by every stage (language
+    detection, keyword rules, intent, cache keys). Each view is computed on
+    first use and memoized:
+
+    - text: NFC-normalized input
+    - folded: text without zero-width characters, casefolded
+    - tokens: script-aware words of folded
+    - scripts: character count per script
+    - language: "Hindi" if any Devanagari, else "Telugu" if any Telugu, else "English"
+    - key: folded, single-spaced, without trailing punctuation (cache key)
+    - digest: stable hash of key, equal across processes and restarts
+    """
+
+    __slots__ = ("raw", "_text", "_folded", "_tokens", "_scripts", "_language", "_key", "_digest")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self._text: Optional[str] = None
+        self._folded: Optional[str] = None
+        self._tokens: Optional[List[str]] = None
+        self._scripts: Optional[Dict[str, int]] = None
+        self._language: Optional[str] = None
+        self._key: Optional[str] = None
+        self._digest: Optional[str] = None
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            raw = self.raw
+            self._text = raw if unicodedata.is_normalized("NFC", raw) else unicodedata.normalize("NFC", raw)
+        return self._text
+
+    @property
+    def folded(self) -> str:
+        if self._folded is None:
+            text = self.text
+            # Substring checks are much cheaper than a regex pass when, as usual, there are no joiners
+            if any(char in text for char in ZERO_WIDTH_CHARS):
+                text = ZERO_WIDTH_PATTERN.sub("", text)
+            self._folded = text.casefold()
+        return self._folded
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            self._tokens = WORD_PATTERN.findall(self.folded)
+        return self._tokens
+
+    @property
+    def scripts(self) -> Dict[str, int]:
+        if self._scripts is None:
+            counts = {script: len(pattern.findall(self.text)) for script, pattern in SCRIPT_PATTERNS.items()}
+            counts["Other"] = len(self.text) - sum(counts.values()) - sum(char.isspace() for char in self.text)
+            self._scripts = counts
+        return self._scripts
+
+    @property
+    def language(self) -> str:
+        # Normalization never moves a character across script blocks, so the raw input will do
+        if self._language is None:
+            if SCRIPT_PATTERNS["Devanagari"].search(self.raw):
+                self._language = "Hindi"
+            elif SCRIPT_PATTERNS["Telugu"].search(self.raw):
+                self._language = "Telugu"
+            else:
+                self._language = "English"
+        return self._language
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            self._key = " ".join(self.folded.split()).rstrip(TRAILING_PUNCTUATION)
+        return self._key
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.key.encode("utf-8"), digest_size=8).hexdigest()
+        return self._digest
+
+    def contains(self, *keywords: str) -> bool:
+        """True if any (lowercase) keyword occurs in the folded text"""
+        # A verbatim hit in the raw input avoids folding long inputs at all
+        if any(keyword in self.raw for keyword in keywords):
+            return True
+        folded = self.folded
+        return any(keyword in folded for keyword in keywords)
+
+
+def analyze_text(text: Union[str, AnalyzedText]) -> AnalyzedText:
+    """Analyze an input, or pass through one that already is"""
+    return text if isinstance(text, AnalyzedText) else AnalyzedText(text)
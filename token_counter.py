@@ -0,0 +1,226 @@
+"""
+Token counting for IndicSahayak
+Provides locally computed prompt/completion token counts for all backends
+"""
+
+import json
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+# Unicode blocks used for per-script calibration
+SCRIPT_RANGES = {
+    "Devanagari": (0x0900, 0x097F),
+    "Telugu": (0x0C00, 0x0C7F),
+}
+
+# Zero-width joiners show up inside Indic conjuncts and are not tokens on their own
+ZERO_WIDTH_CHARS = {"\u200c", "\u200d"}
+
+# Word characters plus the Devanagari and Telugu blocks, so vowel signs (matras)
+# and viramas stay inside their word instead of splitting it like \w does
+WORD_CHARS = r"\w\u0900-\u0963\u0966-\u097F\u0C00-\u0C7F"
+# Joiners are allowed inside a word so a conjunct is not split either
+WORD_PATTERN = re.compile(f"[{WORD_CHARS}\u200c\u200d]+|[^{WORD_CHARS}\\s]", re.UNICODE)
+
+
+def get_script(char: str) -> str:
+    """Return the script bucket a single character belongs to"""
+    code = ord(char)
+    for script, (start, end) in SCRIPT_RANGES.items():
+        if start <= code <= end:
+            return script
+    if char.isdigit():
+        return "Digit"
+    if code < 0x0080:
+        return "Latin"
+    return "Other"
+
+
+class TokenCounter:
+    """Base class for pluggable token counters"""
+
+    name = "base"
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in text"""
+        raise NotImplementedError
+
+    def count_usage(self, prompt: str, completion: str) -> Dict[str, int]:
+        """Return prompt, completion and total token counts"""
+        prompt_tokens = self.count(prompt or "")
+        completion_tokens = self.count(completion or "")
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+
+class ScriptAwareEstimator(TokenCounter):
+    """
+    Estimates tokens from per-script characters-per-token ratios.
+    Ratios come from Config.CHARS_PER_TOKEN and can be recalibrated
+    against a real tokenizer with calibrate().
+    """
+
+    name = "script_estimator"
+
+    def __init__(self, chars_per_token: Optional[Dict[str, float]] = None):
+        self.chars_per_token = dict(Config.CHARS_PER_TOKEN)
+        if chars_per_token:
+            self.chars_per_token.update(chars_per_token)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        total = 0
+        for word in WORD_PATTERN.findall(text):
+            total += self._count_word(word)
+        return total
+
+    def _count_word(self, word: str) -> int:
+        """Count tokens for a single word using its dominant script"""
+        script_counts: Dict[str, int] = {}
+        for char in word:
+            if char in ZERO_WIDTH_CHARS:
+                continue
+            script = get_script(char)
+            script_counts[script] = script_counts.get(script, 0) + 1
+
+        tokens = 0.0
+        for script, length in script_counts.items():
+            ratio = self.chars_per_token.get(script, self.chars_per_token["Other"])
+            tokens += length / ratio
+        return max(1, math.ceil(tokens))
+
+    def calibrate(self, samples: List[str], reference: TokenCounter) -> Dict[str, float]:
+        """
+        Fit characters-per-token ratios per script against a reference counter.
+        Each sample is attributed to the script that dominates it.
+        """
+        chars: Dict[str, int] = {}
+        tokens: Dict[str, int] = {}
+        for sample in samples:
+            script_counts: Dict[str, int] = {}
+            for char in sample:
+                if char.isspace() or char in ZERO_WIDTH_CHARS:
+                    continue
+                script = get_script(char)
+                script_counts[script] = script_counts.get(script, 0) + 1
+            if not script_counts:
+                continue
+            dominant = max(script_counts.items(), key=lambda x: x[1])[0]
+            chars[dominant] = chars.get(dominant, 0) + sum(script_counts.values())
+            tokens[dominant] = tokens.get(dominant, 0) + reference.count(sample)
+
+        for script, char_total in chars.items():
+            if tokens[script] > 0:
+                self.chars_per_token[script] = char_total / tokens[script]
+        return dict(self.chars_per_token)
+
+
+class BPETokenizer(TokenCounter):
+    """
+    Minimal BPE tokenizer loaded from a local vocabulary file.
+
+    Accepts either the Hugging Face ``tokenizer.json`` layout
+    (``{"model": {"vocab": ..., "merges": [...]}}``) or a flat
+    ``{"vocab": ..., "merges": [...]}`` file. Words are split on whitespace
+    and prefixed with the SentencePiece "▁" marker before merging.
+    """
+
+    name = "bpe"
+
+    def __init__(self, vocab: Dict[str, int], merges: List[Tuple[str, str]], cache_size: int = 65536):
+        self.vocab = vocab
+        self.merge_ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self._encode_word = lru_cache(maxsize=cache_size)(self._bpe)
+
+    @classmethod
+    def from_file(cls, path: str) -> "BPETokenizer":
+        """Load vocabulary and merges from a local JSON file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        model = data.get("model", data)
+        merges = []
+        for merge in model.get("merges", []):
+            pair = merge.split(" ", 1) if isinstance(merge, str) else merge
+            if len(pair) == 2:
+                merges.append((pair[0], pair[1]))
+        return cls(model.get("vocab", {}), merges)
+
+    def _bpe(self, word: str) -> Tuple[str, ...]:
+        """Apply merges to a single pre-tokenized word"""
+        symbols = list(word)
+        while len(symbols) > 1:
+            best_rank = None
+            best_index = -1
+            for i in range(len(symbols) - 1):
+                rank = self.merge_ranks.get((symbols[i], symbols[i + 1]))
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_rank is None:
+                break
+            symbols[best_index:best_index + 2] = [symbols[best_index] + symbols[best_index + 1]]
+        return tuple(symbols)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into BPE pieces"""
+        pieces: List[str] = []
+        for word in text.split():
+            pieces.extend(self._encode_word("▁" + word))
+        return pieces
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.tokenize(text))
+
+
+_counters: Dict[str, TokenCounter] = {}
+
+
+def get_token_counter(path: Optional[str] = None) -> TokenCounter:
+    """
+    Get a shared token counter.
+    Uses the BPE tokenizer at ``path`` (or Config.TOKENIZER_PATH) when the
+    file exists, otherwise falls back to the per-script estimator.
+    """
+    path = path if path is not None else Config.TOKENIZER_PATH
+    key = path or ""
+    if key not in _counters:
+        counter: TokenCounter = ScriptAwareEstimator()
+        if path and os.path.exists(path):
+            try:
+                counter = BPETokenizer.from_file(path)
+            except Exception as e:
+                print(f"Error loading tokenizer from {path}: {e}")
+        _counters[key] = counter
+    return _counters[key]
+
+
+def build_usage(
+    counter: TokenCounter,
+    prompt: str,
+    completion: str,
+    started: float,
+    finished: float
+) -> Dict[str, float]:
+    """
+    Build the usage and throughput fields reported in client responses.
+    Times are ``time.perf_counter()`` readings around a blocking call, so
+    throughput is measured over the whole latency.
+    """
+    usage = counter.count_usage(prompt, completion)
+    latency = max(finished - started, 0.0)
+    usage.update({
+        "latency": latency,
+        "tokens_per_second": usage["completion_tokens"] / latency if latency > 0 else 0.0,
+        "tokenizer": counter.name
+    })
+    return usage
@@ -0,0 +1,310 @@
+"""
+Table-driven transliteration for IndicSahayak
+Converts Devanagari and Telugu to Roman (ISO 15919 or ITRANS) and back
+without a model call. Both scripts share the Brahmic block layout, so one
+offset table builds the per-script lookup tables at import time.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCRIPT_BASES = {"Devanagari": 0x0900, "Telugu": 0x0C00}
+SCHEMES = ("iso", "itrans")
+
+# Offset in the script block -> (ISO 15919, ITRANS), per character class.
+# Telugu-only and Devanagari-only offsets are filtered per script below.
+CONSONANTS = {
+    0x15: ("k", "k"), 0x16: ("kh", "kh"), 0x17: ("g", "g"), 0x18: ("gh", "gh"), 0x19: ("ṅ", "~N"),
+    0x1A: ("c", "ch"), 0x1B: ("ch", "Ch"), 0x1C: ("j", "j"), 0x1D: ("jh", "jh"), 0x1E: ("ñ", "~n"),
+    0x1F: ("ṭ", "T"), 0x20: ("ṭh", "Th"), 0x21: ("ḍ", "D"), 0x22: ("ḍh", "Dh"),
+    0x23: ("ṇ", "N"),
+    0x24: ("t", "t"), 0x25: ("th", "th"), 0x26: ("d", "d"), 0x27: ("dh", "dh"), 0x28: ("n", "n"),
+    0x2A: ("p", "p"), 0x2B: ("ph", "ph"), 0x2C: ("b", "b"), 0x2D: ("bh", "bh"), 0x2E: ("m", "m"),
+    0x2F: ("y", "y"), 0x30: ("r", "r"), 0x31: ("ṟ", "rr"), 0x32: ("l", "l"), 0x33: ("ḷ", "L"),
+    0x34: ("ḻ", "zh"), 0x35: ("v", "v"), 0x36: ("ś", "sh"), 0x37: ("ṣ", "Sh"),
+    0x38: ("s", "s"), 0x39: ("h", "h"),
+}
+# Independent vowel offset -> (ISO, ITRANS); the matching sign is at SIGN_OFFSETS
+VOWELS = {
+    0x05: ("a", "a"), 0x06: ("ā", "aa"), 0x07: ("i", "i"), 0x08: ("ī", "ii"),
+    0x09: ("u", "u"), 0x0A: ("ū", "uu"), 0x0B: ("r̥", "RRi"), 0x0C: ("l̥", "LLi"),
+    0x0E: ("e", "e"), 0x0F: ("ē", "E"), 0x10: ("ai", "ai"),
+    0x12: ("o", "o"), 0x13: ("ō", "O"), 0x14: ("au", "au"),
+    0x60: ("r̥̄", "RRI"), 0x61: ("l̥̄", "LLI"),
+}
+SIGN_OFFSETS = {
+    0x06: 0x3E, 0x07: 0x3F, 0x08: 0x40, 0x09: 0x41, 0x0A: 0x42, 0x0B: 0x43, 0x60: 0x44,
+    0x0E: 0x46, 0x0F: 0x47, 0x10: 0x48, 0x12: 0x4A, 0x13: 0x4B, 0x14: 0x4C, 0x0C: 0x62, 0x61: 0x63,
+}
+MARKS = {
+    0x01: ("m̐", ".N"), 0x02: ("ṁ", "M"), 0x03: ("ḥ", "H"), 0x3D: ("'", ".a"),
+}
+VIRAMA = 0x4D
+NUKTA = 0x3C
+DIGITS = {0x66 + i: (str(i), str(i)) for i in range(10)}
+# Dandas live in the Devanagari block but are used by Telugu text too
+PUNCTUATION = {"।": (".", "|"), "॥": ("..", "||")}
+
+# Devanagari consonant + nukta -> (ISO, ITRANS)
+NUKTA_CONSONANTS = {
+    0x15: ("q", "q"), 0x16: ("k͟h", "K"), 0x17: ("ġ", "G"), 0x1C: ("z", "z"),
+    0x21: ("ṛ", ".D"), 0x22: ("ṛh", ".Dh"), 0x2B: ("f", "f"), 0x2F: ("ẏ", "Y"),
+}
+
+# Telugu has short e/o; in Devanagari the e/o letters are the long ones, and
+# ITRANS spells those plain e/o
+SCRIPT_ONLY = {
+    "Devanagari": {"skip": {0x0E, 0x12, 0x31, 0x34}, "itrans": {0x0F: "e", 0x13: "o"}},
+    "Telugu": {"skip": {0x0C, 0x61, NUKTA}, "itrans": {}},
+}
+
+# Hindi drops the inherent vowel at the end of a word (namaskār, not namaskāra);
+# Telugu words end in a vowel, so a bare final consonant needs an explicit virama
+FINAL_SCHWA_DELETION = {"Devanagari": True, "Telugu": False}
+
+
+class ScriptTable:
+    """Lookup tables for one script and Roman scheme, in both directions"""
+
+    def __init__(self, script: str, scheme: str):
+        if script not in SCRIPT_BASES:
+            raise ValueError(f"Unsupported script: {script}")
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unsupported scheme: {scheme}")
+        self.script = script
+        self.scheme = scheme
+        self.base = SCRIPT_BASES[script]
+        self.final_schwa_deletion = FINAL_SCHWA_DELETION[script]
+        column = SCHEMES.index(scheme)
+        skip = SCRIPT_ONLY[script]["skip"]
+        overrides = SCRIPT_ONLY[script]["itrans"] if scheme == "itrans" else {}
+
+        def roman(offset: int, pair: Tuple[str, str]) -> str:
+            return overrides.get(offset, pair[column])
+
+        self.virama = chr(self.base + VIRAMA)
+        self.long_a_sign = chr(self.base + SIGN_OFFSETS[0x06])
+        self.nukta = chr(self.base + NUKTA) if NUKTA not in skip else None
+        self.consonants = {chr(self.base + o): roman(o, p) for o, p in CONSONANTS.items() if o not in skip}
+        self.vowels = {chr(self.base + o): roman(o, p) for o, p in VOWELS.items() if o not in skip}
+        self.signs = {
+            chr(self.base + SIGN_OFFSETS[o]): roman(o, p)
+            for o, p in VOWELS.items() if o in SIGN_OFFSETS and o not in skip
+        }
+        self.marks = {chr(self.base + o): roman(o, p) for o, p in MARKS.items()}
+        self.marks.update({chr(self.base + o): p[column] for o, p in DIGITS.items()})
+        self.marks.update({char: p[column] for char, p in PUNCTUATION.items()})
+        self.nukta_consonants = {}
+        if self.nukta:
+            self.nukta_consonants = {chr(self.base + o): p[column] for o, p in NUKTA_CONSONANTS.items()}
+
+        # Roman token -> (kind, script text); matched longest first
+        self.tokens: Dict[str, Tuple[str, str]] = {}
+        for char, value in self.marks.items():
+            if not value.isdigit():
+                self.tokens.setdefault(value, ("mark", char))
+        for char, value in self.consonants.items():
+            self.tokens[value] = ("consonant", char)
+        for char, value in self.nukta_consonants.items():
+            self.tokens[value] = ("consonant", char + self.nukta)
+        sign_for = {value: char for char, value in self.signs.items()}
+        for char, value in self.vowels.items():
+            self.tokens[value] = ("vowel", char + "\0" + sign_for.get(value, ""))
+        if scheme == "itrans":
+            # Common ITRANS alternates and informal spellings
+            for alias, target in (("A", "aa"), ("I", "ii"), ("U", "uu"), ("ee", "ii"), ("oo", "uu"),
+                                  ("w", "v"), ("x", "kSh")):
+                if target in self.tokens:
+                    self.tokens.setdefault(alias, self.tokens[target])
+        else:
+            # People type Hindi and Telugu without diacritics ("namaste", "aap"), which
+            # is close to ITRANS; its lowercase tokens fill the gaps, ISO ones win clashes
+            for alias, target in get_table(script, "itrans").tokens.items():
+                if alias == alias.lower():
+                    self.tokens.setdefault(alias, target)
+        self.max_token = max(len(token) for token in self.tokens)
+
+    def is_script_char(self, char: str) -> bool:
+        return self.base <= ord(char) <= self.base + 0x7F
+
+    def to_roman(self, word: str) -> str:
+        """Romanize one run of script characters"""
+        out: List[str] = []
+        pending = False  # A consonant whose inherent vowel is still undecided
+        syllables = 0
+        i = 0
+        while i < len(word):
+            char = word[i]
+            if char in self.consonants:
+                if pending:
+                    out.append("a")
+                if self.nukta and i + 1 < len(word) and word[i + 1] == self.nukta and char in self.nukta_consonants:
+                    out.append(self.nukta_consonants[char])
+                    i += 1
+                else:
+                    out.append(self.consonants[char])
+                pending = True
+                syllables += 1
+            elif char == self.virama:
+                pending = False
+            elif char in self.signs:
+                out.append(self.signs[char])
+                pending = False
+            else:
+                if pending:
+                    out.append("a")
+                    pending = False
+                if char in self.vowels:
+                    out.append(self.vowels[char])
+                    syllables += 1
+                else:
+                    out.append(self.marks.get(char, char))
+            i += 1
+        if pending and not (self.final_schwa_deletion and syllables > 1):
+            out.append("a")
+        return "".join(out)
+
+    def from_roman(self, word: str) -> str:
+        """Convert one Roman word to script by greedy longest-token matching"""
+        if self.scheme == "iso":
+            word = word.lower()  # Case carries no meaning in ISO 15919
+        out: List[str] = []
+        pending = False
+        consonants = 0
+        i = 0
+        while i < len(word):
+            for length in range(min(self.max_token, len(word) - i), 0, -1):
+                token = self.tokens.get(word[i:i + length])
+                if token is not None:
+                    break
+            else:
+                token, length = ("other", word[i]), 1
+            kind, text = token
+            if kind == "consonant":
+                if pending:
+                    out.append(self.virama)
+                out.append(text)
+                pending = True
+                consonants += 1
+            elif kind == "vowel":
+                independent, _, sign = text.partition("\0")
+                if pending:
+                    if not sign and self.final_schwa_deletion and consonants > 1 and i + length == len(word):
+                        # to_roman never writes this schwa, so a typed one means "ā" (kya, accha)
+                        sign = self.long_a_sign
+                    out.append(sign)  # Empty for the inherent "a"
+                    pending = False
+                else:
+                    out.append(independent)
+            else:
+                if pending and not self.final_schwa_deletion:
+                    out.append(self.virama)
+                pending = False
+                out.append(text)
+            i += length
+        if pending and not self.final_schwa_deletion:
+            out.append(self.virama)
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def get_table(script: str, scheme: str = "iso") -> ScriptTable:
+    return ScriptTable(script, scheme)
+
+
+def detect_script(text: str) -> Optional[str]:
+    for char in text:
+        for script, base in SCRIPT_BASES.items():
+            if base <= ord(char) <= base + 0x7F:
+                return script
+    return None
+
+
+# Zero-width joiners inside a run only pick a conjunct's rendered form; romanization drops them
+SCRIPT_RUN = re.compile("[ऀ-ॿఀ-౿][ऀ-ॿఀ-౿\u200c\u200d]*")
+JOINERS = dict.fromkeys((0x200C, 0x200D))
+# ITRANS uses "." inside tokens (.N, .D), so a dot before a letter stays in the word
+ROMAN_WORD = re.compile(r"(?:[^\s\d.,!?;:()\[\]\"'|]|\.(?=[A-Za-z]))+")
+
+
+class Transliterator:
+    """
+    Deterministic transliterator for one Roman scheme. Word results are
+    memoized, so batches and streams over natural text stay cheap.
+    """
+
+    def __init__(self, scheme: str = "iso", cache_size: int = 65536):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unsupported scheme: {scheme}")
+        self.scheme = scheme
+        self._romanize_run = lru_cache(maxsize=cache_size)(self._romanize_run_uncached)
+        self._script_word = lru_cache(maxsize=cache_size)(self._script_word_uncached)
+
+    def _romanize_run_uncached(self, run: str) -> str:
+        # A run may mix Devanagari and Telugu; split it wherever the script changes
+        parts = []
+        for script, base in SCRIPT_BASES.items():
+            if base <= ord(run[0]) <= base + 0x7F:
+                table = get_table(script, self.scheme)
+                break
+        end = 1
+        while end < len(run) and (table.is_script_char(run[end]) or run[end] in PUNCTUATION):
+            end += 1
+        parts.append(table.to_roman(run[:end]))
+        if end < len(run):
+            parts.append(self._romanize_run(run[end:]))
+        return "".join(parts)
+
+    def _script_word_uncached(self, word: str, script: str) -> str:
+        return get_table(script, self.scheme).from_roman(word)
+
+    def to_roman(self, text: str) -> str:
+        """Romanize every Devanagari and Telugu run; other text passes through"""
+        text = unicodedata.normalize("NFC", text)
+        return SCRIPT_RUN.sub(lambda m: self._romanize_run(m.group().translate(JOINERS)), text)
+
+    def to_script(self, text: str, script: str) -> str:
+        """Convert Roman text in this scheme to Devanagari or Telugu"""
+        text = unicodedata.normalize("NFC", text)
+        return ROMAN_WORD.sub(lambda m: self._script_word(m.group(), script), text)
+
+    def to_roman_batch(self, texts: Iterable[str]) -> List[str]:
+        return [self.to_roman(text) for text in texts]
+
+    def to_script_batch(self, texts: Iterable[str], script: str) -> List[str]:
+        return [self.to_script(text, script) for text in texts]
+
+    def to_roman_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Romanize streamed text (e.g. model output chunks). Text is released
+        at whitespace boundaries so a word split across chunks is handled whole.
+        """
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            cut = max(buffer.rfind(" "), buffer.rfind("\n"))
+            if cut >= 0:
+                yield self.to_roman(buffer[:cut + 1])
+                buffer = buffer[cut + 1:]
+        if buffer:
+            yield self.to_roman(buffer)
+
+
+_transliterators: Dict[str, Transliterator] = {}
+
+
+def get_transliterator(scheme: str = "iso") -> Transliterator:
+    transliterator = _transliterators.get(scheme)
+    if transliterator is None:
+        transliterator = _transliterators[scheme] = Transliterator(scheme)
+    return transliterator
+
+
+def to_roman(text: str, scheme: str = "iso") -> str:
+    return get_transliterator(scheme).to_roman(text)
+
+
+def to_script(text: str, script: str, scheme: str = "iso") -> str:
+    return get_transliterator(scheme).to_script(text, script)